@@ -74,3 +74,82 @@ export const getSummaryByProcurementUrlId = query({
   },
 });
 
+
+/**
+ * List scraped data one page at a time, oldest first, optionally for one state
+ * (used by scripts/procurement_export.py for bulk exports)
+ */
+export const listPaginated = query({
+  args: {
+    paginationOpts: v.object({
+      numItems: v.number(),
+      cursor: v.union(v.string(), v.null()),
+      maximumBytesRead: v.optional(v.number()),
+    }),
+    state: v.optional(v.string()),
+  },
+  handler: async (ctx, { paginationOpts, state }) => {
+    if (state !== undefined) {
+      return await ctx.db
+        .query("procurementData")
+        .withIndex("by_state", (q) => q.eq("state", state))
+        .paginate(paginationOpts);
+    }
+    return await ctx.db
+      .query("procurementData")
+      .withIndex("by_creation")
+      .paginate(paginationOpts);
+  },
+});
+
+/**
+ * Stats about scraped procurement data for one page of captures, oldest first.
+ * Callers page through and sum the results (scripts/verify_leads_in_cloud.py);
+ * a single query over every capture would read each `data` payload and hit the
+ * per-query read limits as captures grow, so pages are also capped by bytes read.
+ */
+export const getStatsPage = query({
+  args: {
+    paginationOpts: v.object({
+      numItems: v.number(),
+      cursor: v.union(v.string(), v.null()),
+      maximumBytesRead: v.optional(v.number()),
+    }),
+  },
+  returns: v.object({
+    total: v.number(),
+    totalRows: v.number(),
+    byStatus: v.record(v.string(), v.number()),
+    states: v.array(v.string()),
+    latestCreatedAt: v.union(v.number(), v.null()),
+    isDone: v.boolean(),
+    continueCursor: v.string(),
+  }),
+  handler: async (ctx, { paginationOpts }) => {
+    const page = await ctx.db
+      .query("procurementData")
+      .withIndex("by_creation")
+      .paginate(paginationOpts);
+    const byStatus: Record<string, number> = {};
+    const states = new Set<string>();
+    let totalRows = 0;
+    let latestCreatedAt: number | null = null;
+    for (const item of page.page) {
+      byStatus[item.status] = (byStatus[item.status] || 0) + 1;
+      states.add(item.state);
+      totalRows += item.rowCount || 0;
+      if (latestCreatedAt === null || item.createdAt > latestCreatedAt) {
+        latestCreatedAt = item.createdAt;
+      }
+    }
+    return {
+      total: page.page.length,
+      totalRows,
+      byStatus,
+      states: [...states],
+      latestCreatedAt,
+      isDone: page.isDone,
+      continueCursor: page.continueCursor,
+    };
+  },
+});
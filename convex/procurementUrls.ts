@@ -365,6 +365,22 @@ export const getApproved = query({
   },
 });
 
+/**
+ * Get approved procurement URLs one page at a time (used by
+ * scripts/get_approved_procurement_links.py to stream large exports)
+ */
+export const getApprovedPaginated = query({
+  args: {
+    paginationOpts: v.object({ numItems: v.number(), cursor: v.union(v.string(), v.null()) }),
+  },
+  handler: async (ctx, { paginationOpts }) => {
+    return await ctx.db
+      .query("procurementUrls")
+      .withIndex("by_status", (q) => q.eq("status", "approved"))
+      .paginate(paginationOpts);
+  },
+});
+
 /**
  * Get approved procurement URLs for a specific state (used in map pin creation)
  */
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+bench_resume_patterns.py
+Micro-benchmark for the contact and experience extractors in parseResumeFile.py.
+Each extractor is run against a frozen copy of its previous implementation (ad-hoc
+re calls, three phone patterns, up to four regexes per experience line) on a
+resume corpus plus synthetic edge cases. Outputs must match exactly; timings are
+reported per extractor.
+
+Usage:
+    python scripts/bench_resume_patterns.py <directory|glob|batch.ndjson> [--repeat N]
+
+Exits with status 1 if any output differs from the legacy implementation.
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+
+import parseResumeFile as current
+from parseResumeFile import (
+    SECTION_ALIASES,
+    SectionIndex,
+    discover_resume_files,
+    extract_section,
+    extract_text_from_path,
+)
+
+
+# --- Legacy implementations (kept verbatim for equivalence checks) -----------
+
+def legacy_extract_email(text: str) -> str:
+    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
+    match = re.search(email_pattern, text)
+    return match.group(0) if match else ""
+
+
+def legacy_extract_phone(text: str) -> str:
+    phone_patterns = [
+        r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',
+        r'\d{3}[-.\s]?\d{3}[-.\s]?\d{4}',
+        r'\+?\d{1,3}[-.\s]?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',
+    ]
+    for pattern in phone_patterns:
+        match = re.search(pattern, text)
+        if match:
+            return match.group(0)
+    return ""
+
+
+def legacy_extract_years_of_experience(text: str, index=None) -> int:
+    patterns = [
+        r'(\d+)\+?\s*years?\s*(?:of\s*)?experience',
+        r'(\d+)\+?\s*years?\s*in',
+        r'experience[:\s]+(\d+)\+?\s*years?',
+    ]
+    for pattern in patterns:
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            try:
+                return int(match.group(1))
+            except ValueError:
+                pass
+    exp_section = extract_section(text, SECTION_ALIASES["employment"], index)
+    if exp_section:
+        lines = exp_section.split('\n')
+        count = 0
+        for line in lines:
+            if re.match(r'^[A-Z][^•\n]{10,}', line.strip()):
+                count += 1
+        return min(count, 30)
+    return 0
+
+
+def legacy_parse_experience(text: str, index=None) -> list[dict]:
+    exp_section = extract_section(text, SECTION_ALIASES["experience"], index)
+    if not exp_section:
+        return []
+    experiences = []
+    lines = exp_section.split('\n')
+    current_exp = None
+    for i, line in enumerate(lines):
+        line = line.strip()
+        if not line:
+            continue
+        if re.match(r'^[A-Z][^•\n]{10,}', line) and not line.startswith(('•', '-', '*', 'Designed', 'Developed', 'Managed')):
+            if current_exp:
+                experiences.append(current_exp)
+            current_exp = {"title": line, "company": "", "location": "", "duration": "", "responsibilities": []}
+            if i + 1 < len(lines):
+                next_line = lines[i + 1].strip()
+                if ',' in next_line:
+                    parts = [p.strip() for p in next_line.split(',')]
+                    if len(parts) >= 2:
+                        current_exp["company"] = parts[0]
+                        current_exp["location"] = parts[1]
+                        if len(parts) >= 3:
+                            current_exp["duration"] = parts[2]
+                    elif len(parts) == 1:
+                        current_exp["company"] = parts[0]
+                elif re.search(r'\d{4}|\d{1,2}/\d{4}|(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)', next_line, re.IGNORECASE):
+                    current_exp["duration"] = next_line
+        elif current_exp:
+            if re.search(r'\d{4}|\d{1,2}/\d{4}|(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)', line, re.IGNORECASE):
+                if not current_exp["duration"]:
+                    current_exp["duration"] = line
+            elif line.startswith(('•', '-', '*')) or re.match(r'^(Designed|Developed|Managed|Created|Implemented|Led|Worked|Provided|Responsible)', line, re.IGNORECASE):
+                current_exp["responsibilities"].append(line.lstrip('•-* '))
+    if current_exp:
+        experiences.append(current_exp)
+    return experiences
+
+
+EXTRACTORS = [
+    ("extract_email", legacy_extract_email, current.extract_email, False),
+    ("extract_phone", legacy_extract_phone, current.extract_phone, False),
+    ("extract_years_of_experience", legacy_extract_years_of_experience, current.extract_years_of_experience, True),
+    ("parse_experience", legacy_parse_experience, current.parse_experience, True),
+]
+
+
+def synthetic_texts() -> list[str]:
+    """Edge cases around the header-region cut and inputs with no contact details."""
+    filler = "Lorem ipsum dolor sit amet consectetur\n" * 80
+    region = current.HEADER_REGION_CHARS
+    texts = [
+        "",
+        "No contact details here\nEXPERIENCE\nEngineer at a place for a while\nLed things",
+        filler,
+        filler + "Reach me at jane.doe@example.org or 210-555-0199\n",
+        "+1 (210) 555-0199 and 210.555.0100\n" + filler,
+        "EXPERIENCE\nSenior Systems Engineer\nAcme, Austin TX\nImplemented stuff\nJan 2020 - Present\n"
+        "Responsible for 2019 rollout\n• Bullet point\nManaged a team\n",
+    ]
+    # Phones and emails straddling the region boundary, padded to land on every offset
+    for offset in range(-20, 21):
+        pad = "x" * max(0, region + offset)
+        texts.append(pad + " (210) 555-\n0199 tail\n" + filler)
+        texts.append(pad + "\n210 555 0199\n" + filler)
+        texts.append(pad + " someone.long.name@sub.example.com\n" + filler)
+        texts.append("x" * max(0, region + offset - 3000) + filler[: max(0, region - 10)] + "555 123 4567\n" + filler)
+    return texts
+
+
+def load_corpus(target: str) -> list[str]:
+    if target.endswith((".ndjson", ".jsonl")):
+        texts = []
+        with open(target, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    text = record.get("result", record).get("originalText")
+                    if text:
+                        texts.append(text)
+        return texts
+    texts = []
+    for path in discover_resume_files(target):
+        try:
+            texts.append(extract_text_from_path(path))
+        except ValueError as e:
+            print(f"WARNING: {path}: {e}", file=sys.stderr)
+    return texts
+
+
+def time_calls(func, texts, indexes, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        if indexes is None:
+            for text in texts:
+                func(text)
+        else:
+            for text, index in zip(texts, indexes):
+                func(text, index)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark resume extractors against their legacy versions")
+    parser.add_argument("target", help="Directory or glob of resumes, or batch NDJSON with originalText")
+    parser.add_argument("--repeat", type=int, default=20, help="Timing repetitions over the corpus (default: 20)")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.target)
+    if not corpus:
+        print(f"ERROR: No resume text found for: {args.target}", file=sys.stderr)
+        return 1
+    texts = corpus + synthetic_texts()
+    indexes = [SectionIndex(text) for text in texts]
+    print(f"{len(corpus)} corpus text(s) + {len(texts) - len(corpus)} synthetic case(s)\n")
+
+    mismatches = 0
+    print(f"{'Extractor':<30} {'Legacy ms':>10} {'Current ms':>11} {'Speedup':>8}")
+    for name, legacy, new, takes_index in EXTRACTORS:
+        for i, text in enumerate(texts):
+            args_ = (text, indexes[i]) if takes_index else (text,)
+            expected, actual = legacy(*args_), new(*args_)
+            if expected != actual:
+                mismatches += 1
+                print(f"MISMATCH {name} on text #{i}: {expected!r} != {actual!r}", file=sys.stderr)
+
+        corpus_indexes = indexes[: len(corpus)] if takes_index else None
+        legacy_s = time_calls(legacy, corpus, corpus_indexes, args.repeat)
+        new_s = time_calls(new, corpus, corpus_indexes, args.repeat)
+        per_doc = 1000 / (len(corpus) * args.repeat)
+        print(f"{name:<30} {legacy_s * per_doc:>10.4f} {new_s * per_doc:>11.4f} {legacy_s / new_s:>7.2f}x")
+
+    print(f"\n{'All outputs match' if not mismatches else f'{mismatches} mismatch(es)'}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
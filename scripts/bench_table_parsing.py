@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+bench_table_parsing.py
+Micro-benchmark for html_table_to_records (table_parsing.py), the HTML table ->
+records step the scrapers run on every captured table. Each parser backend is
+timed and its peak memory measured on synthetic procurement tables (10 to 100k
+rows, narrow and wide, plain / rowspan+colspan / nested tables) and optionally
+on recorded pages: *.html files (e.g. ./debug_html) or the *.har.zip archives
+written by scrape_corpus.py.
+
+Results can be saved as a baseline; a later run against that baseline exits
+with status 1 if any case got slower or used more memory than the tolerance
+allows, or returned different columns or records, so parser changes are judged
+on numbers. When pandas is installed, the stdlib backend is also checked
+against it on the narrow plain and spans tables.
+
+Usage:
+    python scripts/bench_table_parsing.py [--backend pandas|stdlib ...] [--sizes 10,1000,100000]
+                                          [--recorded DIR|GLOB ...] [--repeat N]
+                                          [--save-baseline FILE] [--baseline FILE]
+                                          [--time-tolerance 0.25] [--memory-tolerance 0.25]
+"""
+
+import argparse
+import gc
+import glob
+import hashlib
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+import zipfile
+
+from table_parsing import TABLE_BACKENDS, html_table_to_records
+
+
+DEFAULT_SIZES = (10, 100, 1000, 10000, 100000)
+# Wide tables stop here by default: 40 columns x 100k rows is minutes per pandas run
+DEFAULT_WIDE_MAX_ROWS = 10000
+SHAPES = {"narrow": 5, "wide": 40}
+VARIANTS = ("plain", "spans", "nested")
+# Narrow synthetic tables hold only text, so both backends must agree on them exactly
+PARITY_VARIANTS = ("plain", "spans")
+PARITY_ROWS = 200
+
+DEPARTMENTS = ["Public Works", "Parks & Recreation", "Water Utilities", "Transportation", "Finance", "IT Services"]
+STATUSES = ["Open", "Closed", "Awarded", "Cancelled", "Addendum Issued"]
+
+
+def synthetic_table(rows, columns, variant, seed=0):
+    """A procurement-style table as HTML: header row plus rows x columns cells."""
+    rng = random.Random(seed)
+    base = ["Bid Number", "Title", "Department", "Due Date", "Status"]
+    headers = base[:columns] + [f"Field {i}" for i in range(len(base), columns)]
+    parts = ["<table class=\"bids\"><thead><tr>"]
+    for i, header in enumerate(headers):
+        if variant == "spans" and i == 1 and columns > 2:
+            parts.append(f"<th colspan=\"2\">{header}</th>")
+        elif variant == "spans" and i == 2 and columns > 2:
+            continue
+        else:
+            parts.append(f"<th>{header}</th>")
+    parts.append("</tr></thead><tbody>")
+
+    span_left = 0
+    for r in range(rows):
+        parts.append("<tr>")
+        for c in range(columns):
+            if c == 2 and span_left:
+                continue  # covered by a rowspan from an earlier row
+            if c == 0:
+                value = f"RFP-{2024 + r % 3}-{r:06d}"
+            elif c == 1:
+                value = f"Bid for {rng.choice(DEPARTMENTS).lower()} services &amp; supplies, lot {r}"
+            elif c == 2:
+                value = rng.choice(DEPARTMENTS).replace("&", "&amp;")
+            elif c == 3:
+                value = f"{rng.randint(1, 12):02d}/{rng.randint(1, 28):02d}/2026 2:00 PM"
+            elif c == 4:
+                value = rng.choice(STATUSES)
+            else:
+                value = f"{rng.random() * 100000:.2f}" if c % 2 else f"Note {r}-{c}"
+
+            if variant == "spans" and c == 2 and r % 5 == 0:
+                span_left = min(3, rows - r)
+                parts.append(f"<td rowspan=\"{span_left}\">{value}</td>")
+            elif variant == "nested" and c == 1 and r % 4 == 0:
+                parts.append(f"<td><a href=\"/bids/{r}\">{value}</a><table><tr><td>Addendum 1</td>"
+                             f"<td>PDF</td></tr></table></td>")
+            else:
+                parts.append(f"<td>{value}</td>")
+        if span_left:
+            span_left -= 1
+        parts.append("</tr>")
+    parts.append("</tbody></table>")
+    return "".join(parts)
+
+
+def synthetic_cases(sizes, wide_max_rows):
+    for shape, columns in SHAPES.items():
+        for variant in VARIANTS:
+            for rows in sizes:
+                if shape == "wide" and rows > wide_max_rows:
+                    continue
+                yield f"{shape}-{variant}-{rows}", lambda rows=rows, columns=columns, variant=variant: \
+                    synthetic_table(rows, columns, variant)
+
+
+def har_html_documents(path):
+    """HTML response bodies from a scrape_corpus.py archive (.har.zip or .har)."""
+    if path.endswith(".zip"):
+        with zipfile.ZipFile(path) as archive:
+            har_name = next(n for n in archive.namelist() if n.endswith(".har"))
+            har = json.loads(archive.read(har_name))
+            read_attached = lambda name: archive.read(name).decode("utf-8", errors="replace")
+            yield from _har_documents(har, read_attached)
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            yield from _har_documents(json.load(f), None)
+
+
+def _har_documents(har, read_attached):
+    for entry in har["log"]["entries"]:
+        content = entry["response"].get("content", {})
+        if "html" not in content.get("mimeType", ""):
+            continue
+        if "_file" in content and read_attached:
+            text = read_attached(content["_file"])
+        else:
+            text = content.get("text") or ""
+        if "<table" in text.lower():
+            yield entry["request"]["url"], text
+
+
+def recorded_cases(patterns):
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            paths.extend(sorted(glob.glob(os.path.join(pattern, "*.html"))))
+            paths.extend(sorted(glob.glob(os.path.join(pattern, "*.har.zip"))))
+        else:
+            paths.extend(sorted(glob.glob(pattern)))
+    for path in paths:
+        name = os.path.basename(path)
+        if path.endswith((".har", ".har.zip")):
+            for i, (_, html) in enumerate(har_html_documents(path)):
+                yield f"recorded-{name}-{i}", lambda html=html: html
+        else:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                html = f.read()
+            yield f"recorded-{name}", lambda html=html: html
+
+
+def records_digest(records):
+    return hashlib.sha256(json.dumps(records, ensure_ascii=False, separators=(",", ":")).encode("utf-8")).hexdigest()
+
+
+def run_case(html, backend, repeat):
+    """Best-of-repeat seconds, peak traced bytes, row count, columns and records digest for one parse."""
+    try:
+        records = html_table_to_records(html, backend)
+    except ValueError as e:
+        return {"error": str(e)}
+    shape = {"rows": len(records), "columns": list(records[0]), "digest": records_digest(records)}
+    del records
+
+    best = None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        html_table_to_records(html, backend)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    # Memory is measured in a separate run because tracing slows allocation-heavy code
+    gc.collect()
+    tracemalloc.start()
+    html_table_to_records(html, backend)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": best, "peakBytes": peak, **shape}
+
+
+def compare(results, baseline, time_tolerance, memory_tolerance):
+    """Regressions as readable strings; cases missing from either side are ignored."""
+    regressions = []
+    old_cases = baseline.get("cases", {})
+    for key, new in results.items():
+        old = old_cases.get(key)
+        if not old or "error" in old or "error" in new:
+            continue
+        if new["seconds"] > old["seconds"] * (1 + time_tolerance):
+            regressions.append(f"{key}: time {old['seconds'] * 1000:.2f} -> {new['seconds'] * 1000:.2f} ms")
+        if new["peakBytes"] > old["peakBytes"] * (1 + memory_tolerance):
+            regressions.append(f"{key}: peak memory {old['peakBytes'] / 1024:.0f} -> {new['peakBytes'] / 1024:.0f} KiB")
+        if new["rows"] != old["rows"]:
+            regressions.append(f"{key}: row count {old['rows']} -> {new['rows']}")
+        # Older baselines predate columns/digest
+        if "columns" in old and new["columns"] != old["columns"]:
+            regressions.append(f"{key}: columns {old['columns']} -> {new['columns']}")
+        elif "digest" in old and new["digest"] != old["digest"]:
+            regressions.append(f"{key}: record contents changed")
+    return regressions
+
+
+def parity_mismatches(rows=PARITY_ROWS):
+    """Synthetic cases where the stdlib backend's records differ from the pandas reference."""
+    mismatches = []
+    for variant in PARITY_VARIANTS:
+        html = synthetic_table(rows, SHAPES["narrow"], variant)
+        expected = html_table_to_records(html, "pandas")
+        actual = html_table_to_records(html, "stdlib")
+        if list(actual[0]) != list(expected[0]):
+            mismatches.append(f"narrow-{variant}-{rows}: columns {list(expected[0])} (pandas) vs {list(actual[0])} (stdlib)")
+        elif actual != expected:
+            row = next(i for i, (a, b) in enumerate(zip(actual, expected)) if a != b) if len(actual) == len(expected) else None
+            detail = f"first difference at row {row}" if row is not None else f"{len(expected)} vs {len(actual)} rows"
+            mismatches.append(f"narrow-{variant}-{rows}: records differ ({detail})")
+    return mismatches
+
+
+def backend_available(backend):
+    if backend != "pandas":
+        return True
+    try:
+        import pandas  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HTML table parsing backends")
+    parser.add_argument("--backend", action="append", choices=TABLE_BACKENDS,
+                        help="Backend to benchmark (repeatable, default: all installed)")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help=f"Synthetic row counts (default: {','.join(map(str, DEFAULT_SIZES))})")
+    parser.add_argument("--wide-max-rows", type=int, default=DEFAULT_WIDE_MAX_ROWS,
+                        help=f"Largest wide (40 column) table (default: {DEFAULT_WIDE_MAX_ROWS})")
+    parser.add_argument("--recorded", action="append", default=[],
+                        help="Directory or glob of recorded .html / .har.zip pages (repeatable)")
+    parser.add_argument("--no-synthetic", action="store_true", help="Only run the recorded corpus")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per case, best is kept (default: 3)")
+    parser.add_argument("--save-baseline", help="Write results to this JSON file")
+    parser.add_argument("--baseline", help="Fail if slower or larger than this saved run")
+    parser.add_argument("--time-tolerance", type=float, default=0.25,
+                        help="Allowed slowdown as a fraction of the baseline (default: 0.25)")
+    parser.add_argument("--memory-tolerance", type=float, default=0.25,
+                        help="Allowed peak memory growth as a fraction of the baseline (default: 0.25)")
+    args = parser.parse_args()
+
+    backends = [b for b in (args.backend or TABLE_BACKENDS) if backend_available(b)]
+    if not backends:
+        print("ERROR: No table backend available. Run: pip install pandas lxml", file=sys.stderr)
+        return 1
+
+    cases = list(recorded_cases(args.recorded))
+    if not args.no_synthetic:
+        sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+        cases = list(synthetic_cases(sizes, args.wide_max_rows)) + cases
+    if not cases:
+        print("ERROR: No benchmark cases (check --recorded)", file=sys.stderr)
+        return 1
+
+    results = {}
+    print(f"{'Case':<32} {'Backend':<8} {'ms':>10} {'peak KiB':>10} {'rows':>7}")
+    for name, make_html in cases:
+        html = make_html()
+        for backend in backends:
+            key = f"{name}/{backend}"
+            result = run_case(html, backend, args.repeat)
+            results[key] = result
+            if "error" in result:
+                print(f"{name:<32} {backend:<8} error: {result['error']}")
+            else:
+                print(f"{name:<32} {backend:<8} {result['seconds'] * 1000:>10.2f} "
+                      f"{result['peakBytes'] / 1024:>10.0f} {result['rows']:>7}")
+
+    failed = False
+    if backend_available("pandas"):
+        mismatches = parity_mismatches()
+        if mismatches:
+            print(f"\n{len(mismatches)} stdlib/pandas mismatch(es):", file=sys.stderr)
+            for mismatch in mismatches:
+                print(f"   {mismatch}", file=sys.stderr)
+            failed = True
+        else:
+            print(f"\nstdlib matches pandas on the {' and '.join(PARITY_VARIANTS)} cases")
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump({
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "repeat": args.repeat,
+                "cases": results,
+            }, f, indent=2)
+        print(f"\n💾 Baseline saved to: {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.time_tolerance, args.memory_tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) against {args.baseline}:", file=sys.stderr)
+            for regression in regressions:
+                print(f"   {regression}", file=sys.stderr)
+            return 1
+        print(f"\nNo regressions against {args.baseline}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
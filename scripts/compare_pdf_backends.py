@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+compare_pdf_backends.py
+Compare the PDF text extraction backends used by parseResumeFile.py on a corpus
+of resumes: extraction time per backend and how closely each backend's text
+matches the PyPDF2 reference (token-level similarity after whitespace folding).
+
+Usage:
+    python scripts/compare_pdf_backends.py <directory|glob> [--max-pages N] [--json]
+"""
+
+import argparse
+import difflib
+import json
+import os
+import statistics
+import sys
+import time
+
+from parseResumeFile import (
+    PDF_BACKENDS,
+    discover_resume_files,
+    extract_pdf_page_range,
+    pdf_backend_available,
+    pdf_page_count,
+)
+
+
+def tokens(text: str) -> list[str]:
+    return text.split()
+
+
+def similarity(reference: str, candidate: str) -> float:
+    """Token-level similarity in [0, 1]; 1.0 means the same words in the same order."""
+    if not reference and not candidate:
+        return 1.0
+    return difflib.SequenceMatcher(None, tokens(reference), tokens(candidate), autojunk=False).ratio()
+
+
+def extract(backend: str, data: bytes, max_pages: int) -> tuple[str, float, int]:
+    start = time.perf_counter()
+    pages = pdf_page_count(backend, data)
+    if max_pages > 0:
+        pages = min(pages, max_pages)
+    text = "".join(extract_pdf_page_range(backend, data, 0, pages))
+    return text, time.perf_counter() - start, pages
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare PDF extraction backends against PyPDF2")
+    parser.add_argument("target", help="Directory or glob of PDF files")
+    parser.add_argument("--max-pages", type=int, default=0, help="Page budget per document (0 = all)")
+    parser.add_argument("--json", action="store_true", help="Print per-file results as JSON")
+    args = parser.parse_args()
+
+    files = [f for f in discover_resume_files(args.target) if f.lower().endswith(".pdf")]
+    if not files:
+        print(f"ERROR: No PDF files found for: {args.target}", file=sys.stderr)
+        return 1
+
+    backends = [b for b in PDF_BACKENDS if pdf_backend_available(b)]
+    timings = {b: [] for b in backends}
+    scores = {b: [] for b in backends}
+    rows = []
+
+    for path in files:
+        with open(path, "rb") as f:
+            data = f.read()
+        row = {"file": os.path.basename(path), "backends": {}}
+        try:
+            reference, _, _ = extract("pypdf2", data, args.max_pages)
+        except Exception as e:
+            # Without the PyPDF2 text there is nothing to score against
+            row["referenceError"] = str(e)
+            rows.append(row)
+            continue
+        for backend in backends:
+            try:
+                text, seconds, pages = extract(backend, data, args.max_pages)
+            except Exception as e:
+                row["backends"][backend] = {"error": str(e)}
+                continue
+            score = similarity(reference, text)
+            timings[backend].append(seconds)
+            scores[backend].append(score)
+            row["backends"][backend] = {
+                "seconds": round(seconds, 4),
+                "pages": pages,
+                "chars": len(text),
+                "similarityToPyPDF2": round(score, 4),
+            }
+        rows.append(row)
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return 0
+
+    reference_errors = [row["file"] for row in rows if "referenceError" in row]
+    print(f"{len(files)} PDF file(s)")
+    if reference_errors:
+        print(f"Skipped {len(reference_errors)} file(s) PyPDF2 could not read: {', '.join(reference_errors)}")
+    print()
+    print(f"{'Backend':<10} {'Total s':>9} {'Median ms':>10} {'Speedup':>8} {'Min sim':>8} {'Mean sim':>9}")
+    baseline_total = sum(timings["pypdf2"]) or 1e-9
+    for backend in backends:
+        if not timings[backend]:
+            print(f"{backend:<10} {'failed':>9}")
+            continue
+        total = sum(timings[backend])
+        print(
+            f"{backend:<10} {total:>9.3f} {statistics.median(timings[backend]) * 1000:>10.1f} "
+            f"{baseline_total / total:>7.1f}x {min(scores[backend]):>8.3f} {statistics.mean(scores[backend]):>9.3f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
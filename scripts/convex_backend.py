@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+convex_backend.py
+Pluggable Convex backend for the scraper scripts. By default clients are real
+ConvexClient instances; with CONVEX_BACKEND=sqlite[:path] they are an offline
+stand-in backed by a local SQLite file that implements the functions the
+scrapers call, with injected latency, so the scrape -> parse -> upload pipeline
+can be run, load-tested and profiled without a network or a deployment.
+
+Implemented functions (same names and argument/return shapes as convex/):
+    procurementUrls:getApproved
+    procurementUrls:getApprovedPaginated
+    procurementData:create
+    htmlParsingActions:parseHtmlIntelligently   (local HTML table parser)
+
+Environment:
+    CONVEX_BACKEND         convex (default) | sqlite | sqlite:/path/to/db.sqlite3
+    FAKE_CONVEX_LATENCY    Median latency in ms per kind or function, e.g.
+                           "query=60,mutation=120,action=4000,procurementUrls:getApproved=200"
+    FAKE_CONVEX_JITTER     Log-normal sigma applied to every delay (default: 0.35, 0 = fixed)
+    FAKE_CONVEX_BANDWIDTH  Simulated transfer rate in MB/s for args and results (default: 20)
+    FAKE_CONVEX_SEED       Seed for the latency jitter
+
+Usage:
+    python scripts/convex_backend.py seed --db fake.sqlite3 --links links.json
+    python scripts/convex_backend.py seed --db fake.sqlite3 --synthetic 500 --base-url http://127.0.0.1:8000/bids
+    python scripts/convex_backend.py stats --db fake.sqlite3
+    CONVEX_BACKEND=sqlite:fake.sqlite3 python scripts/scraper3.py
+"""
+
+import argparse
+import atexit
+import json
+import math
+import os
+import random
+import secrets
+import sqlite3
+import sys
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from table_parsing import extract_tables, table_records
+
+try:
+    from convex import ConvexClient
+    CONVEX_AVAILABLE = True
+except ImportError:
+    CONVEX_AVAILABLE = False
+
+
+DEFAULT_DB_PATH = Path("convex_fake.sqlite3")
+
+# Median latency in ms by function kind, roughly what a cloud deployment shows
+# from a laptop; actions include the LLM call behind parseHtmlIntelligently.
+DEFAULT_LATENCY_MS = {
+    "query": 60.0,
+    "mutation": 120.0,
+    "action": 4000.0,
+}
+DEFAULT_JITTER = 0.35
+DEFAULT_BANDWIDTH_MBPS = 20.0
+
+US_STATES = [
+    "Alabama", "Alaska", "Arizona", "Arkansas", "California", "Colorado", "Connecticut", "Delaware",
+    "Florida", "Georgia", "Hawaii", "Idaho", "Illinois", "Indiana", "Iowa", "Kansas", "Kentucky",
+    "Louisiana", "Maine", "Maryland", "Massachusetts", "Michigan", "Minnesota", "Mississippi",
+    "Missouri", "Montana", "Nebraska", "Nevada", "New Hampshire", "New Jersey", "New Mexico",
+    "New York", "North Carolina", "North Dakota", "Ohio", "Oklahoma", "Oregon", "Pennsylvania",
+    "Rhode Island", "South Carolina", "South Dakota", "Tennessee", "Texas", "Utah", "Vermont",
+    "Virginia", "Washington", "West Virginia", "Wisconsin", "Wyoming",
+]
+
+
+def backend_spec():
+    return os.getenv("CONVEX_BACKEND", "convex").strip() or "convex"
+
+
+def offline_backend_enabled():
+    """True when CONVEX_BACKEND selects the SQLite stand-in instead of a deployment."""
+    return backend_spec().split(":", 1)[0] == "sqlite"
+
+
+def create_client(convex_url=None):
+    """Return a client for the configured backend (ConvexClient or FakeConvexClient)."""
+    spec = backend_spec()
+    kind, _, path = spec.partition(":")
+    if kind == "sqlite":
+        client = FakeConvexClient(Path(path) if path else DEFAULT_DB_PATH, latency=LatencyModel.from_env())
+        print(f"🧪 Using offline Convex stand-in: {client.path}", file=sys.stderr)
+        atexit.register(client.print_summary)
+        return client
+    if kind != "convex":
+        raise ValueError(f"Unknown CONVEX_BACKEND {spec!r} (expected convex or sqlite[:path])")
+    if not CONVEX_AVAILABLE:
+        raise ImportError("convex package is required. Install with: pip install convex")
+    return ConvexClient(convex_url)
+
+
+# --- Latency injection -------------------------------------------------------
+
+class LatencyModel:
+    """Log-normal delays around a per-kind (or per-function) median plus transfer time."""
+
+    def __init__(self, medians=None, jitter=DEFAULT_JITTER, bandwidth_mbps=DEFAULT_BANDWIDTH_MBPS, seed=None):
+        self.medians = {**DEFAULT_LATENCY_MS, **(medians or {})}
+        self.jitter = jitter
+        self.bandwidth = bandwidth_mbps * 1024 * 1024
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        medians = {}
+        for item in os.getenv("FAKE_CONVEX_LATENCY", "").split(","):
+            if not item.strip():
+                continue
+            name, _, value = item.rpartition("=")
+            try:
+                medians[name.strip()] = float(value)
+            except ValueError:
+                raise ValueError(f"Invalid FAKE_CONVEX_LATENCY entry: {item!r}")
+        seed = os.getenv("FAKE_CONVEX_SEED")
+        return cls(
+            medians,
+            jitter=float(os.getenv("FAKE_CONVEX_JITTER", DEFAULT_JITTER)),
+            bandwidth_mbps=float(os.getenv("FAKE_CONVEX_BANDWIDTH", DEFAULT_BANDWIDTH_MBPS)),
+            seed=int(seed) if seed else None,
+        )
+
+    def delay(self, kind, function_name, payload_bytes=0):
+        """Seconds to wait for one call of function_name moving payload_bytes."""
+        median = self.medians.get(function_name, self.medians[kind]) / 1000
+        if self.jitter > 0:
+            with self.lock:
+                median *= math.exp(self.random.gauss(0, self.jitter))
+        transfer = payload_bytes / self.bandwidth if self.bandwidth > 0 else 0
+        return median + transfer
+
+
+# --- Fake HTML parsing action ------------------------------------------------
+
+def parse_html_tables(html_content):
+    """Records from the largest table in html_content (the stdlib table parser)."""
+    tables = [t for t in extract_tables(html_content) if len(t["rows"]) >= 2]
+    if not tables:
+        return []
+    return table_records(max(tables, key=lambda t: len(t["rows"])))
+
+
+# --- SQLite-backed client ----------------------------------------------------
+
+def new_document_id():
+    # Convex ids are opaque 32-character base32 strings
+    return "".join(secrets.choice("0123456789abcdefghjkmnpqrstvwxyz") for _ in range(32))
+
+
+class FakeConvexClient:
+    """Drop-in for ConvexClient.query/mutation/action backed by a SQLite file."""
+
+    def __init__(self, path=DEFAULT_DB_PATH, latency=None):
+        self.path = Path(path)
+        self.latency = latency or LatencyModel(jitter=0, medians={k: 0 for k in DEFAULT_LATENCY_MS})
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS procurementUrls (
+                id TEXT PRIMARY KEY,
+                state TEXT NOT NULL,
+                status TEXT NOT NULL,
+                creation_time REAL NOT NULL,
+                doc TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS procurementUrls_by_status ON procurementUrls (status, creation_time, id);
+            CREATE TABLE IF NOT EXISTS procurementData (
+                id TEXT PRIMARY KEY,
+                procurement_url_id TEXT,
+                state TEXT NOT NULL,
+                creation_time REAL NOT NULL,
+                doc TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS procurementData_by_url ON procurementData (procurement_url_id);
+        """)
+        self.functions = {
+            "procurementUrls:getApproved": ("query", self._get_approved),
+            "procurementUrls:getApprovedPaginated": ("query", self._get_approved_paginated),
+            "procurementData:create": ("mutation", self._create_procurement_data),
+            "htmlParsingActions:parseHtmlIntelligently": ("action", self._parse_html_intelligently),
+        }
+        self.calls = defaultdict(lambda: [0, 0.0])
+
+    # ConvexClient interface
+
+    def query(self, name, args=None):
+        return self._call("query", name, args or {})
+
+    def mutation(self, name, args=None):
+        return self._call("mutation", name, args or {})
+
+    def action(self, name, args=None):
+        return self._call("action", name, args or {})
+
+    def _call(self, kind, name, args):
+        entry = self.functions.get(name)
+        if entry is None or entry[0] != kind:
+            raise Exception(f"Could not find public function for '{name}'. Did you forget to run `npx convex dev`?")
+        start = time.perf_counter()
+        result = entry[1](args)
+        payload = len(json.dumps(args, default=str)) + len(json.dumps(result, default=str))
+        remaining = self.latency.delay(kind, name, payload) - (time.perf_counter() - start)
+        if remaining > 0:
+            time.sleep(remaining)
+        with self.lock:
+            stats = self.calls[name]
+            stats[0] += 1
+            stats[1] += time.perf_counter() - start
+        return result
+
+    # Function implementations
+
+    def _get_approved(self, args):
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT doc FROM procurementUrls WHERE status = 'approved' ORDER BY creation_time, id"
+            ).fetchall()
+        return [json.loads(doc) for (doc,) in rows]
+
+    def _get_approved_paginated(self, args):
+        opts = args["paginationOpts"]
+        offset = int(opts.get("cursor") or 0)
+        limit = int(opts["numItems"])
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT doc FROM procurementUrls WHERE status = 'approved' ORDER BY creation_time, id LIMIT ? OFFSET ?",
+                (limit + 1, offset),
+            ).fetchall()
+        page = [json.loads(doc) for (doc,) in rows[:limit]]
+        return {"page": page, "isDone": len(rows) <= limit, "continueCursor": str(offset + len(page))}
+
+    def _create_procurement_data(self, args):
+        missing = [k for k in ("state", "sourceUrl", "data", "rowCount") if k not in args]
+        if missing:
+            raise Exception(f"ArgumentValidationError: missing required field(s) {missing} for procurementData:create")
+        now = time.time() * 1000
+        doc_id = new_document_id()
+        doc = {
+            "_id": doc_id,
+            "_creationTime": now,
+            **{k: v for k, v in args.items() if v is not None},
+            "status": "pending_review",
+            "createdAt": now,
+        }
+        with self.lock:
+            self.conn.execute(
+                "INSERT INTO procurementData VALUES (?, ?, ?, ?, ?)",
+                (doc_id, args.get("procurementUrlId"), args["state"], now, json.dumps(doc)),
+            )
+            self.conn.commit()
+        return doc_id
+
+    def _parse_html_intelligently(self, args):
+        records = parse_html_tables(args["htmlContent"][:100000])
+        if not records:
+            return {"success": False, "data": [], "rowCount": 0, "columnCount": 0,
+                    "error": "No table data found in HTML"}
+        return {
+            "success": True,
+            "data": records,
+            "rowCount": len(records),
+            "columnCount": max(len(r) for r in records),
+            "notes": "Parsed locally by the offline Convex stand-in",
+        }
+
+    # Seeding and inspection
+
+    def add_procurement_urls(self, links):
+        """Insert procurementUrls documents (e.g. from a getApproved export); returns the count."""
+        now = time.time() * 1000
+        rows = []
+        for i, link in enumerate(links):
+            doc = {
+                "_id": link.get("_id") or new_document_id(),
+                "_creationTime": link.get("_creationTime") or now + i,
+                "status": "approved",
+                "importedAt": now,
+                **link,
+            }
+            rows.append((doc["_id"], doc["state"], doc["status"], doc["_creationTime"], json.dumps(doc)))
+        with self.lock:
+            self.conn.executemany("INSERT OR REPLACE INTO procurementUrls VALUES (?, ?, ?, ?, ?)", rows)
+            self.conn.commit()
+        return len(rows)
+
+    def table_counts(self):
+        with self.lock:
+            return {
+                "procurementUrls": self.conn.execute("SELECT COUNT(*) FROM procurementUrls").fetchone()[0],
+                "approved": self.conn.execute(
+                    "SELECT COUNT(*) FROM procurementUrls WHERE status = 'approved'").fetchone()[0],
+                "procurementData": self.conn.execute("SELECT COUNT(*) FROM procurementData").fetchone()[0],
+            }
+
+    def print_summary(self):
+        if not self.calls:
+            return
+        print("\n🧪 Offline Convex calls:", file=sys.stderr)
+        for name, (count, seconds) in sorted(self.calls.items()):
+            print(f"   {name:<45} {count:>6} call(s) {seconds * 1000 / count:>9.1f} ms avg", file=sys.stderr)
+
+
+def synthetic_links(count, base_url):
+    return [
+        {
+            "state": US_STATES[i % len(US_STATES)],
+            "capital": f"City {i}",
+            "officialWebsite": f"{base_url.rstrip('/')}/city-{i}",
+            "procurementLink": f"{base_url.rstrip('/')}/city-{i}/bids",
+            "requiresRegistration": i % 4 == 0,
+        }
+        for i in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the offline Convex stand-in database")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    seed = subparsers.add_parser("seed", help="Load approved procurement links into the database")
+    seed.add_argument("--db", type=Path, default=DEFAULT_DB_PATH, help=f"SQLite file (default: {DEFAULT_DB_PATH})")
+    source = seed.add_mutually_exclusive_group(required=True)
+    source.add_argument("--links", type=Path,
+                        help="JSON from get_approved_procurement_links.py --format json (or a plain list)")
+    source.add_argument("--synthetic", type=int, metavar="N", help="Generate N approved links")
+    seed.add_argument("--base-url", default="http://127.0.0.1:8000",
+                      help="Base URL for synthetic links (default: http://127.0.0.1:8000)")
+
+    stats = subparsers.add_parser("stats", help="Show table counts")
+    stats.add_argument("--db", type=Path, default=DEFAULT_DB_PATH, help=f"SQLite file (default: {DEFAULT_DB_PATH})")
+
+    args = parser.parse_args()
+    client = FakeConvexClient(args.db)
+
+    if args.command == "seed":
+        if args.links:
+            with open(args.links, "r", encoding="utf-8") as f:
+                loaded = json.load(f)
+            links = loaded["links"] if isinstance(loaded, dict) else loaded
+        else:
+            links = synthetic_links(args.synthetic, args.base_url)
+        print(f"✅ Seeded {client.add_procurement_urls(links)} procurement link(s) into {args.db}")
+
+    print(json.dumps(client.table_counts(), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,7 +6,7 @@ Standalone Python script to fetch all approved procurement links from the Convex
 Can be run independently from the command line.
 
 Usage:
-    python get_approved_procurement_links.py [--output FILE] [--format json|table|csv]
+    python get_approved_procurement_links.py [--output FILE] [--format json|table|csv] [--page-size N]
     
 Environment Variables:
     CONVEX_URL or VITE_CONVEX_URL - Your Convex deployment URL
@@ -14,12 +14,15 @@ Environment Variables:
 """
 
 import argparse
+import csv
+import io
 import json
 import os
 import sys
 from datetime import datetime
+from itertools import chain, islice
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO
 
 try:
     from convex import ConvexClient
@@ -55,80 +58,154 @@ def load_convex_url() -> Optional[str]:
     return convex_url
 
 
+# Page size for procurementUrls:getApprovedPaginated
+DEFAULT_PAGE_SIZE = 500
+
+# Rows buffered to size the table columns before the first line is written
+TABLE_SAMPLE_SIZE = 200
+
+TABLE_COLUMNS = [
+    ("state", "State", 10),
+    ("capital", "Capital", 10),
+    ("officialWebsite", "Official Website", 20),
+    ("procurementLink", "Procurement Link", 25),
+]
+
+CSV_COLUMNS = ["state", "capital", "officialWebsite", "procurementLink", "requiresRegistration"]
+
+
+def write_table(links: Iterable[Dict], out: TextIO, sample_size: int = TABLE_SAMPLE_SIZE) -> int:
+    """Write links as a readable table, sizing columns from the first sample_size rows.
+
+    Rows after the sample are truncated to the sampled widths, so the table is
+    written as the links arrive instead of after the whole set is known.
+    Returns the number of rows written.
+    """
+    links = iter(links)
+    sample = list(islice(links, sample_size))
+    if not sample:
+        out.write("No approved procurement links found.\n")
+        return 0
+
+    widths = [
+        max(minimum, max(len(str(link.get(key, ""))) for link in sample))
+        for key, _, minimum in TABLE_COLUMNS
+    ]
+
+    header = " | ".join(f"{title:<{width}}" for (_, title, _), width in zip(TABLE_COLUMNS, widths))
+    out.write(header + "\n")
+    out.write("-" * len(header) + "\n")
+
+    count = 0
+    for link in chain(sample, links):
+        cells = []
+        for (key, _, _), width in zip(TABLE_COLUMNS, widths):
+            value = str(link.get(key, ""))
+            # Truncate long values (URLs, or anything wider than the sample)
+            if len(value) > width:
+                value = value[:width-3] + "..."
+            cells.append(f"{value:<{width}}")
+        out.write(" | ".join(cells) + "\n")
+        count += 1
+    return count
+
+
+def write_csv(links: Iterable[Dict], out: TextIO) -> int:
+    """Write links as CSV, one row at a time. Returns the number of rows written.
+
+    Fields are quoted by the csv module, so commas and quotes inside values
+    survive a round trip.
+    """
+    writer = csv.writer(out, lineterminator="\n")
+    writer.writerow(CSV_COLUMNS)
+    count = 0
+    for link in links:
+        requires_reg = link.get("requiresRegistration")
+        writer.writerow([
+            link.get("state", ""),
+            link.get("capital", ""),
+            link.get("officialWebsite", ""),
+            link.get("procurementLink", ""),
+            "" if requires_reg is None else str(requires_reg).lower(),
+        ])
+        count += 1
+    return count
+
+
+def write_json(links: Iterable[Dict], out: TextIO) -> int:
+    """Write {"fetchedAt", "links", "totalLinks"} incrementally. Returns the number of links written.
+
+    totalLinks comes after the links array because it is only known once the
+    last page has been fetched.
+    """
+    out.write('{\n  "fetchedAt": ' + json.dumps(datetime.now().isoformat()) + ',\n  "links": [')
+    count = 0
+    for link in links:
+        item = json.dumps(link, indent=2, ensure_ascii=False).replace("\n", "\n    ")
+        out.write(("," if count else "") + "\n    " + item)
+        count += 1
+    out.write(("\n  " if count else "") + f'],\n  "totalLinks": {count}\n}}\n')
+    return count
+
+
+WRITERS = {
+    "table": write_table,
+    "csv": write_csv,
+    "json": write_json,
+}
+
+
 def format_as_table(links: List[Dict]) -> str:
     """Format links as a readable table."""
     if not links:
         return "No approved procurement links found."
-    
-    # Calculate column widths
-    max_state = max(len(str(link.get("state", ""))) for link in links) if links else 0
-    max_capital = max(len(str(link.get("capital", ""))) for link in links) if links else 0
-    max_official = max(len(str(link.get("officialWebsite", ""))) for link in links) if links else 0
-    max_procurement = max(len(str(link.get("procurementLink", ""))) for link in links) if links else 0
-    
-    # Set minimum widths
-    max_state = max(max_state, 10)
-    max_capital = max(max_capital, 10)
-    max_official = max(max_official, 20)
-    max_procurement = max(max_procurement, 25)
-    
-    # Header
-    header = f"{'State':<{max_state}} | {'Capital':<{max_capital}} | {'Official Website':<{max_official}} | {'Procurement Link':<{max_procurement}}"
-    separator = "-" * len(header)
-    
-    lines = [header, separator]
-    
-    # Rows
-    for link in links:
-        state = str(link.get("state", ""))
-        capital = str(link.get("capital", ""))
-        official = str(link.get("officialWebsite", ""))
-        procurement = str(link.get("procurementLink", ""))
-        
-        # Truncate long URLs
-        if len(official) > max_official:
-            official = official[:max_official-3] + "..."
-        if len(procurement) > max_procurement:
-            procurement = procurement[:max_procurement-3] + "..."
-        
-        line = f"{state:<{max_state}} | {capital:<{max_capital}} | {official:<{max_official}} | {procurement:<{max_procurement}}"
-        lines.append(line)
-    
-    return "\n".join(lines)
+    buffer = io.StringIO()
+    write_table(links, buffer, sample_size=len(links))
+    return buffer.getvalue().rstrip("\n")
 
 
 def format_as_csv(links: List[Dict]) -> str:
     """Format links as CSV."""
-    if not links:
-        return "state,capital,officialWebsite,procurementLink,requiresRegistration"
-    
-    lines = ["state,capital,officialWebsite,procurementLink,requiresRegistration"]
-    
-    for link in links:
-        state = str(link.get("state", "")).replace(",", ";")
-        capital = str(link.get("capital", "")).replace(",", ";")
-        official = str(link.get("officialWebsite", "")).replace(",", ";")
-        procurement = str(link.get("procurementLink", "")).replace(",", ";")
-        requires_reg = str(link.get("requiresRegistration", "")).lower() if link.get("requiresRegistration") is not None else ""
-        
-        line = f"{state},{capital},{official},{procurement},{requires_reg}"
-        lines.append(line)
-    
-    return "\n".join(lines)
+    buffer = io.StringIO()
+    write_csv(links, buffer)
+    return buffer.getvalue().rstrip("\n")
 
 
-def get_approved_links(convex_url: str) -> List[Dict]:
-    """Fetch approved procurement links from Convex."""
+def iter_approved_links(convex_url: str, page_size: int = DEFAULT_PAGE_SIZE) -> Iterator[Dict]:
+    """Yield approved procurement links page by page from Convex.
+
+    Uses procurementUrls:getApprovedPaginated with a cursor so only one page is
+    held in memory at a time. Deployments that don't have the paginated query
+    yet fall back to a single procurementUrls:getApproved call.
+    """
     if not CONVEX_AVAILABLE:
         raise ImportError("convex package is required. Install with: pip install convex")
-    
+
     client = ConvexClient(convex_url)
-    
-    # Call the getApproved query
-    # The query is at procurementUrls:getApproved
-    links = client.query("procurementUrls:getApproved", {})
-    
-    return links
+    cursor = None
+    first_page = True
+    while True:
+        try:
+            result = client.query(
+                "procurementUrls:getApprovedPaginated",
+                {"paginationOpts": {"numItems": page_size, "cursor": cursor}},
+            )
+        except Exception as e:
+            if first_page and "getApprovedPaginated" in str(e):
+                print("⚠ procurementUrls:getApprovedPaginated not deployed, fetching all links in one call", file=sys.stderr)
+                yield from client.query("procurementUrls:getApproved", {})
+                return
+            raise
+        first_page = False
+        yield from result["page"]
+        if result["isDone"]:
+            return
+        cursor = result["continueCursor"]
+
+
+def get_approved_links(convex_url: str) -> List[Dict]:
+    """Fetch approved procurement links from Convex."""
+    return list(iter_approved_links(convex_url))
 
 
 def main():
@@ -145,6 +222,8 @@ Examples:
   
   # Export as CSV
   python get_approved_procurement_links.py --output links.csv --format csv
+
+  # Parquet/Arrow/NDJSON for analytics: see procurement_export.py
   
   # Display as table in terminal
   python get_approved_procurement_links.py --format table
@@ -174,6 +253,12 @@ Environment Variables:
         type=str,
         help='Convex deployment URL (overrides environment variables)'
     )
+    parser.add_argument(
+        '--page-size',
+        type=int,
+        default=DEFAULT_PAGE_SIZE,
+        help=f'Links fetched per request (default: {DEFAULT_PAGE_SIZE})'
+    )
     
     args = parser.parse_args()
     
@@ -197,32 +282,21 @@ Environment Variables:
     print(f"🔗 Connecting to Convex at: {convex_url}", file=sys.stderr)
     
     try:
-        # Fetch approved links
+        # Fetch approved links page by page and stream them to the formatter
         print("📥 Fetching approved procurement links...", file=sys.stderr)
-        links = get_approved_links(convex_url)
-        
-        print(f"✅ Found {len(links)} approved procurement link(s)", file=sys.stderr)
-        
-        # Format output
-        if args.format == 'json':
-            output_data = {
-                "fetchedAt": datetime.now().isoformat(),
-                "totalLinks": len(links),
-                "links": links
-            }
-            output = json.dumps(output_data, indent=2, ensure_ascii=False)
-        elif args.format == 'csv':
-            output = format_as_csv(links)
-        else:  # table
-            output = format_as_table(links)
-        
-        # Write output
+        links = iter_approved_links(convex_url, page_size=args.page_size)
+        writer = WRITERS[args.format]
+
         if args.output:
-            output_path = Path(args.output)
-            output_path.write_text(output, encoding='utf-8')
-            print(f"💾 Results saved to: {args.output}", file=sys.stderr)
+            with open(args.output, 'w', encoding='utf-8', newline='') as out:
+                count = writer(links, out)
         else:
-            print(output)
+            count = writer(links, sys.stdout)
+            sys.stdout.flush()
+
+        print(f"✅ Found {count} approved procurement link(s)", file=sys.stderr)
+        if args.output:
+            print(f"💾 Results saved to: {args.output}", file=sys.stderr)
         
         return 0
         
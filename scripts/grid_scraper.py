@@ -0,0 +1,526 @@
+#!/usr/bin/env python3
+"""
+Config-Driven Grid Scraper
+
+Generic engine for municipal procurement portals that publish opportunities as
+an HTML table (ASP.NET GridView or plain HTML). Each portal is described by a
+small JSON spec in scripts/grid_sites/ (table selector, column map, pager type,
+date formats) and many specs are scraped concurrently over one shared HTTP
+connection pool.
+
+Usage:
+    python grid_scraper.py [--site NAME ...] [--spec FILE ...] [--workers N]
+                           [--max-pages N] [--output FILE] [--from-convex]
+
+Output is streamed as NDJSON (one record per line, tagged with its site) and a
+<output>.manifest.json with per-site stats is written atomically at the end.
+
+Spec format (see grid_sites/san_antonio.json):
+    {
+      "name": "san_antonio",
+      "url": "https://.../Default.aspx",
+      "match": ["webapp1.sanantonio.gov/BidContractOpps"],
+      "table": {"selector": "table[id*=gvBidContractOpps], table", "minCells": 6,
+                "skipRowsContaining": "Description"},
+      "columns": {"description": {"index": 0, "link": "detailUrl"}, "type": 1},
+      "idField": {"name": "bidNumber", "source": "description", "pattern": "^(\\d+)"},
+      "dates": {"fields": ["releaseDate"], "formats": ["%m/%d/%Y"],
+                "timezone": "America/Chicago"},
+      "pager": {"type": "aspnet", "maxPages": 10}
+    }
+
+Pager types: "aspnet" (__doPostBack Page$N links), "link" (follow a next link
+found by CSS selector or link text) and "none".
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urljoin
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+    from bs4 import BeautifulSoup
+    REQUESTS_AVAILABLE = True
+except ImportError:
+    REQUESTS_AVAILABLE = False
+    print("Warning: requests/beautifulsoup4 not installed. Install with: pip install requests beautifulsoup4", file=sys.stderr)
+
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:
+    ZoneInfo = None
+
+try:
+    from dotenv import load_dotenv
+    DOTENV_AVAILABLE = True
+except ImportError:
+    DOTENV_AVAILABLE = False
+
+
+SCRIPT_DIR = Path(__file__).parent.absolute()
+DEFAULT_SITES_DIR = SCRIPT_DIR / "grid_sites"
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+PAGER_TYPES = ("aspnet", "link", "none")
+
+POSTBACK_PATTERN = re.compile(r"__doPostBack\('([^']*)','([^']*)'\)")
+
+
+# ------------------------------------------------------------------
+# SITE SPECS
+# ------------------------------------------------------------------
+
+class SiteSpec:
+    """Validated, declarative description of one portal's grid."""
+
+    def __init__(self, raw: Dict, source: str = "<spec>"):
+        try:
+            self.name: str = raw["name"]
+            self.url: str = raw["url"]
+        except KeyError as e:
+            raise ValueError(f"{source}: missing required key {e}")
+
+        self.source = source
+        self.match: List[str] = [m.lower() for m in raw.get("match", [])]
+        self.state: Optional[str] = raw.get("state")
+        self.capital: Optional[str] = raw.get("capital")
+
+        table = raw.get("table", {})
+        self.table_selector: str = table.get("selector", "table")
+        self.min_cells: int = table.get("minCells", 1)
+        self.skip_rows_containing: Optional[str] = table.get("skipRowsContaining")
+
+        # column name -> (cell index, link field name or None)
+        self.columns: Dict[str, Tuple[int, Optional[str]]] = {}
+        for column, rule in (raw.get("columns") or {}).items():
+            if isinstance(rule, int):
+                self.columns[column] = (rule, None)
+            elif isinstance(rule, dict) and isinstance(rule.get("index"), int):
+                self.columns[column] = (rule["index"], rule.get("link"))
+            else:
+                raise ValueError(f"{source}: column '{column}' needs an index")
+        if not self.columns:
+            raise ValueError(f"{source}: no columns defined")
+
+        id_field = raw.get("idField")
+        self.id_field: Optional[Dict] = None
+        if id_field:
+            self.id_field = {
+                "name": id_field["name"],
+                "source": id_field["source"],
+                "pattern": re.compile(id_field.get("pattern", r"^(.+)$")),
+                "default": id_field.get("default", "UNKNOWN"),
+            }
+
+        dates = raw.get("dates") or {}
+        self.date_fields: List[str] = dates.get("fields", [])
+        self.date_formats: Tuple[str, ...] = tuple(dates.get("formats", ["%m/%d/%Y"]))
+        self.timezone_name: str = dates.get("timezone", "UTC")
+
+        pager = raw.get("pager") or {}
+        self.pager_type: str = pager.get("type", "none")
+        if self.pager_type not in PAGER_TYPES:
+            raise ValueError(f"{source}: unknown pager type '{self.pager_type}'")
+        self.max_pages: int = pager.get("maxPages", 10)
+        self.next_selector: Optional[str] = pager.get("nextSelector")
+        self.next_texts: List[str] = pager.get("nextTexts", ["Next", ">", "»"])
+        self.page_delay: float = pager.get("delaySeconds", 0)
+
+    def matches(self, url: str) -> bool:
+        url = url.lower()
+        return any(pattern in url for pattern in self.match)
+
+
+def load_specs(sites_dir: Path = DEFAULT_SITES_DIR,
+               names: Optional[List[str]] = None,
+               files: Optional[List[str]] = None) -> List[SiteSpec]:
+    """Load specs from explicit files, or from the sites directory (optionally by name)."""
+    paths = [Path(f) for f in files] if files else sorted(Path(sites_dir).glob("*.json"))
+    specs = []
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            specs.append(SiteSpec(json.load(f), source=str(path)))
+    if names:
+        wanted = set(names)
+        missing = wanted - {spec.name for spec in specs}
+        if missing:
+            raise ValueError(f"Unknown site(s): {', '.join(sorted(missing))}")
+        specs = [spec for spec in specs if spec.name in wanted]
+    return specs
+
+
+# ------------------------------------------------------------------
+# ROW PARSING
+# ------------------------------------------------------------------
+
+@lru_cache(maxsize=None)
+def _timezone(name: str):
+    if name.upper() == "UTC" or ZoneInfo is None:
+        return timezone.utc
+    try:
+        return ZoneInfo(name)
+    except Exception:
+        return timezone.utc
+
+
+@lru_cache(maxsize=16384)
+def parse_date(value: str, formats: Tuple[str, ...], tz_name: str) -> Optional[datetime]:
+    """Parse a date cell once per distinct value; None for N/A or unknown formats."""
+    value = " ".join(value.split())
+    if not value:
+        return None
+    for fmt in formats:
+        try:
+            return datetime.strptime(value, fmt).replace(tzinfo=_timezone(tz_name))
+        except ValueError:
+            continue
+    return None
+
+
+def parse_rows(spec: SiteSpec, table, base_url: str) -> Iterator[Dict]:
+    """Yield one record per data row of a BeautifulSoup table."""
+    for row in table.find_all('tr'):
+        cells = row.find_all(['td', 'th'])
+        if len(cells) < spec.min_cells or cells[0].name == 'th':
+            continue
+        if spec.skip_rows_containing and spec.skip_rows_containing in cells[0].get_text():
+            continue
+
+        record: Dict = {}
+        for column, (index, link_field) in spec.columns.items():
+            if index >= len(cells):
+                record[column] = ""
+                continue
+            cell = cells[index]
+            record[column] = cell.get_text(" ", strip=True)
+            if link_field:
+                link = cell.find('a', href=True)
+                href = link['href'] if link else None
+                if href and not href.startswith('javascript:'):
+                    record[link_field] = urljoin(base_url, href)
+                else:
+                    record[link_field] = None
+
+        if not any(record.get(column) for column in spec.columns):
+            continue
+
+        if spec.id_field:
+            match = spec.id_field["pattern"].search(record.get(spec.id_field["source"]) or "")
+            record[spec.id_field["name"]] = match.group(1) if match else spec.id_field["default"]
+
+        for field in spec.date_fields:
+            parsed = parse_date(record.get(field) or "", spec.date_formats, spec.timezone_name)
+            record[f"{field}Iso"] = parsed.isoformat() if parsed else None
+            record[f"{field}Epoch"] = int(parsed.timestamp()) if parsed else None
+
+        yield record
+
+
+# ------------------------------------------------------------------
+# PAGERS
+# ------------------------------------------------------------------
+
+def _hidden_form_fields(soup) -> Dict[str, str]:
+    fields = {}
+    for hidden in soup.find_all('input', type='hidden'):
+        if hidden.get('name'):
+            fields[hidden['name']] = hidden.get('value', '')
+    return fields
+
+
+def next_aspnet_request(soup, url: str, current_page: int) -> Optional[Tuple[str, str, Dict]]:
+    """Build the postback for the next GridView page, if the pager offers one."""
+    next_postback = None
+    for link in soup.find_all('a', href=True):
+        match = POSTBACK_PATTERN.search(link['href'])
+        if not match or not match.group(2).startswith('Page$'):
+            continue
+        target, argument = match.groups()
+        page_ref = argument.split('$', 1)[1]
+        if page_ref == str(current_page + 1):
+            next_postback = (target, argument)
+            break
+        if page_ref == 'Next' and next_postback is None:
+            next_postback = (target, argument)
+    if not next_postback:
+        return None
+
+    form = soup.find('form')
+    action = urljoin(url, form.get('action')) if form and form.get('action') else url
+    data = _hidden_form_fields(soup)
+    data['__EVENTTARGET'], data['__EVENTARGUMENT'] = next_postback
+    return ('POST', action, data)
+
+
+def next_link_request(spec: SiteSpec, soup, url: str) -> Optional[Tuple[str, str, Dict]]:
+    """Find a plain next-page link by selector or link text."""
+    link = soup.select_one(spec.next_selector) if spec.next_selector else None
+    if link is None:
+        for candidate in soup.find_all('a', href=True):
+            if candidate.get_text(strip=True) in spec.next_texts:
+                link = candidate
+                break
+    if link is None or not link.get('href') or link['href'].startswith('javascript:'):
+        return None
+    return ('GET', urljoin(url, link['href']), {})
+
+
+# ------------------------------------------------------------------
+# ENGINE
+# ------------------------------------------------------------------
+
+class RecordWriter:
+    """Thread-safe NDJSON sink with an atomic manifest."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.count = 0
+        self._lock = threading.Lock()
+        self._owns_file = path != '-'
+        self._file = open(path, 'w', encoding='utf-8') if self._owns_file else sys.stdout
+
+    def write(self, record: Dict):
+        line = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+            self.count += 1
+
+    def close(self, manifest: Dict) -> Optional[str]:
+        if not self._owns_file:
+            return None
+        os.fsync(self._file.fileno())
+        self._file.close()
+        manifest_path = f"{self.path}.manifest.json"
+        tmp_path = f"{manifest_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, manifest_path)
+        return manifest_path
+
+
+class GridScraperEngine:
+    """Runs many site specs concurrently over one shared HTTP connection pool."""
+
+    def __init__(self, workers: int = 8, timeout: float = 30):
+        if not REQUESTS_AVAILABLE:
+            raise ImportError("requests and beautifulsoup4 are required. Install with: pip install requests beautifulsoup4")
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        # One adapter (connection pool) shared by every per-site session
+        self.adapter = HTTPAdapter(pool_connections=self.workers, pool_maxsize=self.workers * 2)
+
+    def _session(self) -> "requests.Session":
+        # Separate sessions keep each portal's cookies (ASP.NET session state) apart
+        session = requests.Session()
+        session.headers.update({'User-Agent': USER_AGENT})
+        session.mount('http://', self.adapter)
+        session.mount('https://', self.adapter)
+        return session
+
+    def scrape_site(self, spec: SiteSpec, emit, max_pages: Optional[int] = None,
+                    extra: Optional[Dict] = None, start_url: Optional[str] = None) -> Dict:
+        """Scrape every page of one site, emitting records as they are parsed.
+
+        start_url overrides spec.url, e.g. with the approved link's own URL.
+        """
+        max_pages = max_pages or spec.max_pages
+        start_url = start_url or spec.url
+        stats = {"site": spec.name, "url": start_url, "pages": 0, "records": 0, "error": None}
+        start_time = time.time()
+        session = self._session()
+        request = ('GET', start_url, {})
+        seen_urls = set()
+
+        try:
+            while request and stats["pages"] < max_pages:
+                method, url, data = request
+                if method == 'GET':
+                    if url in seen_urls:
+                        break
+                    seen_urls.add(url)
+                    response = session.get(url, timeout=self.timeout)
+                else:
+                    response = session.post(url, data=data, timeout=self.timeout)
+                response.raise_for_status()
+
+                soup = BeautifulSoup(response.content, 'html.parser')
+                table = soup.select_one(spec.table_selector)
+                if table is None:
+                    if stats["pages"] == 0:
+                        stats["error"] = "table not found"
+                    break
+
+                stats["pages"] += 1
+                for record in parse_rows(spec, table, response.url):
+                    record["site"] = spec.name
+                    if extra:
+                        record.update(extra)
+                    emit(record)
+                    stats["records"] += 1
+
+                if spec.pager_type == 'aspnet':
+                    request = next_aspnet_request(soup, response.url, stats["pages"])
+                elif spec.pager_type == 'link':
+                    request = next_link_request(spec, soup, response.url)
+                else:
+                    request = None
+
+                if request and spec.page_delay:
+                    time.sleep(spec.page_delay)
+        except Exception as e:
+            stats["error"] = str(e)
+        finally:
+            # Unmount the shared adapter first: Session.close() would clear its pool
+            session.adapters.clear()
+            session.close()
+
+        stats["duration"] = time.time() - start_time
+        return stats
+
+    def run(self, jobs: List[Tuple[SiteSpec, Optional[str], Optional[Dict]]], emit,
+            max_pages: Optional[int] = None) -> List[Dict]:
+        """Scrape (spec, start URL, extra fields) jobs concurrently; returns per-site stats."""
+        results = []
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {
+                executor.submit(self.scrape_site, spec, emit, max_pages, extra, start_url): spec
+                for spec, start_url, extra in jobs
+            }
+            for future in as_completed(futures):
+                stats = future.result()
+                marker = "❌" if stats["error"] else "✅"
+                print(f"{marker} {stats['site']}: {stats['records']} records from "
+                      f"{stats['pages']} page(s) in {stats['duration']:.2f}s"
+                      + (f" ({stats['error']})" if stats["error"] else ""), file=sys.stderr)
+                results.append(stats)
+        self.adapter.close()
+        return results
+
+
+# ------------------------------------------------------------------
+# CONVEX LINK SELECTION
+# ------------------------------------------------------------------
+
+def load_convex_url() -> Optional[str]:
+    """Load CONVEX_URL from environment files or environment variables."""
+    for env_path in (Path(".env.local"), Path(".env")):
+        if env_path.exists() and DOTENV_AVAILABLE:
+            load_dotenv(env_path)
+    return os.getenv("VITE_CONVEX_URL") or os.getenv("CONVEX_URL")
+
+
+def jobs_from_convex(specs: List[SiteSpec],
+                     convex_url: str) -> List[Tuple[SiteSpec, Optional[str], Optional[Dict]]]:
+    """Pair approved procurement links with the spec that knows their layout.
+
+    Each job starts at the link's own URL; links sharing a URL are scraped once.
+    """
+    from convex_backend import create_client
+
+    client = create_client(convex_url)
+    links = client.query("procurementUrls:getApproved", {})
+    jobs = []
+    seen_urls = set()
+    unmatched = duplicates = 0
+    for link in links:
+        url = link.get("procurementLink") or ""
+        spec = next((s for s in specs if s.matches(url)), None)
+        if spec is None:
+            unmatched += 1
+            continue
+        if url in seen_urls:
+            duplicates += 1
+            continue
+        seen_urls.add(url)
+        jobs.append((spec, url, {"procurementUrlId": link.get("_id"), "state": link.get("state")}))
+    print(f"🔗 {len(jobs)} approved link(s) have a site spec, {unmatched} do not"
+          + (f", {duplicates} duplicate URL(s) skipped" if duplicates else ""), file=sys.stderr)
+    return jobs
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Scrape table-based procurement portals from declarative site specs'
+    )
+    parser.add_argument('--sites-dir', default=str(DEFAULT_SITES_DIR),
+                        help='Directory of *.json site specs')
+    parser.add_argument('--site', action='append', dest='sites',
+                        help='Only run the named site (repeatable)')
+    parser.add_argument('--spec', action='append', dest='spec_files',
+                        help='Run this spec file instead of the sites directory (repeatable)')
+    parser.add_argument('--workers', type=int, default=8,
+                        help='Number of sites scraped concurrently')
+    parser.add_argument('--max-pages', type=int,
+                        help="Override each spec's page limit")
+    parser.add_argument('--output', default='grid_opportunities.ndjson',
+                        help='NDJSON output file ("-" for stdout)')
+    parser.add_argument('--from-convex', action='store_true',
+                        help='Scrape the approved procurementUrls that match a spec')
+    args = parser.parse_args()
+
+    try:
+        specs = load_specs(Path(args.sites_dir), args.sites, args.spec_files)
+    except (OSError, ValueError) as e:
+        print(f"❌ Error loading site specs: {e}", file=sys.stderr)
+        return 1
+    if not specs:
+        print("⚠️  No site specs found.", file=sys.stderr)
+        return 1
+
+    if args.from_convex:
+        from convex_backend import offline_backend_enabled
+
+        convex_url = load_convex_url()
+        if not convex_url and not offline_backend_enabled():
+            print("❌ Error: CONVEX_URL not found.", file=sys.stderr)
+            return 1
+        try:
+            jobs = jobs_from_convex(specs, convex_url)
+        except ImportError as e:
+            print(f"❌ {e}", file=sys.stderr)
+            return 1
+    else:
+        jobs = [(spec, None, None) for spec in specs]
+
+    try:
+        engine = GridScraperEngine(workers=args.workers)
+    except ImportError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+
+    writer = RecordWriter(args.output)
+    start_time = time.time()
+    print(f"🚀 Scraping {len(jobs)} site(s) with {engine.workers} worker(s)...", file=sys.stderr)
+    results = engine.run(jobs, writer.write, args.max_pages)
+    duration = time.time() - start_time
+
+    manifest_path = writer.close({
+        "scrapeDate": datetime.now().isoformat(),
+        "totalRecords": writer.count,
+        "duration": duration,
+        "recordsFile": os.path.basename(args.output),
+        "format": "ndjson",
+        "sites": sorted(results, key=lambda r: r["site"]),
+    })
+
+    print(f"\nFound {writer.count} records in {duration:.2f} seconds", file=sys.stderr)
+    if manifest_path:
+        print(f"Results saved to: {args.output} (manifest: {manifest_path})", file=sys.stderr)
+    return 1 if any(r["error"] for r in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,9 +1,16 @@
 import os
+import argparse
+import hashlib
+import shutil
 import subprocess
+import tempfile
 import time
 import threading
 import json
+import struct
+import zlib
 import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -13,6 +20,10 @@ PROJECT_ROOT = SCRIPT_DIR.parent
 ENV_PATH = PROJECT_ROOT / '.env.local'
 TEMP_DIR = PROJECT_ROOT / "convex_migration_temp"
 ZIP_PATH = TEMP_DIR / "snapshot.zip"
+# Per-table counts and content hashes of the last snapshot imported locally
+IMPORT_MANIFEST_PATH = TEMP_DIR / "last_import_manifest.json"
+TABLE_EXTRACT_DIR = TEMP_DIR / "tables"
+DEFAULT_IMPORT_JOBS = 4
 
 load_dotenv(dotenv_path=ENV_PATH)
 
@@ -59,173 +70,818 @@ def init_local_convex():
     run_command(cmd, env_vars=local_env, capture=True)
     print("  [Auth] Local instance authenticated.")
 
-def inspect_export(zip_path):
-    """Inspect the export file to see what tables and data are included."""
+# Streaming inspection reads each zip entry in chunks of this size
+EXPORT_READ_CHUNK = 1 << 20
+# Below this much uncompressed table data a process pool costs more than it saves
+INSPECT_PARALLEL_MIN_BYTES = 64 << 20
+EXPORT_SAMPLE_IDS = 3
+
+
+def export_table_for_entry(entry_name):
+    """Map a snapshot zip entry to (component, table), or None if it isn't table data.
+
+    Convex snapshot exports store documents as:
+      - <table>/documents.jsonl                          (app tables)
+      - _components/<component>/<table>/documents.jsonl  (component tables)
+    Entries starting with "_" (_tables, _storage, ...) are system data and each
+    table folder also holds a generated_schema.jsonl, which is not documents.
+    Older flat exports with <table>.jsonl at the root are still recognised.
+    """
+    parts = entry_name.split('/')
+    if parts[-1] == 'documents.jsonl':
+        if len(parts) == 2 and not parts[0].startswith('_'):
+            return "main", parts[0]
+        if len(parts) == 4 and parts[0] == '_components' and not parts[2].startswith('_'):
+            return parts[1], parts[2]
+        return None
+    if len(parts) == 1 and entry_name.endswith('.jsonl') and not entry_name.startswith('_'):
+        return "main", entry_name[:-len('.jsonl')]
+    return None
+
+
+def export_table_full_name(component, table):
+    return table if component == "main" else f"{component}/{table}"
+
+
+class TableScanner:
+    """Incremental statistics over a table's JSONL bytes, fed in arbitrary chunks.
+
+    Counts documents and bytes, builds a field-presence histogram, keeps the
+    first few _id values and computes an order-independent content hash (the
+    sum of each document's blake2b digest over canonical JSON, so re-ordered
+    exports of the same data hash equal). Holds at most one chunk plus one line
+    in memory.
+    """
+
+    def __init__(self, sample_size=EXPORT_SAMPLE_IDS):
+        self.sample_size = sample_size
+        self.count = 0
+        self.data_bytes = 0
+        self.invalid = 0
+        self.fields = {}
+        self.sample_ids = []
+        self.content_sum = 0
+        self._carry = b""
+
+    def feed(self, chunk):
+        lines = (self._carry + chunk).split(b"\n")
+        self._carry = lines.pop()
+        for line in lines:
+            self._handle(line)
+
+    def _handle(self, line):
+        if not line.strip():
+            return
+        self.count += 1
+        self.data_bytes += len(line)
+        try:
+            doc = json.loads(line)
+        except ValueError:
+            doc = None
+        if not isinstance(doc, dict):
+            self.invalid += 1
+            canonical = line.strip()
+        else:
+            canonical = json.dumps(doc, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        digest = hashlib.blake2b(canonical, digest_size=16).digest()
+        self.content_sum = (self.content_sum + int.from_bytes(digest, "big")) % (1 << 128)
+        if not isinstance(doc, dict):
+            return
+        for key in doc:
+            self.fields[key] = self.fields.get(key, 0) + 1
+        if len(self.sample_ids) < self.sample_size and '_id' in doc:
+            self.sample_ids.append(doc['_id'])
+
+    def finish(self):
+        self._handle(self._carry)
+        self._carry = b""
+        return {
+            'count': self.count,
+            'bytes': self.data_bytes,
+            'fields': self.fields,
+            'sample_ids': self.sample_ids,
+            'invalid_lines': self.invalid,
+            'content_hash': f"{self.content_sum:032x}",
+        }
+
+
+def scan_export_entry(zip_path, entry_name, sample_size=EXPORT_SAMPLE_IDS):
+    """Stream one JSONL entry of the export through a TableScanner in a single pass.
+
+    Opens the zip itself so it can run in a worker process.
+    """
+    scanner = TableScanner(sample_size)
+    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+        info = zip_ref.getinfo(entry_name)
+        with zip_ref.open(info) as file:
+            while True:
+                chunk = file.read(EXPORT_READ_CHUNK)
+                if not chunk:
+                    break
+                scanner.feed(chunk)
+
+    return {'file': entry_name, 'compressed_bytes': info.compress_size, **scanner.finish()}
+
+
+def format_bytes(size):
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+def scan_export(zip_path, workers=None):
+    """Scan every table entry of an export zip once; returns table_info.
+
+    table_info maps full table names to their counts, sizes, field histograms,
+    sample ids and content hashes. Large exports are scanned with one worker
+    process per entry.
+    """
+    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+        infos = zip_ref.infolist()
+    print(f"  Found {len(infos)} files in export")
+
+    tables = {}
+    for info in infos:
+        table = export_table_for_entry(info.filename)
+        if table:
+            tables[info.filename] = (table, info.file_size)
+
+    total_bytes = sum(size for _, size in tables.values())
+    if workers is None:
+        workers = (os.cpu_count() or 1) if total_bytes >= INSPECT_PARALLEL_MIN_BYTES else 1
+    workers = max(1, min(workers, len(tables)))
+
+    # Biggest entries first so one large table doesn't finish last on its own
+    entries = sorted(tables, key=lambda name: -tables[name][1])
+    start = time.time()
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            scans = list(executor.map(scan_export_entry, [zip_path] * len(entries), entries))
+    else:
+        scans = [scan_export_entry(zip_path, entry) for entry in entries]
+    print(f"  Scanned {len(entries)} table file(s), {format_bytes(total_bytes)} uncompressed, "
+          f"in {time.time() - start:.2f}s ({workers} worker(s))")
+
+    table_info = {}
+    for scan in scans:
+        component, table_name = tables[scan['file']][0]
+        table_info[export_table_full_name(component, table_name)] = {
+            'component': component,
+            'name': table_name,
+            **scan,
+        }
+    return table_info
+
+
+def inspect_export(zip_path, workers=None):
+    """Inspect the export file to see what tables and data are included.
+
+    Every table entry is streamed once (see scan_export). Returns
+    (leads_files, table_info).
+    """
     print(f"\n--- Inspecting Export Contents ---")
     try:
-        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            # Get all file names
-            file_list = zip_ref.namelist()
-            
-            print(f"  Found {len(file_list)} files in export")
-            
-            # Convex exports typically have structure like:
-            # - component/table.jsonl (for component tables)
-            # - table.jsonl (for main app tables)
-            # - metadata files
-            
-            # Find all JSONL files (table data files)
-            jsonl_files = [f for f in file_list if f.endswith('.jsonl')]
-            
-            # Look for leads table specifically (case-insensitive)
-            leads_files = [f for f in file_list if 'leads' in f.lower() and f.endswith('.jsonl')]
-            
-            if leads_files:
-                print(f"  ✓ Found leads table file(s): {len(leads_files)}")
-                total_docs = 0
-                for f in leads_files:
-                    print(f"    - {f}")
-                    # Try to count lines in the file
-                    try:
-                        with zip_ref.open(f) as file:
-                            lines = file.readlines()
-                            # Count non-empty lines (each line is a JSON document)
-                            doc_count = sum(1 for line in lines if line.strip())
-                            total_docs += doc_count
-                            print(f"      Documents: {doc_count}")
-                            
-                            # Show first document as sample (if any)
-                            if doc_count > 0:
-                                file.seek(0)
-                                first_line = file.readline().decode('utf-8')
-                                try:
-                                    sample = json.loads(first_line)
-                                    print(f"      Sample ID: {sample.get('_id', 'N/A')}")
-                                except:
-                                    pass
-                    except Exception as e:
-                        print(f"      Could not read file: {e}")
-                
-                if total_docs == 0:
-                    print(f"  ⚠ WARNING: Leads file exists but contains 0 documents!")
-            else:
-                print(f"  ⚠ WARNING: No leads table file found in export!")
-            
-            # List all table files with document counts
-            print(f"\n  All tables in export:")
-            table_info = {}
-            for f in jsonl_files:
-                # Extract table name from path
-                parts = f.split('/')
-                if len(parts) > 1:
-                    table_name = parts[-1].replace('.jsonl', '')
-                    component = parts[0]
-                    full_name = f"{component}/{table_name}"
-                else:
-                    table_name = f.replace('.jsonl', '')
-                    full_name = table_name
-                    component = "main"
-                
-                # Count documents
-                try:
-                    with zip_ref.open(f) as file:
-                        doc_count = sum(1 for line in file if line.strip())
-                    table_info[full_name] = {
-                        'component': component,
-                        'name': table_name,
-                        'count': doc_count,
-                        'file': f
-                    }
-                except:
-                    table_info[full_name] = {
-                        'component': component,
-                        'name': table_name,
-                        'count': 'unknown',
-                        'file': f
-                    }
-            
-            # Sort by component, then by name
-            sorted_tables = sorted(table_info.items(), key=lambda x: (x[1]['component'], x[1]['name']))
-            for full_name, info in sorted_tables:
-                count_str = str(info['count'])
-                marker = "⚠" if info['count'] == 0 else "✓"
-                print(f"    {marker} {full_name}: {count_str} documents")
-            
-            return leads_files, set(table_info.keys())
+        table_info = scan_export(zip_path, workers)
+
+        # Look for leads table specifically (case-insensitive)
+        leads_tables = [name for name, info in table_info.items() if 'leads' in info['name'].lower()]
+        leads_files = [table_info[name]['file'] for name in leads_tables]
+        if leads_tables:
+            print(f"  ✓ Found leads table file(s): {len(leads_files)}")
+            total_docs = 0
+            for name in leads_tables:
+                info = table_info[name]
+                total_docs += info['count']
+                print(f"    - {info['file']}")
+                print(f"      Documents: {info['count']} ({format_bytes(info['bytes'])})")
+                if info['sample_ids']:
+                    print(f"      Sample IDs: {', '.join(map(str, info['sample_ids']))}")
+                # Fields missing from some documents usually explain import surprises
+                partial = {k: v for k, v in info['fields'].items() if v < info['count']}
+                if partial:
+                    print(f"      Fields not present on every document:")
+                    for field, present in sorted(partial.items(), key=lambda x: x[1]):
+                        print(f"        {field}: {present}/{info['count']} ({present / info['count']:.0%})")
+
+            if total_docs == 0:
+                print(f"  ⚠ WARNING: Leads file exists but contains 0 documents!")
+        else:
+            print(f"  ⚠ WARNING: No leads table file found in export!")
+
+        # List all table files with document counts
+        print(f"\n  All tables in export:")
+        sorted_tables = sorted(table_info.items(), key=lambda x: (x[1]['component'], x[1]['name']))
+        for full_name, info in sorted_tables:
+            marker = "⚠" if info['count'] == 0 else "✓"
+            line = f"    {marker} {full_name}: {info['count']} documents, {format_bytes(info['bytes'])}"
+            if info['invalid_lines']:
+                line += f" ({info['invalid_lines']} unparseable line(s))"
+            print(line)
+
+        return leads_files, table_info
     except Exception as e:
         print(f"  ❌ Error inspecting export: {e}")
         import traceback
         traceback.print_exc()
-        return [], set()
+        return [], {}
+
+def load_import_manifest():
+    """The manifest of the last successful import, or None if there isn't one."""
+    try:
+        with open(IMPORT_MANIFEST_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"  ⚠ Ignoring unreadable import manifest {IMPORT_MANIFEST_PATH}: {e}")
+        return None
+
+
+def save_import_manifest(tables):
+    """Atomically record what the local instance now holds, per table."""
+    manifest = {
+        'cloudUrl': CLOUD_URL,
+        'localUrl': LOCAL_URL,
+        'importedAt': time.time(),
+        'tables': tables,
+    }
+    fd, tmp_path = tempfile.mkstemp(dir=TEMP_DIR, prefix=".last_import_manifest.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, IMPORT_MANIFEST_PATH)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def manifest_entry(info):
+    return {'count': info['count'], 'contentHash': info['content_hash']}
+
+
+def changed_tables(table_info, manifest):
+    """Tables whose document count or content hash differs from the last import."""
+    previous = manifest.get('tables', {})
+    return sorted(
+        name for name, info in table_info.items()
+        if previous.get(name) != manifest_entry(info)
+    )
+
+
+def table_extract_path(full_name):
+    TABLE_EXTRACT_DIR.mkdir(parents=True, exist_ok=True)
+    return TABLE_EXTRACT_DIR / f"{full_name.replace('/', '__')}.jsonl"
+
+
+def import_table_file(jsonl_path, info, local_env):
+    """Replace one local table with the documents in jsonl_path (deleted afterwards)."""
+    try:
+        component_flag = "" if info['component'] == "main" else f" --component {info['component']}"
+        cmd = (
+            f'bun x convex import "{jsonl_path}" --table {info["name"]}{component_flag} '
+            f'--url {LOCAL_URL} --replace --yes --admin-key "{ADMIN_KEY}"'
+        )
+        start = time.time()
+        exit_code, output = run_command(cmd, env_vars=local_env, capture=True)
+        return exit_code, output, time.time() - start
+    finally:
+        if jsonl_path.exists():
+            jsonl_path.unlink()
+
+
+def import_table(full_name, info, local_env):
+    """Extract one table from the snapshot and replace it on the local instance."""
+    jsonl_path = table_extract_path(full_name)
+    with zipfile.ZipFile(ZIP_PATH, 'r') as zip_ref:
+        with zip_ref.open(info['file']) as src, open(jsonl_path, 'wb') as dst:
+            shutil.copyfileobj(src, dst, EXPORT_READ_CHUNK)
+    return import_table_file(jsonl_path, info, local_env)
+
+
+def report_table_import(name, info, future):
+    """Print the outcome of one table import future; returns True on success."""
+    try:
+        exit_code, output, seconds = future.result()
+    except Exception as e:
+        print(f"    ❌ {name}: {e}")
+        return False
+    if exit_code == 0:
+        print(f"    ✓ {name}: {info['count']} documents in {seconds:.1f}s")
+        return True
+    print(f"    ❌ {name}: import failed")
+    for line in output.strip().splitlines()[-5:]:
+        print(f"        {line}")
+    return False
+
+
+def import_changed_tables(names, table_info, local_env, jobs):
+    """Import tables in parallel (at most `jobs` at once); returns the names that succeeded."""
+    imported = []
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        futures = {executor.submit(import_table, name, table_info[name], local_env): name for name in names}
+        for future in as_completed(futures):
+            name = futures[future]
+            if report_table_import(name, table_info[name], future):
+                imported.append(name)
+    if TABLE_EXTRACT_DIR.exists() and not any(TABLE_EXTRACT_DIR.iterdir()):
+        os.rmdir(TABLE_EXTRACT_DIR)
+    return imported
+
+
+class GrowingFileReader:
+    """Sequential reads from a file another process is still writing.
+
+    Reads block (polling) until data arrives; EOF is only reported once the
+    writer has exited and everything it wrote has been consumed.
+    """
+
+    def __init__(self, path, writer_alive, poll_interval=0.05):
+        self.path = path
+        self.writer_alive = writer_alive
+        self.poll_interval = poll_interval
+        self.file = None
+        self.pushback = b""
+
+    def _read_file(self, size):
+        while True:
+            if self.file is None:
+                if os.path.exists(self.path):
+                    self.file = open(self.path, 'rb')
+                elif not self.writer_alive():
+                    return b""
+            if self.file is not None:
+                data = self.file.read(size)
+                if data:
+                    return data
+            alive = self.writer_alive()
+            if not alive:
+                # The writer may have flushed its last bytes just before exiting
+                return self.file.read(size) if self.file is not None else b""
+            time.sleep(self.poll_interval)
+
+    def read(self, size):
+        if self.pushback:
+            data, self.pushback = self.pushback[:size], self.pushback[size:]
+            return data
+        return self._read_file(size)
+
+    def read_exact(self, size):
+        parts = []
+        remaining = size
+        while remaining:
+            data = self.read(remaining)
+            if not data:
+                raise EOFError("export ended in the middle of a zip entry")
+            parts.append(data)
+            remaining -= len(data)
+        return b"".join(parts)
+
+    def unread(self, data):
+        self.pushback = data + self.pushback
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+
+
+ZIP_LOCAL_HEADER = struct.Struct("<4sHHHHHIIIHH")
+ZIP_DATA_DESCRIPTOR_SIG = b"PK\x07\x08"
+ZIP_LOCAL_HEADER_SIG = b"PK\x03\x04"
+# What may follow the last entry: central directory header, zip64 end record, end record
+ZIP_END_OF_ENTRIES_SIGS = (b"PK\x01\x02", b"PK\x06\x06", b"PK\x05\x06")
+
+
+def iter_growing_zip(reader):
+    """Yield (name, data_chunks) for each entry of a zip as it is being written.
+
+    Walks the local file headers in order instead of the central directory
+    (which only exists once the export is finished). Deflated entries are
+    inflated until the deflate stream ends, so entries written with a trailing
+    data descriptor (sizes unknown up front) work too; the descriptor is then
+    skipped and the CRC checked. Each data_chunks iterator must be consumed
+    before advancing to the next entry. Anything other than another entry or
+    the central directory raises ValueError rather than ending early.
+    """
+    while True:
+        signature = reader.read_exact(4)
+        if signature in ZIP_END_OF_ENTRIES_SIGS:
+            return
+        if signature != ZIP_LOCAL_HEADER_SIG:
+            raise ValueError(f"unexpected zip record signature {signature!r} after the previous entry")
+        (_, _, flags, method, _, _, crc, compressed_size, size,
+         name_length, extra_length) = ZIP_LOCAL_HEADER.unpack(signature + reader.read_exact(26))
+        raw_name = reader.read_exact(name_length)
+        name = raw_name.decode('utf-8' if flags & 0x800 else 'cp437')
+        extra = reader.read_exact(extra_length)
+
+        zip64 = False
+        position = 0
+        while position + 4 <= len(extra):
+            header_id, data_size = struct.unpack_from("<HH", extra, position)
+            if header_id == 0x0001:
+                zip64 = True
+                values = list(struct.unpack_from(f"<{data_size // 8}Q", extra, position + 4))
+                if size == 0xFFFFFFFF and values:
+                    size = values.pop(0)
+                if compressed_size == 0xFFFFFFFF and values:
+                    compressed_size = values.pop(0)
+            position += 4 + data_size
+
+        has_descriptor = bool(flags & 0x08)
+        if flags & 0x01:
+            raise ValueError(f"{name}: encrypted zip entries are not supported")
+        if method not in (0, 8):
+            raise ValueError(f"{name}: unsupported compression method {method}")
+        if method == 0 and has_descriptor:
+            raise ValueError(f"{name}: stored entry without sizes can't be streamed")
+
+        def chunks():
+            nonlocal crc
+            actual_crc = 0
+            if method == 0:
+                remaining = compressed_size
+                while remaining:
+                    data = reader.read(min(remaining, EXPORT_READ_CHUNK))
+                    if not data:
+                        raise EOFError("export ended in the middle of a zip entry")
+                    remaining -= len(data)
+                    actual_crc = zlib.crc32(data, actual_crc)
+                    yield data
+            else:
+                inflater = zlib.decompressobj(-zlib.MAX_WBITS)
+                while not inflater.eof:
+                    data = reader.read(EXPORT_READ_CHUNK)
+                    if not data:
+                        raise EOFError("export ended in the middle of a zip entry")
+                    out = inflater.decompress(data)
+                    if out:
+                        actual_crc = zlib.crc32(out, actual_crc)
+                        yield out
+                reader.unread(inflater.unused_data)
 
-def migrate():
+            if has_descriptor:
+                head = reader.read_exact(4)
+                if head == ZIP_DATA_DESCRIPTOR_SIG:
+                    head = reader.read_exact(4)
+                crc = struct.unpack("<I", head)[0]
+                reader.read_exact(16 if zip64 else 8)
+                if not zip64:
+                    # Some writers use 8-byte descriptor sizes without a local zip64
+                    # extra field; then the next record's signature isn't here yet
+                    following = reader.read_exact(4)
+                    if following != ZIP_LOCAL_HEADER_SIG and following not in ZIP_END_OF_ENTRIES_SIGS:
+                        following = reader.read_exact(8)[4:]
+                    reader.unread(following)
+            if actual_crc != crc:
+                raise ValueError(f"{name}: CRC mismatch while streaming the export")
+
+        yield name, chunks()
+
+
+def scan_unhandled_tables(zip_path, handled):
+    """table_info for table entries in a finished export zip that are not in handled.
+
+    Checks the streamed tables against the zip's central directory so nothing
+    is dropped if the tail stopped early; only the missing entries are scanned.
+    """
+    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+        names = zip_ref.namelist()
+    table_info = {}
+    for entry_name in names:
+        table = export_table_for_entry(entry_name)
+        if table is None:
+            continue
+        component, table_name = table
+        full_name = export_table_full_name(component, table_name)
+        if full_name in handled:
+            continue
+        table_info[full_name] = {'component': component, 'name': table_name,
+                                 **scan_export_entry(zip_path, entry_name)}
+    return table_info
+
+
+def pipelined_export_import(local_env, manifest, jobs, auth_thread):
+    """Export the cloud snapshot and import each table as soon as it is written.
+
+    The export zip is tailed while `convex export` is still downloading it; every
+    finished table entry is scanned (counts and checksum) on the way to a JSONL
+    file and, if it changed since the manifest (or there is no manifest), handed
+    to a bounded pool of `convex import --table` jobs. Returns
+    (export_ok, table_info, imported, attempted).
+    """
+    if ZIP_PATH.exists():
+        os.remove(ZIP_PATH)
+
+    export_cmd = f'bun x convex export --url {CLOUD_URL} --path "{ZIP_PATH}"'
+    process = subprocess.Popen(
+        export_cmd, shell=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+        text=True, env=os.environ.copy(), cwd=PROJECT_ROOT
+    )
+    export_output = []
+
+    def drain_export_output():
+        for line in process.stdout:
+            print(f"  {line}", end="")
+            export_output.append(line)
+
+    output_thread = threading.Thread(target=drain_export_output, daemon=True)
+    output_thread.start()
+
+    previous = manifest.get('tables', {}) if manifest else None
+    table_info = {}
+    futures = {}
+    imported = []
+    start = time.time()
+
+    def import_when_ready(jsonl_path, info):
+        # The local instance must be authenticated before the first import runs
+        auth_thread.join()
+        return import_table_file(jsonl_path, info, local_env)
+
+    def import_from_zip_when_ready(full_name, info):
+        auth_thread.join()
+        return import_table(full_name, info, local_env)
+
+    reader = GrowingFileReader(ZIP_PATH, lambda: process.poll() is None)
+    streamed = True
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        try:
+            for entry_name, chunks in iter_growing_zip(reader):
+                table = export_table_for_entry(entry_name)
+                if table is None:
+                    for _ in chunks:
+                        pass
+                    continue
+
+                component, table_name = table
+                full_name = export_table_full_name(component, table_name)
+                jsonl_path = table_extract_path(full_name)
+                scanner = TableScanner()
+                try:
+                    with open(jsonl_path, 'wb') as out:
+                        for chunk in chunks:
+                            out.write(chunk)
+                            scanner.feed(chunk)
+                except BaseException:
+                    jsonl_path.unlink()
+                    raise
+                info = {'component': component, 'name': table_name, 'file': entry_name, **scanner.finish()}
+                table_info[full_name] = info
+
+                # With no baseline, empty tables are imported too so --replace clears stale local rows
+                if previous is not None and previous.get(full_name) == manifest_entry(info):
+                    jsonl_path.unlink()
+                    continue
+                print(f"  → {full_name}: exported after {time.time() - start:.1f}s, importing")
+                futures[executor.submit(import_when_ready, jsonl_path, info)] = full_name
+        except (EOFError, ValueError, OSError) as e:
+            streamed = False
+            print(f"  ⚠ Could not stream the export ({e}); finishing the remaining tables from the complete zip.")
+        finally:
+            reader.close()
+
+        exit_code = process.wait()
+        output_thread.join()
+        if exit_code != 0 or not ZIP_PATH.exists():
+            print("❌ Export failed.")
+            print(f"  Output: {''.join(export_output)}")
+            for future in futures:
+                future.cancel()
+            return False, table_info, imported, list(futures.values())
+
+        # Pick up whatever the tail didn't get to, from the finished zip
+        missing = scan_unhandled_tables(ZIP_PATH, set(table_info))
+        if missing and streamed:
+            print(f"  ⚠ {len(missing)} table(s) were not streamed; importing them from the complete zip.")
+        for full_name, info in missing.items():
+            table_info[full_name] = info
+            if previous is not None and previous.get(full_name) == manifest_entry(info):
+                continue
+            futures[executor.submit(import_from_zip_when_ready, full_name, info)] = full_name
+
+        print(f"  Export finished in {time.time() - start:.1f}s; waiting for {sum(not f.done() for f in futures)} import(s)")
+        for future in as_completed(futures):
+            name = futures[future]
+            if report_table_import(name, table_info[name], future):
+                imported.append(name)
+
+    if TABLE_EXTRACT_DIR.exists() and not any(TABLE_EXTRACT_DIR.iterdir()):
+        os.rmdir(TABLE_EXTRACT_DIR)
+    print(f"  Exported and imported {len(imported)}/{len(futures)} changed table(s) in {time.time() - start:.1f}s")
+    return True, table_info, imported, list(futures.values())
+
+
+def compare_table_scans(source_info, local_info):
+    """Per-table differences between the source snapshot and the local export.
+
+    Returns a list of (table, source_count, local_count, problem) rows for every
+    table that doesn't match; an empty list means the import verified.
+    """
+    problems = []
+    for name in sorted(source_info):
+        source = source_info[name]
+        local = local_info.get(name)
+        if local is None:
+            # Empty tables aren't always present in an export
+            if source['count']:
+                problems.append((name, source['count'], None, "missing locally"))
+        elif local['count'] != source['count']:
+            problems.append((name, source['count'], local['count'], "document count differs"))
+        elif local['content_hash'] != source['content_hash']:
+            problems.append((name, source['count'], local['count'], "content checksum differs"))
+    return problems
+
+
+def verify_local_import(source_info, workers=None):
+    """Export the local instance and check it holds exactly the source snapshot.
+
+    Counts and order-independent content checksums are compared per table; the
+    local export is streamed and hashed in parallel per table just like the
+    source. Prints a report and returns the names of the tables that don't
+    match (empty when verified), or None if the local export failed.
+    """
+    print(f"\n--- Phase 3: Verifying Local Instance ---")
+    local_zip = TEMP_DIR / "local_verify.zip"
+    local_env = {
+        "CONVEX_DEPLOY_KEY": ADMIN_KEY,
+        "CONVEX_SELF_HOSTED_URL": LOCAL_URL,
+        "CONVEX_URL": LOCAL_URL
+    }
+    if local_zip.exists():
+        os.remove(local_zip)
+    export_cmd = f'bun x convex export --url {LOCAL_URL} --admin-key "{ADMIN_KEY}" --path "{local_zip}"'
+    exit_code, output = run_command(export_cmd, env_vars=local_env, capture=True)
+    if exit_code != 0 or not local_zip.exists():
+        print("  ❌ Could not export the local instance for verification.")
+        print(f"  Output: {output}")
+        return None
+
+    try:
+        local_info = scan_export(local_zip, workers)
+    finally:
+        os.remove(local_zip)
+
+    problems = compare_table_scans(source_info, local_info)
+    extra = sorted(name for name, info in local_info.items() if name not in source_info and info['count'])
+    verified_docs = sum(info['count'] for info in source_info.values())
+
+    if extra:
+        print(f"  ⚠ Local-only tables (not in the cloud export): {', '.join(extra)}")
+    if not problems:
+        print(f"  ✓ {len(source_info)} table(s), {verified_docs} document(s): counts and checksums match")
+        return []
+
+    print(f"  ❌ {len(problems)} table(s) do not match the cloud snapshot:")
+    print(f"    {'Table':<40} {'Cloud':>10} {'Local':>10}  Problem")
+    for name, source_count, local_count, problem in problems:
+        local_str = "-" if local_count is None else str(local_count)
+        print(f"    {name:<40} {source_count:>10} {local_str:>10}  {problem}")
+    return [name for name, _, _, _ in problems]
+
+
+def warn_missing_leads(table_info):
+    print(f"\n⚠ WARNING: No leads table data found in export!")
+    print(f"  This could mean:")
+    print(f"    1. The leads table is empty in the cloud deployment")
+    print(f"    2. The leads table is in a different component not included in export")
+    print(f"    3. There's an issue with the export process")
+    print(f"\n  Available tables: {', '.join(sorted(table_info))}")
+
+
+def load_baseline_manifest():
+    """The last import manifest if it can drive an incremental run, else None."""
+    manifest = load_import_manifest()
+    if manifest and manifest.get('localUrl') != LOCAL_URL:
+        print(f"  Last import went to {manifest.get('localUrl')}, not {LOCAL_URL}; importing every table.")
+        return None
+    if not manifest:
+        print(f"  No previous import manifest at {IMPORT_MANIFEST_PATH}; importing every table.")
+    return manifest
+
+
+def migrate(incremental=False, jobs=DEFAULT_IMPORT_JOBS, assume_yes=False, verify=True, pipelined=False):
     if not all([CLOUD_URL, LOCAL_URL, ADMIN_KEY]):
         print(f"❌ Error: Missing env vars.")
-        return
+        return 1
 
     if not TEMP_DIR.exists():
         TEMP_DIR.mkdir(parents=True, exist_ok=True)
 
-    print(f"🚀 Starting migration...")
+    mode = " ".join(m for m, on in (("incremental", incremental), ("pipelined", pipelined)) if on)
+    print(f"🚀 Starting {mode + ' ' if mode else ''}migration...")
 
     # Start Phase 2 Auth in a background thread while Phase 1 Downloads
     auth_thread = threading.Thread(target=init_local_convex)
     auth_thread.start()
 
-    # --- Phase 1: Export ---
-    print(f"\n--- Phase 1: Exporting Cloud Snapshot ---")
-    print(f"  Exporting from: {CLOUD_URL}")
-    export_cmd = f'bun x convex export --url {CLOUD_URL} --path "{ZIP_PATH}"'
-    exit_code, output = run_command(export_cmd)
-    
-    if exit_code != 0:
-        print("❌ Export failed.")
-        print(f"  Output: {output}")
-        return
-    
-    if not ZIP_PATH.exists():
-        print(f"❌ Export file not found at {ZIP_PATH}")
-        return
-    
-    # Inspect the export to verify contents
-    leads_files, table_names = inspect_export(ZIP_PATH)
-    
-    if not leads_files:
-        print(f"\n⚠ WARNING: No leads table data found in export!")
-        print(f"  This could mean:")
-        print(f"    1. The leads table is empty in the cloud deployment")
-        print(f"    2. The leads table is in a different component not included in export")
-        print(f"    3. There's an issue with the export process")
-        print(f"\n  Available tables: {', '.join(sorted(table_names))}")
-        
-        response = input("\n  Continue with import anyway? (y/n): ").strip().lower()
-        if response != 'y':
-            print("  Migration cancelled by user.")
-            return
-
-    # Wait for the background auth to finish if it hasn't already
-    auth_thread.join()
-
-    # --- Phase 2: Import ---
-    print(f"\n--- Phase 2: Importing to Local Instance ---")
     local_env = {
         "CONVEX_DEPLOY_KEY": ADMIN_KEY,
         "CONVEX_SELF_HOSTED_URL": LOCAL_URL, # Some CLI versions prefer this
         "CONVEX_URL": LOCAL_URL
     }
-    
-    # We add --admin-key explicitly to the command to bypass cloud checks
-    import_cmd = f'bun x convex import "{ZIP_PATH}" --url {LOCAL_URL} --replace --admin-key "{ADMIN_KEY}"'
-    
-    exit_code, _ = run_command(import_cmd, env_vars=local_env)
-    
-    if exit_code != 0:
+
+    if pipelined:
+        # --- Phases 1+2: Export and import overlap, table by table ---
+        print(f"\n--- Phase 1+2: Exporting Cloud Snapshot and Importing Tables as They Arrive ---")
+        print(f"  Exporting from: {CLOUD_URL}")
+        manifest = load_baseline_manifest() if incremental else None
+        export_ok, table_info, imported, attempted = pipelined_export_import(local_env, manifest, jobs, auth_thread)
+        auth_thread.join()
+        if not export_ok:
+            return 1
+        if not any('leads' in info['name'].lower() for info in table_info.values()):
+            warn_missing_leads(table_info)
+
+        # Failed tables keep their old manifest entry so the next run retries them
+        previous = manifest.get('tables', {}) if manifest else {}
+        tables = {}
+        for name, info in table_info.items():
+            if name in attempted and name not in imported:
+                if name in previous:
+                    tables[name] = previous[name]
+            else:
+                tables[name] = manifest_entry(info)
+        save_import_manifest(tables)
+        succeeded = len(imported) == len(attempted)
+    else:
+        # --- Phase 1: Export ---
+        print(f"\n--- Phase 1: Exporting Cloud Snapshot ---")
+        print(f"  Exporting from: {CLOUD_URL}")
+        export_cmd = f'bun x convex export --url {CLOUD_URL} --path "{ZIP_PATH}"'
+        exit_code, output = run_command(export_cmd)
+        
+        if exit_code != 0:
+            print("❌ Export failed.")
+            print(f"  Output: {output}")
+            return 1
+        
+        if not ZIP_PATH.exists():
+            print(f"❌ Export file not found at {ZIP_PATH}")
+            return 1
+        
+        # Inspect the export to verify contents
+        leads_files, table_info = inspect_export(ZIP_PATH)
+        
+        if not leads_files:
+            warn_missing_leads(table_info)
+            if not assume_yes:
+                response = input("\n  Continue with import anyway? (y/n): ").strip().lower()
+                if response != 'y':
+                    print("  Migration cancelled by user.")
+                    return 1
+
+        # Wait for the background auth to finish if it hasn't already
+        auth_thread.join()
+
+        # --- Phase 2: Import ---
+        print(f"\n--- Phase 2: Importing to Local Instance ---")
+        manifest = load_baseline_manifest() if incremental else None
+
+        succeeded = True
+        if manifest:
+            changed = changed_tables(table_info, manifest)
+            removed = sorted(set(manifest.get('tables', {})) - set(table_info))
+            if removed:
+                print(f"  ⚠ Tables no longer in the cloud export (left untouched locally): {', '.join(removed)}")
+            print(f"  {len(changed)} of {len(table_info)} table(s) changed since the last import")
+            if changed:
+                print(f"  Importing with up to {jobs} concurrent job(s):")
+                start = time.time()
+                imported = import_changed_tables(changed, table_info, local_env, jobs)
+                print(f"  Imported {len(imported)}/{len(changed)} table(s) in {time.time() - start:.1f}s")
+                # Failed tables keep their old manifest entry so the next run retries them
+                tables = {name: entry for name, entry in manifest.get('tables', {}).items() if name in table_info}
+                tables.update({name: manifest_entry(table_info[name]) for name in imported})
+                save_import_manifest(tables)
+                succeeded = len(imported) == len(changed)
+        else:
+            # We add --admin-key explicitly to the command to bypass cloud checks
+            import_cmd = f'bun x convex import "{ZIP_PATH}" --url {LOCAL_URL} --replace --admin-key "{ADMIN_KEY}"'
+
+            exit_code, _ = run_command(import_cmd, env_vars=local_env)
+            succeeded = exit_code == 0
+            if succeeded:
+                save_import_manifest({name: manifest_entry(info) for name, info in table_info.items()})
+
+    mismatched = verify_local_import(table_info) if succeeded and verify else []
+    if mismatched:
+        # Forget what we thought we imported so the next incremental run redoes these tables
+        manifest = load_import_manifest()
+        if manifest:
+            save_import_manifest({name: entry for name, entry in manifest.get('tables', {}).items()
+                                  if name not in mismatched})
+
+    if not succeeded:
         print("❌ Import failed.")
+    elif mismatched is None or mismatched:
+        succeeded = False
+        print("\n❌ Migration finished but the local data could not be verified against the cloud snapshot.")
     else:
         print("\n✅ Migration completed successfully!")
 
     # Cleanup (optional - keep for debugging)
-    cleanup = input("\n  Delete export file? (y/n, default=n): ").strip().lower()
+    cleanup = 'n' if assume_yes else input("\n  Delete export file? (y/n, default=n): ").strip().lower()
     if cleanup == 'y':
         if ZIP_PATH.exists():
             os.remove(ZIP_PATH)
@@ -236,6 +892,38 @@ def migrate():
     else:
         print(f"  Export file kept at: {ZIP_PATH}")
         print(f"  You can inspect it manually or delete it later.")
+    return 0 if succeeded else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Copy the Convex cloud deployment into the local self-hosted instance")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only import tables whose count or content hash changed since the last import")
+    parser.add_argument("--pipelined", action="store_true",
+                        help="Import each table while the export is still downloading (combine with --incremental)")
+    parser.add_argument("--jobs", type=int, default=DEFAULT_IMPORT_JOBS,
+                        help=f"Concurrent table imports in incremental/pipelined mode (default: {DEFAULT_IMPORT_JOBS})")
+    parser.add_argument("--yes", action="store_true",
+                        help="Don't prompt: continue without leads data and keep the export file")
+    parser.add_argument("--skip-verify", action="store_true",
+                        help="Don't export the local instance afterwards to compare counts and checksums")
+    parser.add_argument("--verify-only", action="store_true",
+                        help=f"Only compare the local instance against the existing {ZIP_PATH.name}")
+    args = parser.parse_args()
+
+    if args.verify_only:
+        if not all([LOCAL_URL, ADMIN_KEY]):
+            print(f"❌ Error: Missing env vars.")
+            return 1
+        if not ZIP_PATH.exists():
+            print(f"❌ Export file not found at {ZIP_PATH}")
+            return 1
+        print(f"\n--- Scanning Cloud Snapshot ---")
+        return 0 if verify_local_import(scan_export(ZIP_PATH)) == [] else 1
+
+    return migrate(incremental=args.incremental, jobs=args.jobs, assume_yes=args.yes,
+                   verify=not args.skip_verify, pipelined=args.pipelined)
+
 
 if __name__ == "__main__":
-    migrate()
\ No newline at end of file
+    raise SystemExit(main())
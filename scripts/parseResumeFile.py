@@ -7,9 +7,47 @@ This script is designed to be called from Node.js/Convex to avoid PII bleeding t
 Usage:
     python scripts/parseResumeFile.py <file_path>
     
-Or with base64 input:
+Or with base64 input (pass "-" to read the base64 data from stdin instead of argv):
     python scripts/parseResumeFile.py --base64 <base64_data> --filename <filename>
 
+Or as a long-running worker that keeps the parser libraries loaded:
+    python scripts/parseResumeFile.py --serve [--socket <path>]
+
+    Requests are NDJSON, one per line, read from stdin (or from each connection
+    to the Unix socket):
+        {"id": 1, "path": "/abs/path/resume.pdf"}
+        {"id": 2, "filename": "resume.docx", "base64": "<data>"}
+    Each request gets exactly one NDJSON response line:
+        {"id": 1, "ok": true, "result": {...}}
+        {"id": 2, "ok": false, "error": "..."}
+
+Or to parse a whole archive in parallel (one NDJSON line per file, in completion order):
+    python scripts/parseResumeFile.py --batch <directory|glob> [--workers N]
+
+    Each line is {"path": ..., "ok": true, "result": {...}} or
+    {"path": ..., "ok": false, "error": "..."}; a failing file never stops the batch.
+
+PDF text comes from pypdfium2 when installed, otherwise PyPDF2 (pdfminer.six can be
+selected explicitly); large PDFs are extracted in parallel page ranges.
+    RESUME_PDF_BACKEND=auto|pdfium|pdfminer|pypdf2   (or --pdf-backend <name>)
+    RESUME_PDF_MAX_PAGES=<n>    stop after n pages (or --pdf-max-pages <n>; 0 = all)
+
+Parsed results are cached in a local SQLite database keyed by the SHA-256 of the
+file bytes and the parser version, so unchanged files are not re-extracted.
+Entries from older parser code are ignored and purged automatically.
+    RESUME_PARSE_CACHE=<path>   cache location (default: ~/.cache/cobecdev/resume_parse_cache.sqlite3)
+    RESUME_PARSE_CACHE=off      disable caching (same as passing --no-cache)
+
+Output options (apply to every mode; serve requests can override them with
+"text": "full"|"omit"|"zlib" and "stats": true|false):
+    --compact          single-line JSON instead of indented output
+    --omit-text        leave out originalText (RESUME_OUTPUT_TEXT=omit)
+    --compress-text    replace originalText with originalTextZlib, the base64 of the
+                       zlib-compressed UTF-8 text (RESUME_OUTPUT_TEXT=zlib)
+    --stats            per-stage timings (ms) and byte counts; printed to stderr, or
+                       added as "stats" beside "result" in serve/batch records
+                       (RESUME_PARSE_STATS=1)
+
 Output: JSON object matching the Resume interface structure
 """
 
@@ -18,38 +56,231 @@ import json
 import re
 import sys
 import base64
-import tempfile
+import bisect
+import glob
+import hashlib
+import io
+import time
+import zlib
+import contextlib
+import socketserver
+import sqlite3
+import zipfile
+import xml.etree.ElementTree as ET
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from pathlib import Path
 
-# Required dependencies:
-# pip install python-docx PyPDF2
+# Required dependencies (DOCX files are read directly from their XML parts):
+# pip install PyPDF2
 try:
-    from docx import Document
     import PyPDF2
 except ImportError:
-    print("ERROR: Required packages not installed. Run: pip install python-docx PyPDF2", file=sys.stderr)
+    print("ERROR: Required packages not installed. Run: pip install PyPDF2", file=sys.stderr)
     sys.exit(1)
 
+# Optional PDF engines (pypdfium2 is preferred over PyPDF2 when installed):
+# pip install pypdfium2 pdfminer.six
+try:
+    import pypdfium2 as pdfium
+    PDFIUM_AVAILABLE = True
+except ImportError:
+    PDFIUM_AVAILABLE = False
+
+try:
+    from pdfminer.high_level import extract_text as pdfminer_extract_text
+    from pdfminer.pdfpage import PDFPage
+    PDFMINER_AVAILABLE = True
+except ImportError:
+    PDFMINER_AVAILABLE = False
+
+# Preference order for RESUME_PDF_BACKEND=auto. pdfminer.six measured slower than
+# PyPDF2 on resumes (see compare_pdf_backends.py), so it is only used on request.
+PDF_BACKENDS = ("pdfium", "pypdf2", "pdfminer")
+
+# Documents with at least this many pages are split across worker processes
+PDF_PARALLEL_MIN_PAGES = int(os.environ.get("RESUME_PDF_PARALLEL_MIN_PAGES", "12"))
+
+_pdf_parallel_enabled = True
+_pdf_executor = None
+
+
+def pdf_backend_available(backend: str) -> bool:
+    return {"pdfium": PDFIUM_AVAILABLE, "pdfminer": PDFMINER_AVAILABLE, "pypdf2": True}.get(backend, False)
+
+
+def select_pdf_backend() -> str:
+    """Backend from RESUME_PDF_BACKEND, or the fastest installed one for "auto"."""
+    requested = os.environ.get("RESUME_PDF_BACKEND", "auto").lower()
+    if requested != "auto":
+        if not pdf_backend_available(requested):
+            raise ValueError(f"PDF backend not available: {requested}")
+        return requested
+    return next(backend for backend in PDF_BACKENDS if pdf_backend_available(backend))
+
+
+def pdf_page_budget() -> int:
+    """Maximum number of pages to read per PDF (RESUME_PDF_MAX_PAGES, 0 = all)."""
+    return int(os.environ.get("RESUME_PDF_MAX_PAGES", "0"))
+
+
+def pdf_page_count(backend: str, data: bytes) -> int:
+    if backend == "pdfium":
+        pdf = pdfium.PdfDocument(data)
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+    if backend == "pdfminer":
+        return sum(1 for _ in PDFPage.get_pages(io.BytesIO(data)))
+    return len(PyPDF2.PdfReader(io.BytesIO(data)).pages)
+
+
+def extract_pdf_page_range(backend: str, data: bytes, start: int, stop: int) -> list[str]:
+    """Extract the text of pages [start, stop); also the worker for parallel extraction."""
+    if backend == "pdfium":
+        pdf = pdfium.PdfDocument(data)
+        try:
+            pages = []
+            for page_number in range(start, stop):
+                page = pdf[page_number]
+                textpage = page.get_textpage()
+                pages.append(textpage.get_text_range().replace("\r\n", "\n"))
+                textpage.close()
+                page.close()
+            return pages
+        finally:
+            pdf.close()
+    if backend == "pdfminer":
+        return [pdfminer_extract_text(io.BytesIO(data), page_numbers=range(start, stop))]
+    reader = PyPDF2.PdfReader(io.BytesIO(data))
+    return [reader.pages[page_number].extract_text() or "" for page_number in range(start, stop)]
+
+
+def _get_pdf_executor() -> ProcessPoolExecutor:
+    global _pdf_executor
+    if _pdf_executor is None:
+        _pdf_executor = ProcessPoolExecutor(max_workers=min(os.cpu_count() or 1, 4))
+    return _pdf_executor
+
+
+def extract_pdf_text(data: bytes) -> str:
+    """Extract PDF text with the selected backend, honoring the page budget.
+
+    Large documents are split into page ranges extracted in parallel processes;
+    page texts are joined once at the end.
+    """
+    backend = select_pdf_backend()
+    page_count = pdf_page_count(backend, data)
+    budget = pdf_page_budget()
+    if budget > 0:
+        page_count = min(page_count, budget)
+
+    workers = min(os.cpu_count() or 1, 4)
+    if not _pdf_parallel_enabled or workers < 2 or page_count < PDF_PARALLEL_MIN_PAGES:
+        return "".join(extract_pdf_page_range(backend, data, 0, page_count))
+
+    chunk = -(-page_count // workers)
+    ranges = [(start, min(start + chunk, page_count)) for start in range(0, page_count, chunk)]
+    executor = _get_pdf_executor()
+    futures = [executor.submit(extract_pdf_page_range, backend, data, start, stop) for start, stop in ranges]
+    return "".join(text for future in futures for text in future.result())
+
 
 def extract_text_from_pdf(file_path: str) -> str:
     """Extract text content from a PDF file."""
     text = ""
     try:
         with open(file_path, "rb") as f:
-            reader = PyPDF2.PdfReader(f)
-            for page in reader.pages:
-                text += page.extract_text() or ""
+            text = extract_pdf_text(f.read())
     except Exception as e:
         print(f"Error reading PDF {file_path}: {e}", file=sys.stderr)
     return text
 
 
+WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+MC_NS = "{http://schemas.openxmlformats.org/markup-compatibility/2006}"
+_W_P, _W_R, _W_T = WORD_NS + "p", WORD_NS + "r", WORD_NS + "t"
+_W_TAB, _W_PTAB, _W_BR, _W_CR = WORD_NS + "tab", WORD_NS + "ptab", WORD_NS + "br", WORD_NS + "cr"
+_W_NO_BREAK_HYPHEN, _W_BR_TYPE = WORD_NS + "noBreakHyphen", WORD_NS + "type"
+_MC_FALLBACK = MC_NS + "Fallback"
+_DOCX_HEADER_PART = re.compile(r"^word/header(\d*)\.xml$")
+
+
+def iter_docx_part_paragraphs(stream):
+    """Yield the text of every paragraph in a WordprocessingML part, in document order.
+
+    Covers body paragraphs, table cells and text boxes (nested paragraphs are
+    yielded before the paragraph that anchors them). Alternate-content fallbacks
+    are skipped so text boxes are not read twice.
+    """
+    paragraphs = []  # open paragraph buffers; text boxes nest inside runs
+    run_depth = 0
+    fallback_depth = 0
+    for event, elem in ET.iterparse(stream, events=("start", "end")):
+        tag = elem.tag
+        if event == "start":
+            if tag == _MC_FALLBACK:
+                fallback_depth += 1
+            elif fallback_depth:
+                pass
+            elif tag == _W_P:
+                paragraphs.append([])
+            elif tag == _W_R:
+                run_depth += 1
+            continue
+
+        if tag == _MC_FALLBACK:
+            fallback_depth -= 1
+        elif fallback_depth or not paragraphs:
+            pass
+        elif tag == _W_P:
+            yield "".join(paragraphs.pop())
+            elem.clear()
+        elif tag == _W_R:
+            run_depth -= 1
+        elif run_depth:
+            # Tab stops in paragraph properties are also <w:tab>; only runs hold text
+            if tag == _W_T:
+                paragraphs[-1].append(elem.text or "")
+            elif tag in (_W_TAB, _W_PTAB):
+                paragraphs[-1].append("\t")
+            elif tag == _W_CR or (tag == _W_BR and elem.get(_W_BR_TYPE, "textWrapping") == "textWrapping"):
+                paragraphs[-1].append("\n")
+            elif tag == _W_NO_BREAK_HYPHEN:
+                paragraphs[-1].append("-")
+
+
+def extract_docx_text(source) -> str:
+    """Extract DOCX text from a path or binary file object without a temp file.
+
+    The body (including tables and text boxes) comes first so name detection
+    still reads the document's opening lines; page headers follow,
+    de-duplicated across first/even/default variants, so contact details
+    kept there are still found.
+    """
+    with zipfile.ZipFile(source) as docx_zip:
+        with docx_zip.open("word/document.xml") as stream:
+            lines = list(iter_docx_part_paragraphs(stream))
+
+        header_parts = sorted(
+            (name for name in docx_zip.namelist() if _DOCX_HEADER_PART.match(name)),
+            key=lambda name: int(_DOCX_HEADER_PART.match(name).group(1) or 0),
+        )
+        seen_headers = set()
+        for part in header_parts:
+            with docx_zip.open(part) as stream:
+                header_lines = tuple(line for line in iter_docx_part_paragraphs(stream) if line.strip())
+            if header_lines and header_lines not in seen_headers:
+                seen_headers.add(header_lines)
+                lines.extend(header_lines)
+    return "\n".join(lines)
+
+
 def extract_text_from_docx(file_path: str) -> str:
     """Extract text content from a DOCX file."""
     text = ""
     try:
-        doc = Document(file_path)
-        text = "\n".join(para.text for para in doc.paragraphs)
+        text = extract_docx_text(file_path)
     except Exception as e:
         print(f"Error reading DOCX {file_path}: {e}", file=sys.stderr)
     return text
@@ -60,50 +291,63 @@ def extract_text_from_buffer(buffer: bytes, filename: str) -> str:
     ext = Path(filename).suffix.lower()
     
     if ext == ".pdf":
-        # For PDF, we need to write to temp file or use BytesIO
-        import io
         try:
-            reader = PyPDF2.PdfReader(io.BytesIO(buffer))
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text() or ""
-            return text
+            return extract_pdf_text(buffer)
         except Exception as e:
             print(f"Error reading PDF from buffer: {e}", file=sys.stderr)
             return ""
     elif ext in [".docx", ".doc"]:
-        # For DOCX, write to temp file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=ext) as tmp:
-            tmp.write(buffer)
-            tmp_path = tmp.name
         try:
-            text = extract_text_from_docx(tmp_path)
-        finally:
-            os.unlink(tmp_path)
-        return text
+            return extract_docx_text(io.BytesIO(buffer))
+        except Exception as e:
+            print(f"Error reading DOCX from buffer: {e}", file=sys.stderr)
+            return ""
     return ""
 
 
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+# (123) 456-7890, 123-456-7890, 123.456.7890 ... The former "123-456-7890" and
+# "+1 ..." international patterns are dropped: every string they match contains a
+# match of this one, so they could never be reached.
+PHONE_PATTERN = re.compile(r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')
+PHONE_MAX_LENGTH = 14
+
+# Contact details almost always sit at the top; scan this many characters first
+HEADER_REGION_CHARS = 2000
+
+
+def _header_region_end(text: str) -> int:
+    """End of the header region, extended to the next line break (inclusive)."""
+    if len(text) <= HEADER_REGION_CHARS:
+        return len(text)
+    newline = text.find('\n', HEADER_REGION_CHARS)
+    return len(text) if newline == -1 else newline + 1
+
+
 def extract_email(text: str) -> str:
     """Extract email address from text."""
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    match = re.search(email_pattern, text)
+    # An email can't span a line break and the region ends on one, so a hit in
+    # the header region is exactly what a full-text search would return
+    region_end = _header_region_end(text)
+    match = EMAIL_PATTERN.search(text, 0, region_end)
+    if match is None and region_end < len(text):
+        match = EMAIL_PATTERN.search(text, region_end)
     return match.group(0) if match else ""
 
 
 def extract_phone(text: str) -> str:
     """Extract phone number from text."""
-    # Common phone patterns
-    phone_patterns = [
-        r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',  # (123) 456-7890 or 123-456-7890
-        r'\d{3}[-.\s]?\d{3}[-.\s]?\d{4}',  # 123-456-7890
-        r'\+?\d{1,3}[-.\s]?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',  # International
-    ]
-    for pattern in phone_patterns:
-        match = re.search(pattern, text)
-        if match:
-            return match.group(0)
-    return ""
+    region_end = _header_region_end(text)
+    match = PHONE_PATTERN.search(text, 0, region_end)
+    if region_end == len(text) or (match and match.start() + PHONE_MAX_LENGTH <= region_end):
+        # Far enough from the cut that no longer or earlier match could cross it
+        return match.group(0) if match else ""
+    if match is None:
+        # Any match left must end past the region, so it starts near the cut
+        match = PHONE_PATTERN.search(text, max(0, region_end - PHONE_MAX_LENGTH))
+    else:
+        match = PHONE_PATTERN.search(text)
+    return match.group(0) if match else ""
 
 
 def extract_name(text: str) -> tuple[str, str, str]:
@@ -124,16 +368,93 @@ def extract_name(text: str) -> tuple[str, str, str]:
     return ("", "", "")
 
 
-def extract_years_of_experience(text: str) -> int:
+# Header aliases for each canonical resume section
+SECTION_ALIASES = {
+    "summary": ['summary', 'professional summary', 'objective', 'profile'],
+    "education": ['education', 'academic background', 'qualifications'],
+    "experience": ['experience', 'work experience', 'professional experience', 'employment history'],
+    "employment": ['experience', 'work experience', 'professional experience', 'employment'],
+    "skills": ['skills', 'technical skills', 'core competencies', 'key skills'],
+    "certifications": ['certifications', 'certification', 'training', 'certificates'],
+    "memberships": ['memberships', 'professional memberships', 'affiliations'],
+    "clearance": ['security clearance', 'clearance'],
+}
+
+# Headers that terminate a section
+SECTION_BOUNDARIES = ['SUMMARY', 'OBJECTIVE', 'EXPERIENCE', 'EDUCATION', 'SKILLS',
+                      'CERTIFICATIONS', 'PROJECTS', 'AWARDS', 'REFERENCES']
+_SECTION_BOUNDARY_NAMES = {name.lower() for name in SECTION_BOUNDARIES}
+_SECTION_HEADER_NAMES = (
+    {alias for aliases in SECTION_ALIASES.values() for alias in aliases} | _SECTION_BOUNDARY_NAMES
+)
+
+# A header is a line holding only a known section name and an optional colon
+SECTION_HEADER_PATTERN = re.compile(
+    r'^(' + '|'.join(re.escape(name) for name in sorted(_SECTION_HEADER_NAMES, key=len, reverse=True)) + r')\s*:?\s*$',
+    re.IGNORECASE | re.MULTILINE,
+)
+
+
+class SectionIndex:
+    """Offsets of every section header in a resume, found in one scan of the text."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self._header_ends: dict[str, int] = {}
+        self._boundary_starts: list[int] = []
+        for match in SECTION_HEADER_PATTERN.finditer(text):
+            name = match.group(1).lower()
+            # Only the first occurrence of a header counts, as with a plain search
+            self._header_ends.setdefault(name, match.end())
+            if name in _SECTION_BOUNDARY_NAMES:
+                self._boundary_starts.append(match.start())
+
+    def _header_end(self, name: str) -> int | None:
+        if name.lower() in _SECTION_HEADER_NAMES:
+            return self._header_ends.get(name.lower())
+        # Ad-hoc header outside the indexed vocabulary
+        match = re.search(rf'^({re.escape(name)})\s*:?\s*$', self.text, re.IGNORECASE | re.MULTILINE)
+        return match.end() if match else None
+
+    def section(self, section_names: list[str]) -> str:
+        """Text under the first of section_names present, up to the next boundary header."""
+        for section_name in section_names:
+            start = self._header_end(section_name)
+            if start is None:
+                continue
+            next_index = bisect.bisect_right(self._boundary_starts, start)
+            end = self._boundary_starts[next_index] if next_index < len(self._boundary_starts) else len(self.text)
+            return self.text[start:end].strip()
+        return ""
+
+
+def extract_section(text: str, section_names: list[str], index: SectionIndex | None = None) -> str:
+    """Extract a section from text by looking for section headers."""
+    return (index or SectionIndex(text)).section(section_names)
+
+
+# "5 years of experience", "10+ years in ...", "Experience: 7 years"; tried in order
+YEARS_OF_EXPERIENCE_PATTERNS = (
+    re.compile(r'(\d+)\+?\s*years?\s*(?:of\s*)?experience', re.IGNORECASE),
+    re.compile(r'(\d+)\+?\s*years?\s*in', re.IGNORECASE),
+    re.compile(r'experience[:\s]+(\d+)\+?\s*years?', re.IGNORECASE),
+)
+JOB_TITLE_PATTERN = re.compile(r'^[A-Z][^•\n]{10,}')
+# "\d{1,2}/\d{4}" is implied by "\d{4}"; only whether a date occurs matters
+DATE_HINT_PATTERN = re.compile(r'\d{4}|Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec', re.IGNORECASE)
+# One pass per experience line: a date anywhere wins over a leading action verb
+EXPERIENCE_LINE_PATTERN = re.compile(
+    r'(?=.*?(?P<date>\d{4}|Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec))'
+    r'|(?P<verb>Designed|Developed|Managed|Created|Implemented|Led|Worked|Provided|Responsible)',
+    re.IGNORECASE,
+)
+
+
+def extract_years_of_experience(text: str, index: SectionIndex | None = None) -> int:
     """Extract years of experience from text."""
     # Look for patterns like "5 years", "10+ years", etc.
-    patterns = [
-        r'(\d+)\+?\s*years?\s*(?:of\s*)?experience',
-        r'(\d+)\+?\s*years?\s*in',
-        r'experience[:\s]+(\d+)\+?\s*years?',
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
+    for pattern in YEARS_OF_EXPERIENCE_PATTERNS:
+        match = pattern.search(text)
         if match:
             try:
                 return int(match.group(1))
@@ -141,41 +462,22 @@ def extract_years_of_experience(text: str) -> int:
                 pass
     
     # Fallback: count experience entries
-    exp_section = extract_section(text, ['experience', 'work experience', 'professional experience', 'employment'])
+    exp_section = extract_section(text, SECTION_ALIASES["employment"], index)
     if exp_section:
         # Count job entries (lines that look like job titles)
         lines = exp_section.split('\n')
         count = 0
         for line in lines:
-            if re.match(r'^[A-Z][^•\n]{10,}', line.strip()):
+            if JOB_TITLE_PATTERN.match(line.strip()):
                 count += 1
         return min(count, 30)  # Cap at 30
     
     return 0
 
 
-def extract_section(text: str, section_names: list[str]) -> str:
-    """Extract a section from text by looking for section headers."""
-    text_lower = text.lower()
-    
-    for section_name in section_names:
-        # Look for section header
-        pattern = rf'^({re.escape(section_name)})\s*:?\s*$'
-        match = re.search(pattern, text, re.IGNORECASE | re.MULTILINE)
-        if match:
-            start = match.end()
-            # Find next section or end of text
-            next_section_pattern = r'^(?:SUMMARY|OBJECTIVE|EXPERIENCE|EDUCATION|SKILLS|CERTIFICATIONS|PROJECTS|AWARDS|REFERENCES)\s*:?\s*$'
-            next_match = re.search(next_section_pattern, text[start:], re.IGNORECASE | re.MULTILINE)
-            end = start + next_match.start() if next_match else len(text)
-            return text[start:end].strip()
-    
-    return ""
-
-
-def parse_experience(text: str) -> list[dict]:
+def parse_experience(text: str, index: SectionIndex | None = None) -> list[dict]:
     """Parse work experience from text."""
-    exp_section = extract_section(text, ['experience', 'work experience', 'professional experience', 'employment history'])
+    exp_section = extract_section(text, SECTION_ALIASES["experience"], index)
     if not exp_section:
         return []
     
@@ -189,7 +491,7 @@ def parse_experience(text: str) -> list[dict]:
             continue
         
         # Check if this looks like a job title (usually capitalized, not a bullet)
-        if re.match(r'^[A-Z][^•\n]{10,}', line) and not line.startswith(('•', '-', '*', 'Designed', 'Developed', 'Managed')):
+        if JOB_TITLE_PATTERN.match(line) and not line.startswith(('•', '-', '*', 'Designed', 'Developed', 'Managed')):
             # Save previous experience if exists
             if current_exp:
                 experiences.append(current_exp)
@@ -216,15 +518,16 @@ def parse_experience(text: str) -> list[dict]:
                             current_exp["duration"] = parts[2]
                     elif len(parts) == 1:
                         current_exp["company"] = parts[0]
-                elif re.search(r'\d{4}|\d{1,2}/\d{4}|(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)', next_line, re.IGNORECASE):
+                elif DATE_HINT_PATTERN.search(next_line):
                     current_exp["duration"] = next_line
         elif current_exp:
+            match = EXPERIENCE_LINE_PATTERN.match(line)
             # Check if this is a duration line
-            if re.search(r'\d{4}|\d{1,2}/\d{4}|(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)', line, re.IGNORECASE):
+            if match and match.group('date'):
                 if not current_exp["duration"]:
                     current_exp["duration"] = line
             # Check if this is a responsibility (bullet point or action verb)
-            elif line.startswith(('•', '-', '*')) or re.match(r'^(Designed|Developed|Managed|Created|Implemented|Led|Worked|Provided|Responsible)', line, re.IGNORECASE):
+            elif line.startswith(('•', '-', '*')) or (match and match.group('verb')):
                 current_exp["responsibilities"].append(line.lstrip('•-* '))
     
     # Add last experience
@@ -234,9 +537,9 @@ def parse_experience(text: str) -> list[dict]:
     return experiences
 
 
-def parse_skills(text: str) -> list[str]:
+def parse_skills(text: str, index: SectionIndex | None = None) -> list[str]:
     """Parse skills from text."""
-    skills_section = extract_section(text, ['skills', 'technical skills', 'core competencies', 'key skills'])
+    skills_section = extract_section(text, SECTION_ALIASES["skills"], index)
     if not skills_section:
         return []
     
@@ -262,9 +565,9 @@ def parse_skills(text: str) -> list[str]:
     return cleaned_skills[:50]  # Limit to 50 skills
 
 
-def parse_education(text: str) -> list[str]:
+def parse_education(text: str, index: SectionIndex | None = None) -> list[str]:
     """Parse education from text."""
-    edu_section = extract_section(text, ['education', 'academic background', 'qualifications'])
+    edu_section = extract_section(text, SECTION_ALIASES["education"], index)
     if not edu_section:
         return []
     
@@ -273,28 +576,73 @@ def parse_education(text: str) -> list[str]:
     return lines[:10]  # Limit to 10 entries
 
 
-def parse_resume(text: str, filename: str) -> dict:
+class ParseStats:
+    """Per-stage wall-clock timings (ms) and byte counts for one parse."""
+
+    def __init__(self):
+        self.timings = {}
+        self.bytes = {}
+        self.cache = "off"
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.timings[name] = self.timings.get(name, 0.0) + elapsed
+
+    def as_dict(self) -> dict:
+        return {
+            "timingsMs": {name: round(ms, 3) for name, ms in self.timings.items()},
+            "totalMs": round(sum(self.timings.values()), 3),
+            "bytes": self.bytes,
+            "cache": self.cache,
+        }
+
+
+def _stage(stats: ParseStats | None, name: str):
+    return stats.stage(name) if stats else contextlib.nullcontext()
+
+
+def parse_resume(text: str, filename: str, stats: ParseStats | None = None) -> dict:
     """Parse resume text into structured format."""
+    # Find every section header once; all extractors read from this index
+    with _stage(stats, "sectionIndex"):
+        index = SectionIndex(text)
+
     # Extract personal info
-    email = extract_email(text)
-    phone = extract_phone(text)
-    firstName, middleName, lastName = extract_name(text)
-    yearsOfExperience = extract_years_of_experience(text)
+    with _stage(stats, "email"):
+        email = extract_email(text)
+    with _stage(stats, "phone"):
+        phone = extract_phone(text)
+    with _stage(stats, "name"):
+        firstName, middleName, lastName = extract_name(text)
+    with _stage(stats, "yearsOfExperience"):
+        yearsOfExperience = extract_years_of_experience(text, index)
     
     # Extract sections
-    professionalSummary = extract_section(text, ['summary', 'professional summary', 'objective', 'profile'])
-    if not professionalSummary:
-        # Try to get first paragraph if no summary section
-        lines = text.split('\n')[:10]
-        professionalSummary = ' '.join([l.strip() for l in lines if l.strip() and not l.strip().startswith(('Email:', 'Phone:', 'Address:'))])[:500]
+    with _stage(stats, "summary"):
+        professionalSummary = extract_section(text, SECTION_ALIASES["summary"], index)
+        if not professionalSummary:
+            # Try to get first paragraph if no summary section
+            lines = text.split('\n')[:10]
+            professionalSummary = ' '.join([l.strip() for l in lines if l.strip() and not l.strip().startswith(('Email:', 'Phone:', 'Address:'))])[:500]
     
-    education = parse_education(text)
-    experience = parse_experience(text)
-    skills = parse_skills(text)
+    with _stage(stats, "education"):
+        education = parse_education(text, index)
+    with _stage(stats, "experience"):
+        experience = parse_experience(text, index)
+    with _stage(stats, "skills"):
+        skills = parse_skills(text, index)
     
-    certifications = extract_section(text, ['certifications', 'certification', 'training', 'certificates'])
-    professionalMemberships = extract_section(text, ['memberships', 'professional memberships', 'affiliations'])
-    securityClearance = extract_section(text, ['security clearance', 'clearance'])
+    with _stage(stats, "certifications"):
+        certifications = extract_section(text, SECTION_ALIASES["certifications"], index)
+    with _stage(stats, "memberships"):
+        professionalMemberships = extract_section(text, SECTION_ALIASES["memberships"], index)
+    with _stage(stats, "clearance"):
+        securityClearance = extract_section(text, SECTION_ALIASES["clearance"], index)
     
     return {
         "filename": filename,
@@ -317,57 +665,431 @@ def parse_resume(text: str, filename: str) -> dict:
     }
 
 
+TEXT_MODES = ("full", "omit", "zlib")
+
+
+def output_text_mode() -> str:
+    """How originalText is emitted: RESUME_OUTPUT_TEXT=full|omit|zlib (default full)."""
+    mode = os.environ.get("RESUME_OUTPUT_TEXT", "full").lower() or "full"
+    if mode not in TEXT_MODES:
+        raise ValueError(f"Unknown text output mode '{mode}' (expected one of: {', '.join(TEXT_MODES)})")
+    return mode
+
+
+def shape_result(result: dict, text_mode: str) -> dict:
+    """Drop or compress originalText; the other fields are passed through untouched."""
+    if text_mode == "full" or "originalText" not in result:
+        return result
+    shaped = dict(result)
+    text = shaped.pop("originalText")
+    if text_mode == "zlib":
+        shaped["originalTextZlib"] = base64.b64encode(zlib.compress(text.encode("utf-8"), 6)).decode("ascii")
+    return shaped
+
+
+def stats_enabled() -> bool:
+    return os.environ.get("RESUME_PARSE_STATS", "").lower() in ("1", "true", "yes", "on")
+
+
+def extract_text_from_path(file_path: str) -> str:
+    """Extract text from a resume file on disk; raises ValueError for bad input."""
+    if not os.path.exists(file_path):
+        raise ValueError(f"File not found: {file_path}")
+
+    ext = Path(file_path).suffix.lower()
+    if ext == ".pdf":
+        return extract_text_from_pdf(file_path)
+    elif ext in [".docx", ".doc"]:
+        return extract_text_from_docx(file_path)
+    raise ValueError(f"Unsupported file type: {ext}")
+
+
+# Bump when cached results must be dropped for reasons the source hash can't see
+PARSER_VERSION = "1"
+
+_parser_fingerprint = None
+_parse_cache = None
+_parse_cache_opened = False
+
+
+def parser_fingerprint() -> str:
+    """Identify the current parsing logic (version, source hash and PDF options)."""
+    global _parser_fingerprint
+    if _parser_fingerprint is None:
+        source_hash = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()[:16]
+        _parser_fingerprint = f"{PARSER_VERSION}:{source_hash}:{select_pdf_backend()}:{pdf_page_budget()}"
+    return _parser_fingerprint
+
+
+class ParseCache:
+    """Content-addressed store of parsed resumes in a local SQLite file."""
+
+    def __init__(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        # Batch workers each open their own connection; WAL lets them write concurrently
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS parsed ("
+            "content_sha256 TEXT PRIMARY KEY, parser TEXT NOT NULL, "
+            "result TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        # Entries written by other parser versions can never be served again
+        self.conn.execute("DELETE FROM parsed WHERE parser != ?", (parser_fingerprint(),))
+
+    def get(self, content_sha256: str) -> dict | None:
+        row = self.conn.execute(
+            "SELECT result FROM parsed WHERE content_sha256 = ? AND parser = ?",
+            (content_sha256, parser_fingerprint()),
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, content_sha256: str, result: dict):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO parsed (content_sha256, parser, result, created_at) VALUES (?, ?, ?, ?)",
+            (content_sha256, parser_fingerprint(), json.dumps(result, ensure_ascii=False), time.time()),
+        )
+
+
+def get_parse_cache() -> ParseCache | None:
+    """Open the process-wide cache once; None when disabled or unavailable."""
+    global _parse_cache, _parse_cache_opened
+    if not _parse_cache_opened:
+        _parse_cache_opened = True
+        setting = os.environ.get("RESUME_PARSE_CACHE", "")
+        if setting.lower() not in ("off", "0", "false", "none"):
+            cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(Path.home(), ".cache")
+            path = setting or os.path.join(cache_home, "cobecdev", "resume_parse_cache.sqlite3")
+            try:
+                _parse_cache = ParseCache(path)
+            except (OSError, sqlite3.Error) as e:
+                print(f"Warning: resume parse cache disabled ({path}): {e}", file=sys.stderr)
+    return _parse_cache
+
+
+def parse_resume_content(buffer: bytes, filename: str, extract=None, stats: ParseStats | None = None) -> dict:
+    """Parse resume bytes, serving unchanged content from the cache.
+
+    extract() produces the text on a cache miss; by default the buffer itself is
+    extracted. Raises ValueError when no text can be extracted.
+    """
+    if stats:
+        stats.bytes["input"] = len(buffer)
+    cache = get_parse_cache()
+    if cache:
+        with _stage(stats, "cacheLookup"):
+            content_sha256 = hashlib.sha256(buffer).hexdigest()
+            try:
+                cached = cache.get(content_sha256)
+            except sqlite3.Error as e:
+                print(f"Warning: resume parse cache read failed: {e}", file=sys.stderr)
+                cached = None
+        if stats:
+            stats.cache = "hit" if cached is not None else "miss"
+        if cached is not None:
+            cached["filename"] = filename
+            if stats:
+                stats.bytes["text"] = len(cached.get("originalText", "").encode("utf-8"))
+            return cached
+
+    with _stage(stats, "extract"):
+        text = extract() if extract else extract_text_from_buffer(buffer, filename)
+    if not text or not text.strip():
+        raise ValueError("No text could be extracted from the file")
+    if stats:
+        stats.bytes["text"] = len(text.encode("utf-8"))
+
+    result = parse_resume(text, filename, stats)
+    if cache:
+        with _stage(stats, "cacheStore"):
+            try:
+                cache.put(content_sha256, result)
+            except sqlite3.Error as e:
+                print(f"Warning: resume parse cache write failed: {e}", file=sys.stderr)
+    return result
+
+
+def parse_resume_path(file_path: str, filename: str | None = None, stats: ParseStats | None = None) -> dict:
+    """Parse a resume file on disk (cached by content)."""
+    filename = filename or Path(file_path).name
+    if not os.path.exists(file_path):
+        raise ValueError(f"File not found: {file_path}")
+    ext = Path(file_path).suffix.lower()
+    if ext not in (".pdf", ".docx", ".doc"):
+        raise ValueError(f"Unsupported file type: {ext}")
+    with _stage(stats, "read"):
+        with open(file_path, "rb") as f:
+            buffer = f.read()
+    return parse_resume_content(buffer, filename, lambda: extract_text_from_path(file_path), stats)
+
+
+def finish_result(result: dict, text_mode: str, stats: ParseStats | None = None) -> dict:
+    """Apply the text output mode and, when collecting stats, measure the output size."""
+    with _stage(stats, "shapeOutput"):
+        result = shape_result(result, text_mode)
+    if stats:
+        with stats.stage("serialize"):
+            stats.bytes["output"] = len(json.dumps(result, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+    return result
+
+
+def handle_request(request: dict) -> dict:
+    """Parse one serve-mode request into a response envelope (never raises).
+
+    Requests may override the process defaults with "text": "full"|"omit"|"zlib"
+    and "stats": true|false; stats are returned beside the result.
+    """
+    request_id = request.get("id") if isinstance(request, dict) else None
+    try:
+        if not isinstance(request, dict):
+            raise ValueError("Request must be a JSON object")
+        text_mode = request.get("text") or output_text_mode()
+        if text_mode not in TEXT_MODES:
+            raise ValueError(f"Unknown text output mode '{text_mode}'")
+        stats = ParseStats() if request.get("stats", stats_enabled()) else None
+
+        if request.get("path"):
+            result = parse_resume_path(request["path"], request.get("filename"), stats)
+        elif request.get("base64") is not None and request.get("filename"):
+            with _stage(stats, "decode"):
+                buffer = base64.b64decode(request["base64"])
+            result = parse_resume_content(buffer, request["filename"], stats=stats)
+        else:
+            raise ValueError("Request needs either 'path' or 'base64' and 'filename'")
+
+        response = {"id": request_id, "ok": True, "result": finish_result(result, text_mode, stats)}
+        if stats:
+            response["stats"] = stats.as_dict()
+        return response
+    except Exception as e:
+        return {"id": request_id, "ok": False, "error": str(e)}
+
+
+def serve_stream(in_stream, out_stream):
+    """Answer NDJSON requests from in_stream until EOF, one response line each."""
+    for line in in_stream:
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
+        if not line.strip():
+            continue
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            response = {"id": None, "ok": False, "error": f"Invalid JSON request: {e}"}
+        else:
+            response = handle_request(request)
+        payload = json.dumps(response, ensure_ascii=False, separators=(",", ":")) + "\n"
+        if isinstance(out_stream, io.TextIOBase):
+            out_stream.write(payload)
+        else:
+            out_stream.write(payload.encode("utf-8"))
+        out_stream.flush()
+
+
+def serve_socket(socket_path: str):
+    """Serve NDJSON requests on a Unix socket; each connection is handled in a thread."""
+    if not hasattr(socketserver, "ThreadingUnixStreamServer"):
+        print("ERROR: Unix sockets are not supported on this platform; use stdin mode", file=sys.stderr)
+        sys.exit(1)
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            serve_stream(self.rfile, self.wfile)
+
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    with socketserver.ThreadingUnixStreamServer(socket_path, Handler) as server:
+        print(f"Resume parser listening on {socket_path}", file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.unlink(socket_path)
+
+
+BATCH_EXTENSIONS = {".pdf", ".docx"}
+
+
+def discover_resume_files(target: str) -> list[str]:
+    """Find DOCX/PDF files under a directory (recursively) or matching a glob."""
+    if os.path.isdir(target):
+        candidates = (str(p) for p in Path(target).rglob("*"))
+    else:
+        candidates = glob.iglob(target, recursive=True)
+    return sorted(
+        path for path in candidates
+        if Path(path).suffix.lower() in BATCH_EXTENSIONS and os.path.isfile(path)
+    )
+
+
+def _init_batch_worker():
+    global _pdf_parallel_enabled
+    # The batch already uses every core; don't fan out again per document
+    _pdf_parallel_enabled = False
+
+
+def parse_batch_file(file_path: str) -> dict:
+    """Process-pool worker: parse one file into a batch record (never raises)."""
+    response = handle_request({"path": file_path})
+    response.pop("id", None)
+    return {"path": file_path, **response}
+
+
+def run_batch(target: str, workers: int = 0, out_stream=None) -> int:
+    """Parse every resume under target across a process pool, streaming NDJSON results."""
+    out_stream = out_stream or sys.stdout
+    files = discover_resume_files(target)
+    if not files:
+        print(f"ERROR: No DOCX/PDF files found for: {target}", file=sys.stderr)
+        return 1
+
+    workers = workers or os.cpu_count() or 1
+    # Bound in-flight work so huge archives don't queue every path up front
+    max_in_flight = workers * 4
+    succeeded = failed = 0
+    start = time.time()
+    print(f"Parsing {len(files)} file(s) with {workers} worker(s)...", file=sys.stderr)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker) as executor:
+        pending_files = iter(files)
+        in_flight = set()
+        future_paths = {}
+        while True:
+            for file_path in pending_files:
+                future = executor.submit(parse_batch_file, file_path)
+                future_paths[future] = file_path
+                in_flight.add(future)
+                if len(in_flight) >= max_in_flight:
+                    break
+            if not in_flight:
+                break
+
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                file_path = future_paths.pop(future)
+                try:
+                    record = future.result()
+                except Exception as e:
+                    # A crashed worker still yields a record rather than aborting the batch
+                    record = {"path": file_path, "ok": False, "error": f"Worker failed: {e}"}
+                if record["ok"]:
+                    succeeded += 1
+                else:
+                    failed += 1
+                out_stream.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+            out_stream.flush()
+
+    elapsed = time.time() - start
+    rate = len(files) / elapsed if elapsed > 0 else 0.0
+    print(f"Parsed {succeeded} file(s), {failed} failed, in {elapsed:.2f}s ({rate:.1f} files/s)", file=sys.stderr)
+    return 0
+
+
 def main():
     """Main entry point."""
+    # Global options travel via the environment so batch worker processes inherit them
+    for flag, env_name, value in (
+        ('--no-cache', 'RESUME_PARSE_CACHE', 'off'),
+        ('--omit-text', 'RESUME_OUTPUT_TEXT', 'omit'),
+        ('--compress-text', 'RESUME_OUTPUT_TEXT', 'zlib'),
+        ('--stats', 'RESUME_PARSE_STATS', '1'),
+    ):
+        if flag in sys.argv:
+            sys.argv.remove(flag)
+            os.environ[env_name] = value
+    compact = '--compact' in sys.argv
+    if compact:
+        sys.argv.remove('--compact')
+    for flag, env_name in (('--pdf-backend', 'RESUME_PDF_BACKEND'), ('--pdf-max-pages', 'RESUME_PDF_MAX_PAGES')):
+        if flag in sys.argv:
+            position = sys.argv.index(flag)
+            if position + 1 >= len(sys.argv):
+                print(f"ERROR: {flag} needs a value", file=sys.stderr)
+                sys.exit(1)
+            os.environ[env_name] = sys.argv[position + 1]
+            del sys.argv[position:position + 2]
+
+    try:
+        select_pdf_backend()
+        text_mode = output_text_mode()
+    except ValueError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(1)
+
     if len(sys.argv) < 2:
-        print("ERROR: Usage: python parseResumeFile.py <file_path> or --base64 <base64_data> --filename <filename>", file=sys.stderr)
+        print("ERROR: Usage: python parseResumeFile.py <file_path> or --base64 <base64_data> --filename <filename> or --serve [--socket <path>] or --batch <directory|glob> [--workers N]", file=sys.stderr)
         sys.exit(1)
+
+    if sys.argv[1] == '--batch':
+        if len(sys.argv) < 3:
+            print("ERROR: Usage: python parseResumeFile.py --batch <directory|glob> [--workers N]", file=sys.stderr)
+            sys.exit(1)
+        workers = 0
+        if len(sys.argv) >= 5 and sys.argv[3] == '--workers':
+            workers = int(sys.argv[4])
+        sys.exit(run_batch(sys.argv[2], workers))
+
+    if sys.argv[1] == '--serve':
+        if len(sys.argv) >= 4 and sys.argv[2] == '--socket':
+            serve_socket(sys.argv[3])
+        else:
+            serve_stream(sys.stdin, sys.stdout)
+        return
     
+    stats = ParseStats() if stats_enabled() else None
+
     # Check if using base64 input
     if sys.argv[1] == '--base64':
         if len(sys.argv) < 5 or sys.argv[3] != '--filename':
             print("ERROR: Usage: python parseResumeFile.py --base64 <base64_data> --filename <filename>", file=sys.stderr)
             sys.exit(1)
         
-        base64_data = sys.argv[2]
+        # "-" reads the payload from stdin, avoiding argv size limits on large files
+        base64_data = sys.stdin.read() if sys.argv[2] == '-' else sys.argv[2]
         filename = sys.argv[4]
         
         try:
-            buffer = base64.b64decode(base64_data)
-            text = extract_text_from_buffer(buffer, filename)
+            with _stage(stats, "decode"):
+                buffer = base64.b64decode(base64_data)
         except Exception as e:
             print(f"ERROR: Failed to decode base64 or extract text: {e}", file=sys.stderr)
             sys.exit(1)
+        parse = lambda: parse_resume_content(buffer, filename, stats=stats)
     else:
         file_path = sys.argv[1]
-        filename = Path(file_path).name
-        
-        if not os.path.exists(file_path):
-            print(f"ERROR: File not found: {file_path}", file=sys.stderr)
-            sys.exit(1)
-        
-        ext = Path(file_path).suffix.lower()
-        if ext == ".pdf":
-            text = extract_text_from_pdf(file_path)
-        elif ext in [".docx", ".doc"]:
-            text = extract_text_from_docx(file_path)
-        else:
-            print(f"ERROR: Unsupported file type: {ext}", file=sys.stderr)
-            sys.exit(1)
-    
-    if not text or not text.strip():
-        print("ERROR: No text could be extracted from the file", file=sys.stderr)
-        sys.exit(1)
+        parse = lambda: parse_resume_path(file_path, stats=stats)
     
     # Parse the resume
     try:
-        result = parse_resume(text, filename)
-        # Output JSON to stdout
-        print(json.dumps(result, indent=2, ensure_ascii=False))
+        result = finish_result(parse(), text_mode, stats)
+    except ValueError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(1)
     except Exception as e:
         print(f"ERROR: Failed to parse resume: {e}", file=sys.stderr)
         sys.exit(1)
 
+    # Output JSON to stdout
+    if compact:
+        print(json.dumps(result, ensure_ascii=False, separators=(",", ":")))
+    else:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+
+    if stats:
+        print_stats(stats)
+
+
+def print_stats(stats: ParseStats):
+    """Human-readable stage breakdown on stderr (stdout carries the JSON result)."""
+    summary = stats.as_dict()
+    print(f"Parse stats (cache: {summary['cache']}, total {summary['totalMs']:.2f} ms):", file=sys.stderr)
+    for name, ms in sorted(summary["timingsMs"].items(), key=lambda item: -item[1]):
+        print(f"  {name:<18} {ms:>10.3f} ms", file=sys.stderr)
+    for name, size in summary["bytes"].items():
+        print(f"  {name + ' bytes':<18} {size:>10}", file=sys.stderr)
+
 
 if __name__ == "__main__":
     main()
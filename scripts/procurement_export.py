@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+procurement_export.py
+Bulk export of approved procurement links and scraped procurementData captures
+for analytics. Records are fetched from Convex page by page and written as
+record batches, so memory stays bounded by --batch-size regardless of how many
+rows are exported.
+
+Formats:
+    parquet  Typed columns, dictionary-encoded state/status, zstd (needs pyarrow)
+    arrow    Arrow IPC file (Feather v2) with the same columns; state/status are
+             plain strings there, since IPC files allow only one dictionary
+             per column across all batches (needs pyarrow)
+    ndjson   One JSON object per line
+    csv      RFC 4180 quoting via the csv module
+
+Datasets:
+    links    Approved procurementUrls (one row per link)
+    data     procurementData captures (one row per capture, scraped rows as JSON)
+    rows     Scraped rows flattened out of procurementData (one row per record)
+
+Usage:
+    python scripts/procurement_export.py links -o links.parquet
+    python scripts/procurement_export.py data --state Texas -o texas.ndjson
+    python scripts/procurement_export.py rows --format csv -o rows.csv [--batch-size N] [--page-size N]
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import tempfile
+import time
+from itertools import islice
+from pathlib import Path
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+from get_approved_procurement_links import CONVEX_AVAILABLE, load_convex_url
+
+if CONVEX_AVAILABLE:
+    from convex import ConvexClient
+
+
+# Documents per Convex request. procurementData captures carry their whole
+# scraped table, so those pages stay small and are also capped by bytes read
+# to keep each response under Convex's size limits.
+DEFAULT_PAGE_SIZES = {"links": 500, "data": 25, "rows": 25}
+CAPTURE_PAGE_BYTES = 4 * 1024 * 1024
+DEFAULT_BATCH_SIZE = 10_000
+
+FORMATS = ("parquet", "arrow", "ndjson", "csv")
+FORMAT_EXTENSIONS = {
+    ".parquet": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+    ".csv": "csv",
+}
+
+# Column kinds: "string", "category" (dictionary-encoded string), "bool",
+# "int", "timestamp" (Convex millisecond epoch) and "json" (nested value,
+# stored as a JSON string in Parquet/Arrow/CSV and kept as-is in NDJSON).
+DATASET_COLUMNS = {
+    "links": [
+        ("_id", "string"),
+        ("state", "category"),
+        ("capital", "string"),
+        ("officialWebsite", "string"),
+        ("procurementLink", "string"),
+        ("status", "category"),
+        ("requiresRegistration", "bool"),
+        ("verifiedBy", "string"),
+        ("verifiedAt", "timestamp"),
+        ("importedAt", "timestamp"),
+        ("sourceFile", "string"),
+        ("aiReviewStatus", "category"),
+        ("aiDecision", "category"),
+        ("_creationTime", "timestamp"),
+    ],
+    "data": [
+        ("_id", "string"),
+        ("procurementUrlId", "string"),
+        ("state", "category"),
+        ("sourceUrl", "string"),
+        ("status", "category"),
+        ("rowCount", "int"),
+        ("createdAt", "timestamp"),
+        ("data", "json"),
+    ],
+    "rows": [
+        ("captureId", "string"),
+        ("procurementUrlId", "string"),
+        ("state", "category"),
+        ("sourceUrl", "string"),
+        ("createdAt", "timestamp"),
+        ("rowIndex", "int"),
+        ("record", "json"),
+    ],
+}
+
+
+def arrow_type(kind, dictionary=True):
+    return {
+        "string": pa.string(),
+        "category": pa.dictionary(pa.int32(), pa.string()) if dictionary else pa.string(),
+        "bool": pa.bool_(),
+        "int": pa.int64(),
+        "timestamp": pa.timestamp("ms", tz="UTC"),
+        "json": pa.string(),
+    }[kind]
+
+
+def arrow_schema(columns, dictionary=True):
+    return pa.schema([pa.field(name, arrow_type(kind, dictionary)) for name, kind in columns])
+
+
+def to_json_text(value):
+    return None if value is None else json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def to_int(value):
+    # Convex returns every number as a float, and _creationTime has sub-millisecond digits
+    return None if value is None else int(round(value))
+
+
+# --- Sources -----------------------------------------------------------------
+
+def iter_pages(client, function_name, args, page_size, max_bytes=None):
+    """Yield documents from a Convex paginated query, one page in memory at a time."""
+    cursor = None
+    while True:
+        options = {"numItems": page_size, "cursor": cursor}
+        if max_bytes:
+            options["maximumBytesRead"] = max_bytes
+        result = client.query(function_name, {**args, "paginationOpts": options})
+        yield from result["page"]
+        if result["isDone"]:
+            return
+        cursor = result["continueCursor"]
+
+
+def iter_links(client, page_size, state=None):
+    for link in iter_pages(client, "procurementUrls:getApprovedPaginated", {}, page_size):
+        if state is None or link.get("state") == state:
+            yield link
+
+
+def iter_captures(client, page_size, state=None):
+    args = {} if state is None else {"state": state}
+    return iter_pages(client, "procurementData:listPaginated", args, page_size, CAPTURE_PAGE_BYTES)
+
+
+def iter_capture_rows(client, page_size, state=None):
+    for capture in iter_captures(client, page_size, state):
+        for index, record in enumerate(capture.get("data") or []):
+            yield {
+                "captureId": capture.get("_id"),
+                "procurementUrlId": capture.get("procurementUrlId"),
+                "state": capture.get("state"),
+                "sourceUrl": capture.get("sourceUrl"),
+                "createdAt": capture.get("createdAt"),
+                "rowIndex": index,
+                "record": record,
+            }
+
+
+SOURCES = {
+    "links": iter_links,
+    "data": iter_captures,
+    "rows": iter_capture_rows,
+}
+
+
+# --- Sinks -------------------------------------------------------------------
+
+class ArrowSink:
+    """Write record batches to Parquet or an Arrow IPC file."""
+
+    def __init__(self, path, columns, fmt, compression="zstd"):
+        self.columns = columns
+        # Each batch builds its own dictionary: Parquet re-encodes per row group,
+        # but an IPC file would reject the second batch as a dictionary replacement
+        self.schema = arrow_schema(columns, dictionary=fmt == "parquet")
+        self.sink = None
+        if fmt == "parquet":
+            self.writer = pq.ParquetWriter(path, self.schema, compression=compression)
+        else:
+            self.sink = pa.OSFile(str(path), "wb")
+            options = pa.ipc.IpcWriteOptions(compression=None if compression == "none" else compression)
+            self.writer = pa.ipc.new_file(self.sink, self.schema, options=options)
+
+    def write_batch(self, records):
+        arrays = []
+        for (name, kind), field in zip(self.columns, self.schema):
+            values = [record.get(name) for record in records]
+            if kind == "json":
+                values = [to_json_text(v) for v in values]
+            elif kind in ("timestamp", "int"):
+                values = [to_int(v) for v in values]
+            arrays.append(pa.array(values, type=field.type))
+        self.writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+        if self.sink is not None:
+            self.sink.close()
+
+
+class NdjsonSink:
+    def __init__(self, path, columns):
+        self.columns = columns
+        self.int_columns = {name for name, kind in columns if kind in ("timestamp", "int")}
+        self.out = open(path, "w", encoding="utf-8")
+
+    def value(self, record, name):
+        value = record.get(name)
+        return to_int(value) if name in self.int_columns else value
+
+    def write_batch(self, records):
+        self.out.writelines(
+            json.dumps({name: self.value(record, name) for name, _ in self.columns}, ensure_ascii=False) + "\n"
+            for record in records
+        )
+
+    def close(self):
+        self.out.close()
+
+
+class CsvSink:
+    def __init__(self, path, columns):
+        self.columns = columns
+        self.out = open(path, "w", encoding="utf-8", newline="")
+        self.writer = csv.writer(self.out)
+        self.writer.writerow([name for name, _ in columns])
+
+    def cell(self, value, kind):
+        if value is None:
+            return ""
+        if kind == "bool":
+            return "true" if value else "false"
+        if kind == "json":
+            return to_json_text(value)
+        if kind in ("timestamp", "int"):
+            return to_int(value)
+        return value
+
+    def write_batch(self, records):
+        self.writer.writerows(
+            [self.cell(record.get(name), kind) for name, kind in self.columns] for record in records
+        )
+
+    def close(self):
+        self.out.close()
+
+
+def open_sink(path, columns, fmt, compression):
+    if fmt in ("parquet", "arrow"):
+        return ArrowSink(path, columns, fmt, compression)
+    if fmt == "ndjson":
+        return NdjsonSink(path, columns)
+    return CsvSink(path, columns)
+
+
+def export_records(records, output, columns, fmt, batch_size=DEFAULT_BATCH_SIZE, compression="zstd"):
+    """Write records to output in batches of batch_size. Returns the number of rows written.
+
+    The file is written to a temporary name next to output and renamed into
+    place once complete, so a failed export never leaves a truncated file.
+    """
+    output = Path(output)
+    fd, tmp_path = tempfile.mkstemp(dir=output.parent, prefix=f".{output.name}.", suffix=".tmp")
+    os.close(fd)
+    total = 0
+    try:
+        sink = open_sink(tmp_path, columns, fmt, compression)
+        try:
+            records = iter(records)
+            while True:
+                batch = list(islice(records, batch_size))
+                if not batch:
+                    break
+                sink.write_batch(batch)
+                total += len(batch)
+                print(f"   {total} row(s) written", file=sys.stderr)
+        finally:
+            sink.close()
+        # mkstemp creates the file 0600; give the export the usual umask permissions
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(tmp_path, 0o666 & ~umask)
+        os.replace(tmp_path, output)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return total
+
+
+def detect_format(output, requested):
+    if requested:
+        return requested
+    fmt = FORMAT_EXTENSIONS.get(Path(output).suffix.lower())
+    if not fmt:
+        raise ValueError(f"Cannot infer format from {output!r}; pass --format ({', '.join(FORMATS)})")
+    return fmt
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export procurement links and scraped data for analytics")
+    parser.add_argument("dataset", choices=sorted(SOURCES), help="What to export")
+    parser.add_argument("--output", "-o", required=True, help="Output file (format inferred from extension)")
+    parser.add_argument("--format", "-f", choices=FORMATS, help="Output format (default: from --output extension)")
+    parser.add_argument("--state", help="Only export this state")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"Rows per record batch / row group (default: {DEFAULT_BATCH_SIZE})")
+    parser.add_argument("--page-size", type=int,
+                        help="Documents fetched per Convex request (default: "
+                             + ", ".join(f"{k} {v}" for k, v in DEFAULT_PAGE_SIZES.items()) + ")")
+    parser.add_argument("--compression", default="zstd",
+                        help="Parquet/Arrow compression codec, or none (default: zstd)")
+    parser.add_argument("--convex-url", help="Convex deployment URL (overrides environment variables)")
+    args = parser.parse_args()
+
+    try:
+        fmt = detect_format(args.output, args.format)
+    except ValueError as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        return 1
+    if fmt in ("parquet", "arrow") and not PYARROW_AVAILABLE:
+        print(f"ERROR: pyarrow is required for {fmt} output. Run: pip install pyarrow", file=sys.stderr)
+        return 1
+    if not CONVEX_AVAILABLE:
+        return 1
+
+    convex_url = args.convex_url or load_convex_url()
+    if not convex_url:
+        print("❌ Error: CONVEX_URL not found. Set VITE_CONVEX_URL in .env.local or pass --convex-url", file=sys.stderr)
+        return 1
+
+    print(f"🔗 Connecting to Convex at: {convex_url}", file=sys.stderr)
+    print(f"📥 Exporting {args.dataset} to {args.output} ({fmt})...", file=sys.stderr)
+    client = ConvexClient(convex_url)
+    start = time.perf_counter()
+    try:
+        page_size = args.page_size or DEFAULT_PAGE_SIZES[args.dataset]
+        records = SOURCES[args.dataset](client, page_size, args.state)
+        total = export_records(records, args.output, DATASET_COLUMNS[args.dataset], fmt,
+                               batch_size=args.batch_size, compression=args.compression)
+    except Exception as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        return 1
+
+    print(f"✅ Exported {total} row(s) in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,472 @@
+#!/usr/bin/env python3
+"""
+Resume Index
+
+Local BM25 index over parsed resumes for candidate-to-posting matching without
+a network round trip. Documents come from `parseResumeFile.py` output (batch
+NDJSON or single JSON objects); the skills, experience and professional summary
+fields are tokenized and weighted (skills count double), and skills found by
+skill_matcher.py are added as normalized "skill:<id>" terms so "k8s" in a
+resume matches "Kubernetes" in a posting.
+
+Index layout (everything is memory-mapped at query time):
+    <index>/index.json          manifest: BM25 params, doc/length totals, the current
+                                vocab/df files and the segment list
+    <index>/vocab-000001.json   term -> term id
+    <index>/df-000001.npy       document frequency per term id
+    <index>/docs.jsonl          one metadata line per document, in doc id order
+    <index>/seg-000001-<hex>/   postings grouped by term for the docs of one add:
+        terms.npy, term_ptr.npy, doc_ids.npy, tf.npy, doclen.npy
+
+`add` writes a new immutable segment, vocab and df under fresh names and then
+atomically replaces index.json, the single commit point: a crashed add leaves
+the index as it was, and the next add removes whatever files it left behind.
+Resumes already indexed (same path or same content) are skipped. Scores use
+global document frequencies, so results do not depend on how documents were
+split into segments.
+
+Usage:
+    python resume_index.py build <batch.ndjson|-> --index DIR [--force]
+    python resume_index.py add <batch.ndjson|-> --index DIR
+    python resume_index.py query --index DIR (--query TEXT | --query-file FILE) [--top K]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import secrets
+import shutil
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+# Required dependency:
+# pip install numpy
+try:
+    import numpy as np
+except ImportError:
+    print("ERROR: numpy not installed. Run: pip install numpy", file=sys.stderr)
+    sys.exit(1)
+
+from skill_matcher import SkillMatcher
+
+INDEX_VERSION = 2
+# Version 1 indexes kept vocab.json/df.npy unversioned; they are still readable
+READABLE_VERSIONS = (1, 2)
+# Names an add writes before its commit: segments, vocab/df and their temp/staging files
+ORPHAN_PREFIXES = ("seg-", "vocab", "df", ".seg-", ".vocab", ".df", ".index.json.")
+DEFAULT_K1 = 1.2
+DEFAULT_B = 0.75
+FIELD_WEIGHTS = {"skills": 2.0, "experience": 1.0, "summary": 1.0, "skillIds": 2.0}
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9+#]+)*")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it of on or that the to was were with "
+    "i my me we our you your he she they their this these those will would can".split()
+)
+
+
+def tokenize(text: str) -> list[str]:
+    return [t for t in _TOKEN_PATTERN.findall(text.lower()) if t not in STOPWORDS]
+
+
+def write_json_atomic(path: Path, data):
+    """Write JSON to path via a temp file + rename so readers never see partial files."""
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def save_npy_atomic(path: Path, array):
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, array)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def resume_fields(resume: dict) -> dict[str, str]:
+    """The text of each indexed field of a parsed resume."""
+    experience = []
+    for item in resume.get("experience") or []:
+        experience.append(item.get("title", ""))
+        experience.append(item.get("company", ""))
+        experience.extend(item.get("responsibilities") or [])
+    return {
+        "skills": "\n".join(resume.get("skills") or []),
+        "experience": "\n".join(experience),
+        "summary": resume.get("professionalSummary") or "",
+    }
+
+
+def content_hash(resume: dict) -> str:
+    """Hash of what a resume contributes to the index, for duplicate detection."""
+    payload = {"fields": resume_fields(resume), "personalInfo": resume.get("personalInfo") or {}}
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def _unwrap_record(record: dict) -> dict | None:
+    """The parsed resume inside a batch record (None for failed parses)."""
+    if record.get("ok") is False:
+        return None
+    resume = record.get("result", record)
+    if "path" in record:
+        resume.setdefault("path", record["path"])
+    return resume
+
+
+def iter_resumes(source: str):
+    """Yield parsed resume objects from batch NDJSON, a JSON file, or stdin ("-")."""
+    stream = sys.stdin if source == "-" else open(source, "r", encoding="utf-8")
+    try:
+        for line_number, line in enumerate(stream, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                if line_number == 1 and line == "{":
+                    # A single pretty-printed parseResumeFile.py result
+                    record = json.loads(line + stream.read())
+                else:
+                    print(f"WARNING: Skipping line {line_number}: {e}", file=sys.stderr)
+                    continue
+            resume = _unwrap_record(record)
+            if resume is not None:
+                yield resume
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+class ResumeIndex:
+    """A directory of immutable BM25 segments plus a shared vocabulary."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.manifest = json.loads((self.path / "index.json").read_text(encoding="utf-8"))
+        if self.manifest.get("version") not in READABLE_VERSIONS:
+            raise ValueError(f"Unsupported index version in {self.path}: {self.manifest.get('version')}")
+        vocab_file = self.manifest.get("vocabFile", "vocab.json")
+        self.vocab = json.loads((self.path / vocab_file).read_text(encoding="utf-8"))
+        self.df = np.load(self.path / self.manifest.get("dfFile", "df.npy"), mmap_mode="r")
+        self._segments = None
+        self._docs = None
+        self._matcher = None
+
+    @classmethod
+    def create(cls, path: str | Path, force: bool = False) -> "ResumeIndex":
+        path = Path(path)
+        if (path / "index.json").exists():
+            if not force:
+                raise ValueError(f"Index already exists at {path} (use --force to replace it)")
+            shutil.rmtree(path)
+        path.mkdir(parents=True, exist_ok=True)
+        (path / "docs.jsonl").write_text("", encoding="utf-8")
+        write_json_atomic(path / "vocab-000000.json", {})
+        save_npy_atomic(path / "df-000000.npy", np.zeros(0, dtype=np.int64))
+        write_json_atomic(
+            path / "index.json",
+            {
+                "version": INDEX_VERSION,
+                "k1": DEFAULT_K1,
+                "b": DEFAULT_B,
+                "fieldWeights": FIELD_WEIGHTS,
+                "generation": 0,
+                "vocabFile": "vocab-000000.json",
+                "dfFile": "df-000000.npy",
+                "numDocs": 0,
+                "totalLength": 0.0,
+                "segments": [],
+            },
+        )
+        return cls(path)
+
+    @property
+    def matcher(self) -> SkillMatcher:
+        if self._matcher is None:
+            self._matcher = SkillMatcher.from_file()
+        return self._matcher
+
+    def weighted_terms(self, fields: dict[str, str]) -> Counter:
+        """Field-weighted term frequencies (BM25F-style) for one document or query."""
+        weights = self.manifest["fieldWeights"]
+        terms = Counter()
+        for field, text in fields.items():
+            weight = weights.get(field, 1.0)
+            for token in tokenize(text):
+                terms[token] += weight
+        skill_weight = weights.get("skillIds", 1.0)
+        for _, _, skill_index in self.matcher.find("\n".join(fields.values())):
+            terms["skill:" + self.matcher.skill_ids[skill_index]] += skill_weight
+        return terms
+
+    # ------------------------------------------------------------------ writes
+
+    def _committed_files(self) -> set[str]:
+        return {
+            "index.json",
+            "docs.jsonl",
+            self.manifest.get("vocabFile", "vocab.json"),
+            self.manifest.get("dfFile", "df.npy"),
+            *(entry["name"] for entry in self.manifest["segments"]),
+        }
+
+    def remove_orphans(self):
+        """Delete segments, vocab/df files and temp files not named by index.json.
+
+        These are left behind by an add that crashed before its commit.
+        """
+        committed = self._committed_files()
+        for entry in self.path.iterdir():
+            if entry.name in committed:
+                continue
+            if not entry.name.startswith(ORPHAN_PREFIXES):
+                continue
+            if entry.is_dir():
+                shutil.rmtree(entry)
+            else:
+                entry.unlink()
+
+    def add(self, resumes) -> int:
+        """Index resumes as one new segment; returns the number of documents added.
+
+        Resumes whose path or content is already in the index (or earlier in
+        the same batch) are skipped.
+        """
+        self.remove_orphans()
+        num_docs = self.manifest["numDocs"]
+        generation = self.manifest.get("generation", 0) + 1
+        vocab = dict(self.vocab)
+        postings: dict[int, list[tuple[int, float]]] = {}
+        doc_lengths = []
+        doc_lines = []
+        known_paths = {doc["path"] for doc in self.docs if doc.get("path")}
+        known_hashes = {doc["hash"] for doc in self.docs if doc.get("hash")}
+        skipped = 0
+
+        for resume in resumes:
+            path = resume.get("path", "")
+            digest = content_hash(resume)
+            if digest in known_hashes or (path and path in known_paths):
+                skipped += 1
+                continue
+            known_hashes.add(digest)
+            if path:
+                known_paths.add(path)
+
+            local_id = len(doc_lengths)
+            terms = self.weighted_terms(resume_fields(resume))
+            for term, tf in terms.items():
+                term_id = vocab.setdefault(term, len(vocab))
+                postings.setdefault(term_id, []).append((local_id, tf))
+            doc_lengths.append(sum(terms.values()))
+            info = resume.get("personalInfo") or {}
+            name = " ".join(p for p in (info.get("firstName"), info.get("middleName"), info.get("lastName")) if p)
+            doc_lines.append(
+                json.dumps(
+                    {
+                        "doc": num_docs + local_id,
+                        "path": path,
+                        "filename": resume.get("filename", ""),
+                        "name": name,
+                        "email": info.get("email", ""),
+                        "hash": digest,
+                    },
+                    ensure_ascii=False,
+                )
+            )
+
+        if skipped:
+            print(f"Skipped {skipped} resume(s) already in the index", file=sys.stderr)
+        if not doc_lengths:
+            return 0
+
+        term_ids = np.array(sorted(postings), dtype=np.int32)
+        term_ptr = np.zeros(len(term_ids) + 1, dtype=np.int64)
+        doc_ids = []
+        tfs = []
+        for i, term_id in enumerate(term_ids):
+            entries = postings[int(term_id)]
+            term_ptr[i + 1] = term_ptr[i] + len(entries)
+            doc_ids.extend(doc for doc, _ in entries)
+            tfs.extend(tf for _, tf in entries)
+
+        # A random suffix keeps the name unique even next to a crashed add's leftovers
+        segment_name = f"seg-{generation:06d}-{secrets.token_hex(4)}"
+        staging = Path(tempfile.mkdtemp(dir=self.path, prefix=f".{segment_name}."))
+        np.save(staging / "terms.npy", term_ids)
+        np.save(staging / "term_ptr.npy", term_ptr)
+        np.save(staging / "doc_ids.npy", np.array(doc_ids, dtype=np.int32))
+        np.save(staging / "tf.npy", np.array(tfs, dtype=np.float32))
+        np.save(staging / "doclen.npy", np.array(doc_lengths, dtype=np.float32))
+        os.replace(staging, self.path / segment_name)
+
+        df = np.zeros(len(vocab), dtype=np.int64)
+        df[: len(self.df)] = self.df
+        np.add.at(df, term_ids, np.diff(term_ptr))
+
+        # docs.jsonl may hold lines from an add that crashed before the manifest
+        # was written; keep only the committed ones before appending
+        docs_path = self.path / "docs.jsonl"
+        with open(docs_path, "r+", encoding="utf-8") as f:
+            for _ in range(num_docs):
+                f.readline()
+            # Read-ahead leaves the file position at EOF; write from the truncation point
+            f.seek(f.tell())
+            f.truncate()
+            f.write("\n".join(doc_lines) + "\n")
+
+        vocab_file = f"vocab-{generation:06d}.json"
+        df_file = f"df-{generation:06d}.npy"
+        write_json_atomic(self.path / vocab_file, vocab)
+        save_npy_atomic(self.path / df_file, df)
+        manifest = dict(self.manifest)
+        manifest.update(version=INDEX_VERSION, generation=generation, vocabFile=vocab_file, dfFile=df_file)
+        manifest["segments"] = [*self.manifest["segments"], {"name": segment_name, "base": num_docs, "size": len(doc_lengths)}]
+        manifest["numDocs"] = num_docs + len(doc_lengths)
+        manifest["totalLength"] = self.manifest["totalLength"] + float(sum(doc_lengths))
+        # Commit point: until this rename the previous manifest (and its files) stays current
+        write_json_atomic(self.path / "index.json", manifest)
+
+        previous = self._committed_files()
+        self.manifest = manifest
+        self.vocab = vocab
+        self.df = df
+        self._segments = None
+        self._docs = None
+        for name in previous - self._committed_files():
+            (self.path / name).unlink(missing_ok=True)
+        return len(doc_lengths)
+
+    # ------------------------------------------------------------------- reads
+
+    @property
+    def segments(self) -> list[dict]:
+        if self._segments is None:
+            self._segments = []
+            for entry in self.manifest["segments"]:
+                directory = self.path / entry["name"]
+                segment = {"base": entry["base"]}
+                for name in ("terms", "term_ptr", "doc_ids", "tf", "doclen"):
+                    segment[name] = np.load(directory / f"{name}.npy", mmap_mode="r")
+                self._segments.append(segment)
+        return self._segments
+
+    @property
+    def docs(self) -> list[dict]:
+        if self._docs is None:
+            with open(self.path / "docs.jsonl", "r", encoding="utf-8") as f:
+                self._docs = [json.loads(f.readline()) for _ in range(self.manifest["numDocs"])]
+        return self._docs
+
+    def search(self, text: str, top_k: int = 10) -> list[dict]:
+        """Top-k documents by BM25 score against free text (e.g. a job posting)."""
+        num_docs = self.manifest["numDocs"]
+        if not num_docs:
+            return []
+        query = self.weighted_terms({"summary": text})
+        term_ids = [self.vocab[t] for t in query if t in self.vocab]
+        if not term_ids:
+            return []
+
+        k1, b = self.manifest["k1"], self.manifest["b"]
+        avgdl = self.manifest["totalLength"] / num_docs
+        df = np.asarray(self.df[term_ids], dtype=np.float64)
+        idf = np.log1p((num_docs - df + 0.5) / (df + 0.5))
+        query_ids = np.array(term_ids, dtype=np.int32)
+
+        scores = np.zeros(num_docs, dtype=np.float64)
+        for segment in self.segments:
+            positions = np.searchsorted(segment["terms"], query_ids)
+            positions = np.minimum(positions, len(segment["terms"]) - 1)
+            present = segment["terms"][positions] == query_ids
+            norm = k1 * (1 - b + b * np.asarray(segment["doclen"]) / avgdl)
+            local = np.zeros(len(segment["doclen"]), dtype=np.float64)
+            for position, weight in zip(positions[present], idf[present]):
+                start, stop = segment["term_ptr"][position], segment["term_ptr"][position + 1]
+                docs = segment["doc_ids"][start:stop]
+                tf = segment["tf"][start:stop]
+                local[docs] += weight * tf * (k1 + 1) / (tf + norm[docs])
+            scores[segment["base"]: segment["base"] + len(local)] = local
+
+        top_k = min(top_k, num_docs)
+        candidates = np.argpartition(-scores, top_k - 1)[:top_k]
+        ranked = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [
+            {**self.docs[int(doc)], "score": round(float(scores[doc]), 4)}
+            for doc in ranked
+            if scores[doc] > 0
+        ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local BM25 index over parsed resumes")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = commands.add_parser("build", help="Create a new index from parsed resumes")
+    build_parser.add_argument("input", help="parseResumeFile.py output (batch NDJSON or JSON), or - for stdin")
+    build_parser.add_argument("--index", required=True, help="Index directory")
+    build_parser.add_argument("--force", action="store_true", help="Replace an existing index")
+
+    add_parser = commands.add_parser("add", help="Add parsed resumes to an existing index as a new segment")
+    add_parser.add_argument("input", help="parseResumeFile.py output (batch NDJSON or JSON), or - for stdin")
+    add_parser.add_argument("--index", required=True, help="Index directory")
+
+    query_parser = commands.add_parser("query", help="Find the best-matching resumes for a posting")
+    query_parser.add_argument("--index", required=True, help="Index directory")
+    query_group = query_parser.add_mutually_exclusive_group(required=True)
+    query_group.add_argument("--query", help="Query text (e.g. a job description)")
+    query_group.add_argument("--query-file", help="File containing the query text")
+    query_parser.add_argument("--top", type=int, default=10, help="Number of results (default: 10)")
+
+    args = parser.parse_args()
+
+    try:
+        if args.command in ("build", "add"):
+            if args.command == "build":
+                index = ResumeIndex.create(args.index, force=args.force)
+            else:
+                index = ResumeIndex(args.index)
+            start = time.time()
+            added = index.add(iter_resumes(args.input))
+            print(
+                f"Indexed {added} resume(s) in {time.time() - start:.2f}s "
+                f"({index.manifest['numDocs']} total, {len(index.manifest['segments'])} segment(s), "
+                f"{len(index.vocab)} terms)",
+                file=sys.stderr,
+            )
+            return 0
+
+        index = ResumeIndex(args.index)
+        if args.query_file:
+            with open(args.query_file, "r", encoding="utf-8") as f:
+                query_text = f.read()
+        else:
+            query_text = args.query
+        start = time.perf_counter()
+        results = index.search(query_text, args.top)
+        print(f"Query took {(time.perf_counter() - start) * 1000:.1f} ms", file=sys.stderr)
+        for result in results:
+            print(json.dumps(result, ensure_ascii=False))
+        return 0
+    except (OSError, ValueError) as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,16 +6,44 @@ Standalone Python script to scrape the San Antonio procurement table.
 Can be run independently or integrated into other systems.
 
 Usage:
-    python san_antonio_scraper.py [--max-pages N] [--output FILE]
+    python san_antonio_scraper.py [--max-pages N] [--output FILE] [--format json|ndjson]
+
+With --format ndjson each opportunity is appended to the output file as one JSON
+line as soon as it is parsed, and a <output>.manifest.json summary is written
+atomically when the crawl finishes.
+
+Long-lived service mode (keeps a pool of warm Chrome drivers between requests):
+    python san_antonio_scraper.py --serve [--pool-size N] [--port PORT]
+
+    Without --port, JSON-RPC 2.0 requests are read one per line from stdin and
+    responses are written one per line to stdout. With --port, the same requests
+    are accepted as HTTP POST bodies on 127.0.0.1:PORT.
+
+    {"jsonrpc": "2.0", "id": 1, "method": "scrape", "params": {"url": "...", "maxPages": 3}}
 """
 
 import argparse
+import contextlib
 import json
+import os
+import queue
+import re
+import sys
+import threading
 import time
-from datetime import datetime
-from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Callable, List, Dict, Optional
 from urllib.parse import urljoin, urlparse
 
+try:
+    from zoneinfo import ZoneInfo
+    SITE_TIMEZONE = ZoneInfo("America/Chicago")
+except Exception:
+    SITE_TIMEZONE = timezone.utc
+
 try:
     from selenium import webdriver
     from selenium.webdriver.common.by import By
@@ -25,7 +53,7 @@ try:
     SELENIUM_AVAILABLE = True
 except ImportError:
     SELENIUM_AVAILABLE = False
-    print("Warning: selenium not installed. Install with: pip install selenium")
+    print("Warning: selenium not installed. Install with: pip install selenium", file=sys.stderr)
 
 try:
     import requests
@@ -33,72 +61,287 @@ try:
     REQUESTS_AVAILABLE = True
 except ImportError:
     REQUESTS_AVAILABLE = False
-    print("Warning: requests/beautifulsoup4 not installed. Install with: pip install requests beautifulsoup4")
+    print("Warning: requests/beautifulsoup4 not installed. Install with: pip install requests beautifulsoup4", file=sys.stderr)
+
+
+DEFAULT_URL = "https://webapp1.sanantonio.gov/BidContractOpps/Default.aspx"
+
+# The GridView that holds the opportunities (falls back to any table)
+GRID_TABLE_SELECTOR = 'table[id*="gvBidContractOpps"], table.GridView, table'
+
+# Explicit wait budget (seconds) for the grid to render or be replaced
+PAGE_WAIT_TIMEOUT = 10
+
+BID_NUMBER_PATTERN = re.compile(r'^(\d+)')
+
+# Date columns normalized into <field>Iso / <field>Epoch companions
+DATE_FIELDS = ("releaseDate", "blackoutStartDate", "solicitationDeadline")
+DATE_FORMATS = (
+    "%m/%d/%Y",
+    "%m/%d/%Y %I:%M %p",
+    "%m/%d/%Y %I:%M:%S %p",
+    "%m/%d/%Y %H:%M",
+    "%m/%d/%y",
+    "%Y-%m-%d",
+)
+
+
+@lru_cache(maxsize=4096)
+def parse_site_date(value: str) -> Optional[datetime]:
+    """Parse a date cell (site local time) once; returns None for N/A or unknown formats."""
+    value = " ".join(value.split())
+    if not value:
+        return None
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).replace(tzinfo=SITE_TIMEZONE)
+        except ValueError:
+            continue
+    return None
+
+
+def normalize_dates(opportunity: Dict) -> Dict:
+    """Add ISO-8601 and epoch-second companions for each date column."""
+    for field in DATE_FIELDS:
+        parsed = parse_site_date(opportunity.get(field) or "")
+        opportunity[f"{field}Iso"] = parsed.isoformat() if parsed else None
+        opportunity[f"{field}Epoch"] = int(parsed.timestamp()) if parsed else None
+    return opportunity
+
+
+def write_json_atomic(path: str, data: Dict):
+    """Write JSON to a temp file next to path, then rename it into place."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class NdjsonOpportunityWriter:
+    """Streams opportunities as NDJSON and finishes with an atomic manifest."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.manifest_path = f"{path}.manifest.json"
+        self.count = 0
+        self._lock = threading.Lock()
+        self._owns_file = path != '-'
+        self._file = open(path, 'w', encoding='utf-8') if self._owns_file else sys.stdout
+
+    def write(self, opportunity: Dict):
+        line = json.dumps(opportunity, ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+            self.count += 1
+
+    def close(self, url: str, duration: float, complete: bool = True) -> Optional[str]:
+        """Close the stream and write the manifest; returns the manifest path."""
+        if not self._owns_file:
+            return None
+        os.fsync(self._file.fileno())
+        self._file.close()
+        write_json_atomic(self.manifest_path, {
+            "scrapeDate": datetime.now().isoformat(),
+            "url": url,
+            "totalOpportunities": self.count,
+            "duration": duration,
+            "complete": complete,
+            "recordsFile": os.path.basename(self.path),
+            "format": "ndjson",
+        })
+        return self.manifest_path
+
+
+def create_chrome_driver():
+    """Create a headless Chrome driver tuned for fast table scraping."""
+    if not SELENIUM_AVAILABLE:
+        raise ImportError("selenium is required for this method")
+
+    options = webdriver.ChromeOptions()
+    options.add_argument('--headless')  # Run in background
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--blink-settings=imagesEnabled=false')
+    # Return from driver.get() once the DOM is ready; the grid wait does the rest
+    options.page_load_strategy = 'eager'
+
+    return webdriver.Chrome(options=options)
+
+
+class ChromeDriverPool:
+    """Pool of reusable Chrome drivers so requests don't pay browser startup."""
+
+    def __init__(self, size: int = 2):
+        self.size = max(1, size)
+        self._idle: "queue.Queue" = queue.Queue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def warm(self):
+        """Start every driver up front (in parallel) so the first request is fast."""
+        with self._lock:
+            missing = self.size - self._created
+            self._created += missing
+
+        def start_one(_):
+            try:
+                self._idle.put(create_chrome_driver())
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+
+        if missing > 0:
+            with ThreadPoolExecutor(max_workers=missing) as executor:
+                list(executor.map(start_one, range(missing)))
+
+    @contextlib.contextmanager
+    def driver(self, timeout: Optional[float] = None):
+        """Borrow a driver; it is returned to the pool unless it broke mid-use."""
+        if self._closed:
+            raise RuntimeError("driver pool is closed")
+
+        driver = None
+        try:
+            driver = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_create = self._created < self.size
+                if can_create:
+                    self._created += 1
+            if can_create:
+                try:
+                    driver = create_chrome_driver()
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+            else:
+                driver = self._idle.get(timeout=timeout)
+
+        healthy = False
+        try:
+            yield driver
+            healthy = True
+        finally:
+            if healthy and not self._closed:
+                try:
+                    driver.delete_all_cookies()
+                    self._idle.put(driver)
+                    driver = None
+                except Exception:
+                    pass
+            if driver is not None:
+                with self._lock:
+                    self._created -= 1
+                with contextlib.suppress(Exception):
+                    driver.quit()
+
+    def close(self):
+        """Quit every idle driver."""
+        self._closed = True
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            with contextlib.suppress(Exception):
+                driver.quit()
 
 
 class SanAntonioScraper:
     """Scraper for San Antonio bidding and contract opportunities"""
     
-    def __init__(self, url: str = "https://webapp1.sanantonio.gov/BidContractOpps/Default.aspx"):
+    def __init__(self, url: str = DEFAULT_URL,
+                 on_opportunity: Optional[Callable[[Dict], None]] = None,
+                 keep_results: bool = True):
         self.url = url
         self.base_url = f"{urlparse(url).scheme}://{urlparse(url).netloc}"
         self.opportunities: List[Dict] = []
+        # Streaming callers get each record as it is parsed and may skip buffering
+        self.on_opportunity = on_opportunity
+        self.keep_results = keep_results
+
+    def _emit(self, opportunity: Dict) -> Dict:
+        """Normalize a parsed row and hand it to the streaming callback."""
+        normalize_dates(opportunity)
+        if self.on_opportunity is not None:
+            self.on_opportunity(opportunity)
+        return opportunity
+
+    def _record(self, opportunities: List[Dict]):
+        if self.keep_results:
+            self.opportunities.extend(opportunities)
     
-    def scrape_with_selenium(self, max_pages: int = 10) -> List[Dict]:
-        """Scrape using Selenium (handles JavaScript-rendered content)"""
+    def scrape_with_selenium(self, max_pages: int = 10,
+                             driver_pool: Optional[ChromeDriverPool] = None) -> List[Dict]:
+        """Scrape using Selenium (handles JavaScript-rendered content)
+
+        When a driver pool is given the browser is borrowed from it and kept
+        alive afterwards; otherwise a one-off driver is started and quit.
+        """
         if not SELENIUM_AVAILABLE:
             raise ImportError("selenium is required for this method")
-        
-        options = webdriver.ChromeOptions()
-        options.add_argument('--headless')  # Run in background
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        
-        driver = webdriver.Chrome(options=options)
-        
+
+        if driver_pool is not None:
+            with driver_pool.driver() as driver:
+                return self._scrape_pages_selenium(driver, max_pages)
+
+        driver = create_chrome_driver()
         try:
-            driver.get(self.url)
-            time.sleep(3)  # Wait for page load
-            
-            page = 1
-            while page <= max_pages:
-                print(f"Scraping page {page}...")
-                
-                # Find the table
-                try:
-                    table = WebDriverWait(driver, 10).until(
-                        EC.presence_of_element_located((By.TAG_NAME, "table"))
-                    )
-                except TimeoutException:
-                    print("Table not found, stopping.")
-                    break
-                
-                # Extract opportunities from current page
-                opportunities = self._extract_table_data_selenium(driver)
-                self.opportunities.extend(opportunities)
-                print(f"Found {len(opportunities)} opportunities on page {page}")
-                
-                # Try to go to next page
-                if not self._go_to_next_page_selenium(driver):
-                    print("No more pages found.")
-                    break
-                
-                page += 1
-                time.sleep(2)  # Wait for next page to load
-            
-            return self.opportunities
-            
+            return self._scrape_pages_selenium(driver, max_pages)
         finally:
             driver.quit()
-    
+
+    def _scrape_pages_selenium(self, driver, max_pages: int) -> List[Dict]:
+        """Walk the grid pages with an already running driver."""
+        driver.get(self.url)
+
+        page = 1
+        while page <= max_pages:
+            print(f"Scraping page {page}...")
+
+            # Find the table
+            try:
+                table = WebDriverWait(driver, PAGE_WAIT_TIMEOUT).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, GRID_TABLE_SELECTOR))
+                )
+            except TimeoutException:
+                print("Table not found, stopping.")
+                break
+
+            # Extract opportunities from current page
+            opportunities = self._extract_table_data_selenium(driver)
+            self._record(opportunities)
+            print(f"Found {len(opportunities)} opportunities on page {page}")
+
+            # Try to go to next page
+            if not self._go_to_next_page_selenium(driver):
+                print("No more pages found.")
+                break
+
+            # The postback replaces the grid; wait for the old one to go stale
+            try:
+                WebDriverWait(driver, PAGE_WAIT_TIMEOUT).until(EC.staleness_of(table))
+            except TimeoutException:
+                print("Next page did not load, stopping.")
+                break
+
+            page += 1
+
+        return self.opportunities
+
     def _extract_table_data_selenium(self, driver) -> List[Dict]:
         """Extract data from table using Selenium"""
         opportunities = []
         
         try:
             # Find the table (GridView)
-            table = driver.find_element(By.CSS_SELECTOR, 
-                'table[id*="gvBidContractOpps"], table.GridView, table')
+            table = driver.find_element(By.CSS_SELECTOR, GRID_TABLE_SELECTOR)
             
             # Get all rows (skip header)
             rows = table.find_elements(By.TAG_NAME, "tr")
@@ -123,8 +366,7 @@ class SanAntonioScraper:
                     # Extract bid number from description
                     bid_number = "UNKNOWN"
                     if description:
-                        import re
-                        match = re.match(r'^(\d+)', description)
+                        match = BID_NUMBER_PATTERN.match(description)
                         if match:
                             bid_number = match.group(1)
                     
@@ -144,7 +386,7 @@ class SanAntonioScraper:
                     deadline = cells[5].text.strip() if len(cells) > 5 else ""
                     
                     if description:
-                        opportunities.append({
+                        opportunities.append(self._emit({
                             "bidNumber": bid_number,
                             "description": description,
                             "detailUrl": detail_url,
@@ -153,7 +395,7 @@ class SanAntonioScraper:
                             "releaseDate": release_date,
                             "blackoutStartDate": blackout_start,
                             "solicitationDeadline": deadline,
-                        })
+                        }))
                 
                 except Exception as e:
                     print(f"Error parsing row: {e}")
@@ -227,7 +469,7 @@ class SanAntonioScraper:
                 
                 # Extract opportunities
                 opportunities = self._extract_table_data_soup(table)
-                self.opportunities.extend(opportunities)
+                self._record(opportunities)
                 print(f"Found {len(opportunities)} opportunities on page {page}")
                 
                 # Try to find next page link
@@ -273,9 +515,8 @@ class SanAntonioScraper:
                     detail_url = href if href.startswith('http') else urljoin(self.base_url, href)
                 
                 # Extract bid number
-                import re
                 bid_number = "UNKNOWN"
-                match = re.match(r'^(\d+)', description)
+                match = BID_NUMBER_PATTERN.match(description)
                 if match:
                     bid_number = match.group(1)
                 
@@ -287,7 +528,7 @@ class SanAntonioScraper:
                 deadline = cells[5].get_text(strip=True) if len(cells) > 5 else ""
                 
                 if description:
-                    opportunities.append({
+                    opportunities.append(self._emit({
                         "bidNumber": bid_number,
                         "description": description,
                         "detailUrl": detail_url,
@@ -296,7 +537,7 @@ class SanAntonioScraper:
                         "releaseDate": release_date,
                         "blackoutStartDate": blackout_start,
                         "solicitationDeadline": deadline,
-                    })
+                    }))
             
             except Exception as e:
                 print(f"Error parsing row: {e}")
@@ -326,13 +567,155 @@ class SanAntonioScraper:
         return None
 
 
+def build_result(url: str, opportunities: List[Dict], duration: float) -> Dict:
+    """Build the result document shared by the CLI output and the service."""
+    return {
+        "scrapeDate": datetime.now().isoformat(),
+        "url": url,
+        "totalOpportunities": len(opportunities),
+        "duration": duration,
+        "opportunities": opportunities,
+    }
+
+
+class ScraperService:
+    """JSON-RPC front end that serves scrape requests from a warm driver pool."""
+
+    def __init__(self, pool_size: int = 2):
+        self.pool = ChromeDriverPool(pool_size) if SELENIUM_AVAILABLE else None
+        self.shutdown_requested = threading.Event()
+
+    def start(self):
+        if self.pool is not None:
+            print(f"Warming {self.pool.size} Chrome driver(s)...", file=sys.stderr)
+            self.pool.warm()
+        print("Scraper service ready.", file=sys.stderr)
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+
+    def scrape(self, url: str = DEFAULT_URL, maxPages: int = 10,
+               method: Optional[str] = None) -> Dict:
+        method = method or ('selenium' if self.pool is not None else 'requests')
+        scraper = SanAntonioScraper(url)
+        start_time = time.time()
+        if method == 'selenium':
+            opportunities = scraper.scrape_with_selenium(maxPages, driver_pool=self.pool)
+        else:
+            opportunities = scraper.scrape_with_requests(maxPages)
+        return build_result(url, opportunities, time.time() - start_time)
+
+    def handle(self, request) -> Optional[Dict]:
+        """Dispatch one JSON-RPC request; returns None for notifications."""
+        request_id = request.get("id") if isinstance(request, dict) else None
+        try:
+            if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+                raise ValueError("Invalid request")
+            method = request["method"]
+            params = request.get("params") or {}
+            if method == "scrape":
+                result = self.scrape(**params)
+            elif method == "ping":
+                result = "pong"
+            elif method == "shutdown":
+                self.shutdown_requested.set()
+                result = "shutting down"
+            else:
+                return self._error(request_id, -32601, f"Method not found: {method}")
+        except TypeError as e:
+            return self._error(request_id, -32602, f"Invalid params: {e}")
+        except ValueError as e:
+            return self._error(request_id, -32600, str(e))
+        except Exception as e:
+            return self._error(request_id, -32000, str(e))
+
+        if request_id is None:
+            return None
+        return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+    @staticmethod
+    def _error(request_id, code: int, message: str) -> Dict:
+        return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+
+    def serve_stdio(self):
+        """Read newline-delimited requests from stdin; answer on stdout."""
+        rpc_out = sys.stdout
+        write_lock = threading.Lock()
+
+        def respond(response):
+            if response is None:
+                return
+            with write_lock:
+                rpc_out.write(json.dumps(response, ensure_ascii=False) + "\n")
+                rpc_out.flush()
+
+        workers = self.pool.size if self.pool is not None else 1
+        # Progress prints from the scraper must not corrupt the RPC stream
+        with contextlib.redirect_stdout(sys.stderr), \
+                ThreadPoolExecutor(max_workers=workers) as executor:
+            for line in sys.stdin:
+                if not line.strip():
+                    continue
+                try:
+                    request = json.loads(line)
+                except json.JSONDecodeError as e:
+                    respond(self._error(None, -32700, f"Parse error: {e}"))
+                    continue
+                if isinstance(request, dict) and request.get("method") == "shutdown":
+                    executor.shutdown(wait=True)
+                    respond(self.handle(request))
+                    break
+                executor.submit(lambda r=request: respond(self.handle(r)))
+
+    def serve_http(self, port: int):
+        """Accept the same JSON-RPC requests as HTTP POST bodies."""
+        service = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.rstrip('/') == '/health':
+                    self._send(200, {"status": "ok"})
+                else:
+                    self._send(404, {"error": "not found"})
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                try:
+                    request = json.loads(self.rfile.read(length) or b'null')
+                except json.JSONDecodeError as e:
+                    self._send(400, service._error(None, -32700, f"Parse error: {e}"))
+                    return
+                self._send(200, service.handle(request) or {})
+                if service.shutdown_requested.is_set():
+                    threading.Thread(target=self.server.shutdown, daemon=True).start()
+
+            def _send(self, status: int, body: Dict):
+                payload = json.dumps(body, ensure_ascii=False).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                print(f"[http] {format % args}", file=sys.stderr)
+
+        server = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+        print(f"Listening on http://127.0.0.1:{server.server_address[1]}", file=sys.stderr)
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Scrape San Antonio bidding and contract opportunities'
     )
     parser.add_argument(
         '--url',
-        default='https://webapp1.sanantonio.gov/BidContractOpps/Default.aspx',
+        default=DEFAULT_URL,
         help='URL to scrape'
     )
     parser.add_argument(
@@ -343,8 +726,14 @@ def main():
     )
     parser.add_argument(
         '--output',
-        default='san_antonio_opportunities.json',
-        help='Output JSON file'
+        help='Output file (default: san_antonio_opportunities.json, or .ndjson '
+             'with --format ndjson; "-" streams NDJSON to stdout)'
+    )
+    parser.add_argument(
+        '--format',
+        choices=['json', 'ndjson'],
+        default='json',
+        help='json writes one document at the end; ndjson streams one record per line'
     )
     parser.add_argument(
         '--method',
@@ -352,55 +741,94 @@ def main():
         default='selenium' if SELENIUM_AVAILABLE else 'requests',
         help='Scraping method to use'
     )
+    parser.add_argument(
+        '--serve',
+        action='store_true',
+        help='Run as a long-lived JSON-RPC service with a warm driver pool'
+    )
+    parser.add_argument(
+        '--pool-size',
+        type=int,
+        default=2,
+        help='Number of Chrome drivers kept warm in --serve mode'
+    )
+    parser.add_argument(
+        '--port',
+        type=int,
+        help='Serve JSON-RPC over HTTP on this port instead of stdin/stdout'
+    )
     
     args = parser.parse_args()
+
+    if args.serve:
+        service = ScraperService(args.pool_size)
+        try:
+            service.start()
+            if args.port is not None:
+                service.serve_http(args.port)
+            else:
+                service.serve_stdio()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            service.close()
+        return 0
     
-    scraper = SanAntonioScraper(args.url)
+    output = args.output or f"san_antonio_opportunities.{args.format}"
+    streaming = args.format == 'ndjson'
+    writer = NdjsonOpportunityWriter(output) if streaming else None
+    if output == '-':
+        # Keep stdout clean for the record stream
+        sys.stdout = sys.stderr
+
+    scraper = SanAntonioScraper(
+        args.url,
+        on_opportunity=writer.write if writer else None,
+        keep_results=not streaming,
+    )
     
     print(f"Starting scrape of {args.url}")
     print(f"Method: {args.method}")
     print(f"Max pages: {args.max_pages}")
     
     start_time = time.time()
+    complete = False
     
     try:
         if args.method == 'selenium':
             opportunities = scraper.scrape_with_selenium(args.max_pages)
         else:
             opportunities = scraper.scrape_with_requests(args.max_pages)
+        complete = True
         
         duration = time.time() - start_time
         
         # Save results
-        output_data = {
-            "scrapeDate": datetime.now().isoformat(),
-            "url": args.url,
-            "totalOpportunities": len(opportunities),
-            "duration": duration,
-            "opportunities": opportunities,
-        }
-        
-        with open(args.output, 'w', encoding='utf-8') as f:
-            json.dump(output_data, f, indent=2, ensure_ascii=False)
+        if writer:
+            total = writer.count
+        else:
+            total = len(opportunities)
+            write_json_atomic(output, build_result(args.url, opportunities, duration))
         
         print(f"\nScraping complete!")
-        print(f"Found {len(opportunities)} opportunities")
+        print(f"Found {total} opportunities")
         print(f"Duration: {duration:.2f} seconds")
-        print(f"Results saved to: {args.output}")
+        print(f"Results saved to: {output}")
         
     except Exception as e:
         print(f"Error during scraping: {e}")
         import traceback
         traceback.print_exc()
         return 1
+
+    finally:
+        if writer:
+            manifest_path = writer.close(args.url, time.time() - start_time, complete)
+            if manifest_path:
+                print(f"Manifest saved to: {manifest_path}")
     
     return 0
 
 
 if __name__ == '__main__':
     exit(main())
-
-
-
-
-
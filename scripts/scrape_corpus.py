@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+"""
+scrape_corpus.py
+Recorded-page corpus for benchmarking the scraping pipeline offline.
+
+capture  Visits each procurement link in Chromium with Playwright HAR recording
+         on and stores the complete HTTP archive per link (corpus/<key>.har.zip)
+         plus a manifest.json describing what was captured.
+bench    Replays every archive with route_from_har (nothing leaves the machine;
+         requests missing from the archive are aborted) and times each stage
+         of the pipeline per link:
+             navigate  page.goto(..., wait_until="domcontentloaded")
+             ready     network idle and the first <table> attached
+             extract   outerHTML of the largest table (what the selector returns)
+             parse     HTML table -> records, as scraper3 does it
+         Results can be saved and compared against a previous run.
+
+Usage:
+    python scripts/scrape_corpus.py capture [--links links.json | --url URL ...] [--corpus DIR] [--headed]
+    python scripts/scrape_corpus.py bench [--corpus DIR] [--repeat N] [--output run.json] [--baseline old.json]
+
+Links come from --links (get_approved_procurement_links.py JSON output or a
+plain list), --url, or procurementUrls:getApproved through convex_backend
+(so CONVEX_BACKEND=sqlite works too).
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import re
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+try:
+    from playwright.async_api import async_playwright
+except ImportError:
+    print("ERROR: playwright not installed. Run: pip install playwright && playwright install chromium")
+    sys.exit(1)
+
+try:
+    import pandas  # noqa: F401 - only to pick the table backend
+    TABLE_BACKEND = "pandas"
+except ImportError:
+    TABLE_BACKEND = "stdlib"
+
+try:
+    from dotenv import load_dotenv
+    DOTENV_AVAILABLE = True
+except ImportError:
+    DOTENV_AVAILABLE = False
+
+from convex_backend import create_client, offline_backend_enabled
+from table_parsing import html_table_to_records
+
+
+DEFAULT_CORPUS_DIR = Path("./scrape_corpus")
+MANIFEST_NAME = "manifest.json"
+STAGES = ("navigate", "ready", "extract", "parse")
+
+NAVIGATION_TIMEOUT_MS = 60000
+READY_TIMEOUT_MS = 15000
+
+# Same per-site wait strategies as scraper3.py
+LINK_WAIT_STRATEGIES = {
+    "opengov": "networkidle",
+}
+
+LARGEST_TABLE_JS = """
+() => {
+    let best = null;
+    for (const table of document.querySelectorAll('table')) {
+        if (!best || table.rows.length > best.rows.length) best = table;
+    }
+    return best ? best.outerHTML : null;
+}
+"""
+
+
+def get_wait_strategy(url):
+    url_lower = url.lower()
+    for pattern, strategy in LINK_WAIT_STRATEGIES.items():
+        if pattern in url_lower:
+            return strategy
+    return None
+
+
+def link_key(link):
+    """Stable file-system key for a link: state slug plus a hash of the URL."""
+    state = re.sub(r"[^a-z0-9]+", "-", (link.get("state") or "unknown").lower()).strip("-")
+    digest = hashlib.sha1(link["procurementLink"].encode("utf-8")).hexdigest()[:10]
+    return f"{state}-{digest}"
+
+
+def load_convex_url():
+    for env_path in (Path(".env.local"), Path(".env")):
+        if env_path.exists() and DOTENV_AVAILABLE:
+            load_dotenv(env_path)
+    return os.getenv("VITE_CONVEX_URL") or os.getenv("CONVEX_URL")
+
+
+def load_links(args):
+    if args.url:
+        return [{"procurementLink": url, "state": "Manual"} for url in args.url]
+    if args.links:
+        with open(args.links, "r", encoding="utf-8") as f:
+            loaded = json.load(f)
+        return loaded["links"] if isinstance(loaded, dict) else loaded
+    convex_url = load_convex_url()
+    if not convex_url and not offline_backend_enabled():
+        raise ValueError("CONVEX_URL not configured; pass --links or --url instead")
+    return create_client(convex_url).query("procurementUrls:getApproved", {})
+
+
+def load_manifest(corpus_dir):
+    path = corpus_dir / MANIFEST_NAME
+    if not path.exists():
+        return {"links": {}}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_manifest(corpus_dir, manifest):
+    path = corpus_dir / MANIFEST_NAME
+    tmp_path = path.with_suffix(".json.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def parse_table_html(html):
+    """Records from table HTML as scraper3 parses them (pandas when installed)."""
+    try:
+        return html_table_to_records(html, TABLE_BACKEND)
+    except ValueError:
+        return []
+
+
+# --- Capture -----------------------------------------------------------------
+
+async def capture_link(browser, link, har_path, settle_ms):
+    url = link["procurementLink"]
+    context = await browser.new_context(
+        record_har_path=str(har_path),
+        record_har_mode="full",
+        viewport={"width": 1920, "height": 1080},
+        locale="en-US",
+    )
+    try:
+        page = await context.new_page()
+        await page.goto(url, wait_until=get_wait_strategy(url) or "domcontentloaded",
+                        timeout=NAVIGATION_TIMEOUT_MS)
+        try:
+            await page.wait_for_load_state("networkidle", timeout=30000)
+        except Exception:
+            pass  # Continue even if networkidle times out
+        if settle_ms:
+            await page.wait_for_timeout(settle_ms)
+        return {
+            "finalUrl": page.url,
+            "title": await page.title(),
+            "tables": await page.locator("table").count(),
+        }
+    finally:
+        # The HAR is only written when the context closes
+        await context.close()
+
+
+async def run_capture(args):
+    corpus_dir = Path(args.corpus)
+    corpus_dir.mkdir(parents=True, exist_ok=True)
+    links = [link for link in load_links(args) if link.get("procurementLink")]
+    if args.limit:
+        links = links[: args.limit]
+    manifest = load_manifest(corpus_dir)
+    failures = 0
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=not args.headed)
+        for i, link in enumerate(links, 1):
+            key = link_key(link)
+            har_path = corpus_dir / f"{key}.har.zip"
+            # Only a manifest entry marks a finished capture; a failed one may leave a HAR behind
+            if key in manifest["links"] and har_path.exists() and not args.refresh:
+                print(f"[{i}/{len(links)}] {key}: already captured, skipping (--refresh to re-record)")
+                continue
+            print(f"[{i}/{len(links)}] {key}: {link['procurementLink']}")
+            start = time.perf_counter()
+            try:
+                info = await capture_link(browser, link, har_path, args.settle_ms)
+            except Exception as e:
+                failures += 1
+                print(f"   ⚠️  Capture failed: {e}")
+                # Closing the context wrote a HAR of the failed attempt; don't keep it
+                har_path.unlink(missing_ok=True)
+                if manifest["links"].pop(key, None) is not None:
+                    save_manifest(corpus_dir, manifest)
+                continue
+            manifest["links"][key] = {
+                "url": link["procurementLink"],
+                "state": link.get("state"),
+                "procurementUrlId": link.get("_id"),
+                "har": har_path.name,
+                "capturedAt": datetime.now(timezone.utc).isoformat(),
+                "captureSeconds": round(time.perf_counter() - start, 3),
+                "harBytes": har_path.stat().st_size,
+                **info,
+            }
+            save_manifest(corpus_dir, manifest)
+            print(f"   ✅ {info['tables']} table(s), {har_path.stat().st_size / 1024:.0f} KiB archive")
+        await browser.close()
+
+    print(f"\n{len(manifest['links'])} link(s) in corpus {corpus_dir} ({failures} capture failure(s))")
+    return 1 if failures and failures == len(links) else 0
+
+
+# --- Replay benchmark --------------------------------------------------------
+
+async def replay_link(browser, corpus_dir, entry):
+    """Replay one archived page and return per-stage seconds plus row count."""
+    context = await browser.new_context(viewport={"width": 1920, "height": 1080}, locale="en-US")
+    timings = {}
+    try:
+        await context.route_from_har(str(corpus_dir / entry["har"]), not_found="abort")
+        page = await context.new_page()
+
+        start = time.perf_counter()
+        await page.goto(entry["url"], wait_until="domcontentloaded", timeout=NAVIGATION_TIMEOUT_MS)
+        timings["navigate"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        try:
+            await page.wait_for_load_state("networkidle", timeout=READY_TIMEOUT_MS)
+            await page.wait_for_selector("table", state="attached", timeout=READY_TIMEOUT_MS)
+        except Exception:
+            pass  # Pages without tables still get extract/parse timings
+        timings["ready"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        html = await page.evaluate(LARGEST_TABLE_JS)
+        timings["extract"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        records = parse_table_html(html) if html else []
+        timings["parse"] = time.perf_counter() - start
+    finally:
+        await context.close()
+    return {"seconds": timings, "rows": len(records), "htmlBytes": len(html or "")}
+
+
+def positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def summarize(runs):
+    """Median per stage for each link, plus median/p95 across links."""
+    per_link = {}
+    for key, samples in runs.items():
+        ok = [s for s in samples if "error" not in s]
+        if not ok:
+            per_link[key] = {"error": samples[-1]["error"]}
+            continue
+        per_link[key] = {
+            "rows": ok[-1]["rows"],
+            "htmlBytes": ok[-1]["htmlBytes"],
+            **{stage: statistics.median(s["seconds"][stage] for s in ok) for stage in STAGES},
+        }
+        per_link[key]["total"] = sum(per_link[key][stage] for stage in STAGES)
+    overall = {}
+    for stage in STAGES + ("total",):
+        values = [r[stage] for r in per_link.values() if stage in r]
+        if values:
+            overall[stage] = {"median": statistics.median(values), "p95": percentile(values, 95), "sum": sum(values)}
+    return per_link, overall
+
+
+def baseline_deltas(per_link, baseline):
+    """Relative change of each stage's median, over links that succeeded in both runs."""
+    old_links = (baseline or {}).get("links", {})
+    shared = [key for key, r in per_link.items()
+              if "error" not in r and "error" not in old_links.get(key, {"error": None})]
+    deltas = {}
+    for stage in STAGES + ("total",):
+        old = statistics.median(old_links[key][stage] for key in shared) if shared else 0
+        if old:
+            new = statistics.median(per_link[key][stage] for key in shared)
+            deltas[stage] = (new - old) / old * 100
+    return len(shared), deltas
+
+
+def print_results(per_link, overall, baseline=None):
+    print(f"\n{'Link':<40} {'nav ms':>8} {'ready ms':>9} {'extract':>8} {'parse':>8} {'total':>8} {'rows':>6}")
+    for key, r in sorted(per_link.items()):
+        if "error" in r:
+            print(f"{key:<40} error: {r['error'][:60]}")
+            continue
+        print(f"{key:<40} {r['navigate'] * 1000:>8.1f} {r['ready'] * 1000:>9.1f} {r['extract'] * 1000:>8.1f} "
+              f"{r['parse'] * 1000:>8.1f} {r['total'] * 1000:>8.1f} {r['rows']:>6}")
+
+    shared, deltas = baseline_deltas(per_link, baseline) if baseline else (0, {})
+    print(f"\n{'Stage':<10} {'median ms':>10} {'p95 ms':>9} {'sum ms':>10}"
+          + (f"  vs baseline (median, {shared} shared link(s))" if baseline else ""))
+    for stage, s in overall.items():
+        line = f"{stage:<10} {s['median'] * 1000:>10.1f} {s['p95'] * 1000:>9.1f} {s['sum'] * 1000:>10.1f}"
+        if stage in deltas:
+            line += f"  {deltas[stage]:>+7.1f}%"
+        print(line)
+
+
+async def run_bench(args):
+    corpus_dir = Path(args.corpus)
+    entries = load_manifest(corpus_dir)["links"]
+    if args.only:
+        entries = {k: v for k, v in entries.items() if any(pattern in k for pattern in args.only)}
+    if not entries:
+        print(f"ERROR: No captured links in {corpus_dir}. Run the capture command first.", file=sys.stderr)
+        return 1
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    runs = {key: [] for key in entries}
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        for key, entry in entries.items():
+            # One untimed pass warms the browser cache and JIT the same way for every run
+            for attempt in range(args.repeat + 1):
+                try:
+                    result = await replay_link(browser, corpus_dir, entry)
+                except Exception as e:
+                    result = {"error": str(e)}
+                if attempt:
+                    runs[key].append(result)
+        await browser.close()
+
+    per_link, overall = summarize(runs)
+    print_results(per_link, overall, baseline)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({
+                "ranAt": datetime.now(timezone.utc).isoformat(),
+                "repeat": args.repeat,
+                "parser": TABLE_BACKEND,
+                "links": per_link,
+                "overall": overall,
+            }, f, indent=2)
+        print(f"\n💾 Results saved to: {args.output}")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Capture and replay procurement pages for offline benchmarking")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    capture = subparsers.add_parser("capture", help="Record HTTP archives for procurement links")
+    capture.add_argument("--corpus", default=str(DEFAULT_CORPUS_DIR), help=f"Corpus directory (default: {DEFAULT_CORPUS_DIR})")
+    source = capture.add_mutually_exclusive_group()
+    source.add_argument("--links", help="JSON file of links (default: procurementUrls:getApproved)")
+    source.add_argument("--url", action="append", help="Capture this URL (repeatable)")
+    capture.add_argument("--limit", type=int, default=0, help="Capture at most N links")
+    capture.add_argument("--refresh", action="store_true", help="Re-record links that are already captured")
+    capture.add_argument("--settle-ms", type=int, default=3000,
+                         help="Extra wait after network idle so late XHRs are recorded (default: 3000)")
+    capture.add_argument("--headed", action="store_true", help="Show the browser (e.g. to clear a CAPTCHA)")
+
+    bench = subparsers.add_parser("bench", help="Replay the corpus and time each pipeline stage")
+    bench.add_argument("--corpus", default=str(DEFAULT_CORPUS_DIR), help=f"Corpus directory (default: {DEFAULT_CORPUS_DIR})")
+    bench.add_argument("--repeat", type=positive_int, default=3, help="Timed replays per link (default: 3)")
+    bench.add_argument("--only", action="append", help="Only links whose key contains this text (repeatable)")
+    bench.add_argument("--output", help="Write results JSON here")
+    bench.add_argument("--baseline", help="Results JSON from a previous run to compare against")
+
+    args = parser.parse_args()
+    try:
+        if args.command == "capture":
+            return asyncio.run(run_capture(args))
+        return asyncio.run(run_bench(args))
+    except (OSError, ValueError) as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,503 @@
+#!/usr/bin/env python3
+"""
+scrape_metrics.py
+Counters, gauges and histograms for long scrape sweeps, served as Prometheus
+text on a local HTTP endpoint and shown as a live terminal dashboard.
+
+The HTTP server runs in a daemon thread and process/browser RSS is only
+sampled when the endpoint is scraped, so the scraper's event loop never waits
+on metrics. Stage latencies come from the spans in scrape_tracing.py; the
+scraper only counts what spans cannot see (rows captured, upload results).
+
+In a scraper:
+
+    import scrape_metrics
+    scrape_metrics.start_from_env()        # no-op unless SCRAPE_METRICS_PORT is set
+    scrape_metrics.set_sweep_size(len(links))
+    ...
+    scrape_metrics.print_progress()        # one status line after each link
+
+Dashboard (in a second terminal, while the scraper runs):
+
+    python scripts/scrape_metrics.py watch [--url http://127.0.0.1:9464/metrics] [--interval 2]
+
+Environment:
+    SCRAPE_METRICS_PORT   Serve /metrics on this port (enables metrics)
+    SCRAPE_METRICS_HOST   Bind address (default: 127.0.0.1)
+
+Browser RSS needs psutil (pip install psutil); without it only the scraper's
+own peak RSS is reported, via the resource module.
+"""
+
+import argparse
+import bisect
+import math
+import os
+import re
+import sys
+import threading
+import time
+import urllib.request
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:  # Windows
+    RESOURCE_AVAILABLE = False
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 9464
+# Stages range from millisecond DOM checks to operator prompts measured in minutes
+LATENCY_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _label_text(labelnames, key):
+    if not labelnames:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(labelnames, key)) + "}"
+
+
+def _number(value):
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def header(self):
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self.values = defaultdict(float)
+
+    def inc(self, amount=1, **labels):
+        with self.lock:
+            self.values[self._key(labels)] += amount
+
+    def value(self, **labels):
+        with self.lock:
+            return self.values.get(self._key(labels), 0.0)
+
+    def total(self):
+        with self.lock:
+            return sum(self.values.values())
+
+    def render(self):
+        with self.lock:
+            items = sorted(self.values.items())
+        return self.header() + [f"{self.name}{_label_text(self.labelnames, k)} {_number(v)}" for k, v in items]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        with self.lock:
+            self.values[self._key(labels)] = value
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self.series = {}  # key -> [bucket counts..., +Inf count], sum
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            counts, total = self.series.get(key, ([0] * (len(self.buckets) + 1), 0.0))
+            counts[index] += 1
+            self.series[key] = (counts, total + value)
+
+    def render(self):
+        with self.lock:
+            items = sorted((k, (list(c), s)) for k, (c, s) in self.series.items())
+        lines = self.header()
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                labels = _label_text(self.labelnames + ("le",), key + (_number(bound),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _label_text(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_number(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Registry:
+    """Metrics plus collectors that refresh gauges right before each render."""
+
+    def __init__(self):
+        self.metrics = []
+        self.collectors = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self):
+        for collect in self.collectors:
+            try:
+                collect()
+            except Exception as e:
+                print(f"⚠️  Metrics collector failed: {e}", file=sys.stderr)
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+SWEEP_START = REGISTRY.gauge("scrape_sweep_start_time_seconds", "Unix time the sweep started.")
+SWEEP_LINKS = REGISTRY.gauge("scrape_sweep_links", "Links loaded for this sweep.")
+LINKS = REGISTRY.counter("scrape_links_total", "Links finished, by outcome (saved, skipped, error).", ["outcome"])
+LINK_SECONDS = REGISTRY.histogram("scrape_link_duration_seconds", "Wall time per link, operator time included.")
+STAGE_SECONDS = REGISTRY.histogram("scrape_stage_duration_seconds", "Wall time per pipeline stage.", ["stage"])
+STAGE_ERRORS = REGISTRY.counter("scrape_stage_errors_total", "Stages that raised, by stage.", ["stage"])
+ROWS = REGISTRY.counter("scrape_rows_captured_total", "Table rows parsed and sent for upload.")
+UPLOADS = REGISTRY.counter("scrape_uploads_total", "procurementData:create calls, by result (ok, failed).", ["result"])
+UPLOADS_IN_FLIGHT = REGISTRY.gauge("scrape_uploads_in_flight",
+                                   "Upload backlog: captures queued or uploading on the upload thread.")
+VERIFICATION_WALLS = REGISTRY.counter("scrape_verification_walls_total",
+                                      "Pages that showed a CAPTCHA or verification wall, by kind.", ["kind"])
+PARSES = REGISTRY.counter("scrape_parses_total", "Captured tables run through the parser.")
+AI_FALLBACKS = REGISTRY.counter("scrape_ai_fallbacks_total",
+                                "Automatic parses that fell back to the AI agent (manual-paste retries excluded).")
+PROCESS_RSS = REGISTRY.gauge("scrape_process_rss_bytes",
+                             "Scraper process RSS (peak RSS when psutil is not installed).")
+BROWSER_RSS = REGISTRY.gauge("scrape_browser_rss_bytes",
+                             "Summed RSS of the scraper's child processes (browser); needs psutil.")
+
+
+def process_rss():
+    """Current RSS of this process, or its peak RSS when psutil is missing."""
+    if PSUTIL_AVAILABLE:
+        return psutil.Process().memory_info().rss
+    if RESOURCE_AVAILABLE:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024  # kilobytes on Linux
+    return None
+
+
+def browser_rss():
+    """Summed RSS of every child process (Playwright driver and browser), or None without psutil."""
+    if not PSUTIL_AVAILABLE:
+        return None
+    total = 0
+    for child in psutil.Process().children(recursive=True):
+        try:
+            total += child.memory_info().rss
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+    return total
+
+
+def _collect_rss():
+    rss = process_rss()
+    if rss is not None:
+        PROCESS_RSS.set(rss)
+    rss = browser_rss()
+    if rss is not None:
+        BROWSER_RSS.set(rss)
+
+
+REGISTRY.collectors.append(_collect_rss)
+
+
+def record_span(finished):
+    """scrape_tracing listener: turn finished spans into link and stage metrics."""
+    if finished.name == "link":
+        outcome = "error" if finished.status == "error" else finished.attributes.get("outcome", "skipped")
+        LINKS.inc(outcome=outcome)
+        LINK_SECONDS.observe(finished.duration)
+        return
+    STAGE_SECONDS.observe(finished.duration, stage=finished.name)
+    if finished.status == "error":
+        STAGE_ERRORS.inc(stage=finished.name)
+    if finished.name == "verification_check":
+        kind = finished.attributes.get("verification")
+        if kind and kind != "none":
+            VERIFICATION_WALLS.inc(kind=kind)
+    elif finished.name == "parse":
+        PARSES.inc()
+    elif finished.name == "ai_fallback" and finished.parent_name == "parse":
+        # manual_html_fallback also calls the AI agent; those retries are not parse fallbacks
+        AI_FALLBACKS.inc()
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    registry = REGISTRY
+
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = self.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # keep the scraper's console clean
+
+
+_server = None
+
+
+def start_server(port=DEFAULT_PORT, host=DEFAULT_HOST):
+    """Serve the registry on http://host:port/metrics from a daemon thread."""
+    global _server
+    if _server is None:
+        _server = ThreadingHTTPServer((host, port), MetricsHandler)
+        _server.daemon_threads = True
+        threading.Thread(target=_server.serve_forever, name="scrape-metrics", daemon=True).start()
+    return _server
+
+
+def enabled():
+    return _server is not None
+
+
+def start_from_env():
+    """Start the endpoint and feed it from the tracer when SCRAPE_METRICS_PORT is set."""
+    port = os.getenv("SCRAPE_METRICS_PORT")
+    if not port or enabled():
+        return enabled()
+    host = os.getenv("SCRAPE_METRICS_HOST") or DEFAULT_HOST
+    try:
+        start_server(int(port), host)
+    except (ValueError, OSError) as e:
+        print(f"⚠️  Could not start metrics endpoint on {host}:{port}: {e}", file=sys.stderr)
+        return False
+
+    from scrape_tracing import get_tracer
+
+    get_tracer().add_listener(record_span)
+    SWEEP_START.set(time.time())
+    print(f"📈 Metrics at http://{host}:{port}/metrics "
+          f"(dashboard: python scripts/scrape_metrics.py watch --url http://{host}:{port}/metrics)",
+          file=sys.stderr)
+    return True
+
+
+def set_sweep_size(count):
+    SWEEP_LINKS.set(count)
+
+
+def record_rows(count):
+    ROWS.inc(count)
+
+
+def format_bytes(value):
+    if value is None:
+        return "n/a"
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if abs(value) < 1024 or unit == "GiB":
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+
+
+def progress_line():
+    elapsed = max(time.time() - SWEEP_START.value(), 1e-9) if SWEEP_START.value() else None
+    done = LINKS.total()
+    parts = [f"links {done:.0f}/{SWEEP_LINKS.value():.0f}",
+             f"saved {LINKS.value(outcome='saved'):.0f}",
+             f"skipped {LINKS.value(outcome='skipped'):.0f}",
+             f"errors {LINKS.value(outcome='error'):.0f}",
+             f"rows {ROWS.total():.0f}"]
+    if elapsed:
+        parts.append(f"{done / elapsed * 60:.1f} links/min")
+    if UPLOADS_IN_FLIGHT.total() or UPLOADS.value(result="failed"):
+        parts.append(f"uploads failed {UPLOADS.value(result='failed'):.0f}, pending {UPLOADS_IN_FLIGHT.total():.0f}")
+    parts.append(f"walls {VERIFICATION_WALLS.total():.0f}")
+    if PARSES.total():
+        parts.append(f"AI fallback {AI_FALLBACKS.total() / PARSES.total() * 100:.0f}%")
+    rss = browser_rss()
+    if rss is not None:
+        parts.append(f"browser {format_bytes(rss)}")
+    return "📈 " + " · ".join(parts)
+
+
+def print_progress(file=sys.stderr):
+    """One-line sweep status; prints nothing unless metrics are enabled."""
+    if enabled():
+        print(progress_line(), file=file)
+
+
+# --- Dashboard -----------------------------------------------------------------
+
+SAMPLE_RE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(.*)\})?\s+(\S+)$')
+LABEL_RE = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+
+
+def parse_exposition(text):
+    """{(name, frozenset(labels)): value} for every sample in Prometheus text format."""
+    samples = {}
+    for line in text.splitlines():
+        if not line or line.startswith("#"):
+            continue
+        match = SAMPLE_RE.match(line)
+        if not match:
+            continue
+        name, labels, value = match.groups()
+        labels = frozenset((k, v.replace('\\"', '"').replace("\\\\", "\\"))
+                           for k, v in LABEL_RE.findall(labels or ""))
+        samples[(name, labels)] = float(value)
+    return samples
+
+
+def sample_sum(samples, name, **match):
+    wanted = set(match.items())
+    return sum(v for (n, labels), v in samples.items() if n == name and wanted <= labels)
+
+
+def histogram_quantile(samples, name, quantile, **match):
+    """Quantile estimate from cumulative buckets, interpolated like PromQL's histogram_quantile."""
+    wanted = set(match.items())
+    buckets = sorted(
+        (float(dict(labels)["le"]), v) for (n, labels), v in samples.items()
+        if n == f"{name}_bucket" and wanted <= {kv for kv in labels if kv[0] != "le"}
+    )
+    if not buckets or buckets[-1][1] == 0:
+        return None
+    rank = quantile * buckets[-1][1]
+    lower_bound, lower_count = 0.0, 0.0
+    for bound, count in buckets:
+        if count >= rank:
+            if bound == math.inf:
+                return lower_bound
+            if count == lower_count:
+                return bound
+            return lower_bound + (bound - lower_bound) * (rank - lower_count) / (count - lower_count)
+        lower_bound, lower_count = bound, count
+    return lower_bound
+
+
+def render_dashboard(samples, previous, interval):
+    def rate(name):
+        if previous is None:
+            return None
+        return max(0.0, sample_sum(samples, name) - sample_sum(previous, name)) / interval
+
+    start = sample_sum(samples, "scrape_sweep_start_time_seconds")
+    elapsed = time.time() - start if start else 0
+    done = sample_sum(samples, "scrape_links_total")
+    total = sample_sum(samples, "scrape_sweep_links")
+    parses = sample_sum(samples, "scrape_parses_total")
+    link_rate, row_rate = rate("scrape_links_total"), rate("scrape_rows_captured_total")
+
+    lines = [
+        "═" * 72,
+        f"📈 SCRAPE SWEEP   elapsed {int(elapsed // 3600):d}:{int(elapsed % 3600 // 60):02d}:{int(elapsed % 60):02d}"
+        f"   updated {time.strftime('%H:%M:%S')}",
+        "═" * 72,
+        f"Links      {done:>6.0f} / {total:<6.0f}  saved {sample_sum(samples, 'scrape_links_total', outcome='saved'):.0f}"
+        f"  skipped {sample_sum(samples, 'scrape_links_total', outcome='skipped'):.0f}"
+        f"  errors {sample_sum(samples, 'scrape_links_total', outcome='error'):.0f}",
+        f"Rows       {sample_sum(samples, 'scrape_rows_captured_total'):>6.0f}",
+        "Rate       " + (f"{link_rate * 60:.2f} links/min, {row_rate:.1f} rows/s" if link_rate is not None
+                         else f"{done / elapsed * 60:.2f} links/min (sweep average)" if elapsed else "n/a"),
+        f"Uploads    ok {sample_sum(samples, 'scrape_uploads_total', result='ok'):.0f}"
+        f"  failed {sample_sum(samples, 'scrape_uploads_total', result='failed'):.0f}"
+        f"  backlog {sample_sum(samples, 'scrape_uploads_in_flight'):.0f}",
+        f"Walls      {sample_sum(samples, 'scrape_verification_walls_total'):.0f} verification page(s)",
+        "AI parse   " + (f"{sample_sum(samples, 'scrape_ai_fallbacks_total'):.0f} of {parses:.0f} parses "
+                         f"({sample_sum(samples, 'scrape_ai_fallbacks_total') / parses * 100:.0f}%)" if parses else "n/a"),
+        f"RSS        scraper {format_bytes(samples.get(('scrape_process_rss_bytes', frozenset())))}"
+        f"  browser {format_bytes(samples.get(('scrape_browser_rss_bytes', frozenset())))}",
+        "",
+        f"{'Stage':<22} {'count':>6} {'p50 s':>8} {'p95 s':>8} {'errors':>7}",
+    ]
+    stages = sorted({dict(labels)["stage"] for (n, labels) in samples
+                     if n == "scrape_stage_duration_seconds_count"})
+    for stage in stages:
+        count = sample_sum(samples, "scrape_stage_duration_seconds_count", stage=stage)
+        p50 = histogram_quantile(samples, "scrape_stage_duration_seconds", 0.5, stage=stage)
+        p95 = histogram_quantile(samples, "scrape_stage_duration_seconds", 0.95, stage=stage)
+        errors = sample_sum(samples, "scrape_stage_errors_total", stage=stage)
+        lines.append(f"{stage:<22} {count:>6.0f} {p50 or 0:>8.2f} {p95 or 0:>8.2f} {errors:>7.0f}")
+    return "\n".join(lines)
+
+
+def watch(url, interval):
+    previous = None
+    while True:
+        try:
+            with urllib.request.urlopen(url, timeout=max(interval, 1)) as response:
+                samples = parse_exposition(response.read().decode("utf-8"))
+        except OSError as e:
+            print(f"\033[2J\033[H⏳ Waiting for {url} ({e})", flush=True)
+            previous = None
+        else:
+            print("\033[2J\033[H" + render_dashboard(samples, previous, interval), flush=True)
+            previous = samples
+        time.sleep(interval)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Live dashboard for a running scrape sweep")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    watch_parser = subparsers.add_parser("watch", help="Poll a scraper's metrics endpoint and redraw a dashboard")
+    watch_parser.add_argument("--url", default=f"http://{DEFAULT_HOST}:{DEFAULT_PORT}/metrics",
+                              help=f"Metrics endpoint (default: http://{DEFAULT_HOST}:{DEFAULT_PORT}/metrics)")
+    watch_parser.add_argument("--interval", type=float, default=2.0, help="Seconds between refreshes (default: 2)")
+    args = parser.parse_args()
+
+    try:
+        watch(args.url, args.interval)
+    except KeyboardInterrupt:
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,267 @@
+"""
+scrape_tracing.py
+Lightweight span tracing for the scraper pipeline. Spans nest through a
+contextvar (so they follow asyncio tasks), are timed with perf_counter, and
+when a sweep ends an aggregate table shows p50/p95 per stage plus per-domain
+and slowest-link breakdowns, so it is clear where sweep time goes.
+
+    from scrape_tracing import span, traced, print_summary
+
+    with span("link", url=url, domain=domain) as link_span:
+        with span("navigate"):
+            await page.goto(url)
+        link_span.set("outcome", "saved")
+
+    @traced("upload")
+    def save(...): ...
+
+Environment:
+    SCRAPE_TRACE_FILE   Append every finished span as one JSON line to this file
+    SCRAPE_TRACE_OTEL   1 to mirror spans to OpenTelemetry (needs opentelemetry-api;
+                        exporters are configured the usual OTel way)
+"""
+
+import contextvars
+import functools
+import inspect
+import json
+import math
+import os
+import secrets
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from urllib.parse import urlparse
+
+try:
+    from opentelemetry import trace as otel_trace
+    OTEL_AVAILABLE = True
+except ImportError:
+    OTEL_AVAILABLE = False
+
+
+ROOT_SPAN_NAME = "link"
+SLOWEST_LINKS_SHOWN = 10
+
+_current_span = contextvars.ContextVar("scrape_current_span", default=None)
+
+
+def domain_of(url):
+    return (urlparse(url or "").hostname or "unknown").lower()
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+class Span:
+    """One timed stage. Attributes are plain JSON values."""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "parent_name", "attributes",
+                 "start_time", "start", "end", "status", "error", "otel_span")
+
+    def __init__(self, name, trace_id, parent_id, attributes, parent_name=None):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.parent_name = parent_name
+        self.attributes = attributes
+        self.start_time = time.time()
+        self.start = time.perf_counter()
+        self.end = None
+        self.status = "ok"
+        self.error = None
+        self.otel_span = None
+
+    def set(self, key, value):
+        self.attributes[key] = value
+        if self.otel_span is not None and isinstance(value, (str, bool, int, float)):
+            self.otel_span.set_attribute(key, value)
+
+    @property
+    def duration(self):
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+    def as_dict(self):
+        return {
+            "name": self.name,
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentId": self.parent_id,
+            "startTime": self.start_time,
+            "durationMs": round(self.duration * 1000, 3),
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+
+class Tracer:
+    """Collects finished spans, exports them to JSONL and optionally to OpenTelemetry."""
+
+    def __init__(self, export_path=None, use_otel=False):
+        self.finished = []
+        self.listeners = []
+        self.lock = threading.Lock()
+        self.export = open(export_path, "a", encoding="utf-8") if export_path else None
+        self.otel = otel_trace.get_tracer("cobec.scraper") if use_otel and OTEL_AVAILABLE else None
+        if use_otel and not OTEL_AVAILABLE:
+            print("Warning: SCRAPE_TRACE_OTEL set but opentelemetry-api is not installed.", file=sys.stderr)
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            export_path=os.getenv("SCRAPE_TRACE_FILE") or None,
+            use_otel=os.getenv("SCRAPE_TRACE_OTEL", "").lower() in ("1", "true", "yes"),
+        )
+
+    @contextmanager
+    def span(self, name, **attributes):
+        parent = _current_span.get()
+        current = Span(name, parent.trace_id if parent else secrets.token_hex(16),
+                       parent.span_id if parent else None, attributes,
+                       parent.name if parent else None)
+        token = _current_span.set(current)
+        otel_context = (
+            self.otel.start_as_current_span(
+                name, attributes={k: v for k, v in attributes.items() if isinstance(v, (str, bool, int, float))}
+            )
+            if self.otel else nullcontext()
+        )
+        try:
+            with otel_context as otel_span:
+                current.otel_span = otel_span
+                yield current
+        except BaseException as e:
+            current.status = "error"
+            current.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            current.end = time.perf_counter()
+            _current_span.reset(token)
+            self._finish(current)
+
+    def add_listener(self, callback):
+        """Call callback(span) for every span as it finishes (e.g. to feed metrics)."""
+        self.listeners.append(callback)
+
+    def _finish(self, finished):
+        with self.lock:
+            self.finished.append(finished)
+            if self.export is not None:
+                self.export.write(json.dumps(finished.as_dict(), default=str) + "\n")
+                self.export.flush()
+        for callback in self.listeners:
+            callback(finished)
+
+    # --- Aggregates ----------------------------------------------------------
+
+    def stage_rows(self):
+        """(stage, count, p50, p95, max, total, errors) per span name, in pipeline order."""
+        by_name = defaultdict(list)
+        errors = defaultdict(int)
+        first_start = {}
+        with self.lock:
+            spans = list(self.finished)
+        for s in spans:
+            by_name[s.name].append(s.duration)
+            errors[s.name] += s.status == "error"
+            first_start[s.name] = min(first_start.get(s.name, s.start), s.start)
+        return [
+            (name, len(d), percentile(d, 50), percentile(d, 95), max(d), sum(d), errors[name])
+            for name, d in sorted(by_name.items(), key=lambda item: first_start[item[0]])
+        ]
+
+    def link_rows(self):
+        """(url, domain, seconds, outcome) for every finished root link span."""
+        with self.lock:
+            links = [s for s in self.finished if s.name == ROOT_SPAN_NAME]
+        return [
+            (s.attributes.get("url", ""), s.attributes.get("domain") or domain_of(s.attributes.get("url")),
+             s.duration, s.attributes.get("outcome", s.status))
+            for s in links
+        ]
+
+    def print_summary(self, file=sys.stderr):
+        stages = self.stage_rows()
+        if not stages:
+            return
+        links = self.link_rows()
+        link_total = sum(seconds for _, _, seconds, _ in links)
+
+        print("\n" + "═" * 78, file=file)
+        print("⏱️  SWEEP TIMING SUMMARY", file=file)
+        print("═" * 78, file=file)
+        print(f"{'Stage':<22} {'count':>6} {'p50 ms':>10} {'p95 ms':>10} {'max ms':>10} {'total s':>9} {'share':>6}",
+              file=file)
+        for name, count, p50, p95, worst, total, errors in stages:
+            share = f"{total / link_total * 100:>5.1f}%" if link_total and name != ROOT_SPAN_NAME else ""
+            line = (f"{name:<22} {count:>6} {p50 * 1000:>10.1f} {p95 * 1000:>10.1f} {worst * 1000:>10.1f} "
+                    f"{total:>9.2f} {share:>6}")
+            print(line + (f"  ({errors} error(s))" if errors else ""), file=file)
+
+        if links:
+            by_domain = defaultdict(list)
+            for _, domain, seconds, outcome in links:
+                by_domain[domain].append((seconds, outcome))
+            print(f"\n{'Domain':<40} {'links':>6} {'saved':>6} {'p50 s':>8} {'total s':>9}", file=file)
+            for domain, rows in sorted(by_domain.items(), key=lambda item: -sum(s for s, _ in item[1])):
+                durations = [s for s, _ in rows]
+                saved = sum(outcome == "saved" for _, outcome in rows)
+                print(f"{domain[:40]:<40} {len(rows):>6} {saved:>6} {percentile(durations, 50):>8.2f} "
+                      f"{sum(durations):>9.2f}", file=file)
+
+            print(f"\nSlowest links:", file=file)
+            for url, _, seconds, outcome in sorted(links, key=lambda row: -row[2])[:SLOWEST_LINKS_SHOWN]:
+                print(f"   {seconds:>8.2f}s  {outcome:<8} {url}", file=file)
+        if self.export is not None:
+            print(f"\n💾 Spans written to: {self.export.name}", file=file)
+
+
+_tracer = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer():
+    global _tracer
+    if _tracer is None:
+        with _tracer_lock:
+            if _tracer is None:
+                _tracer = Tracer.from_env()
+    return _tracer
+
+
+def span(name, **attributes):
+    """Context manager timing one stage under the current span."""
+    return get_tracer().span(name, **attributes)
+
+
+def current_span():
+    return _current_span.get()
+
+
+def traced(name):
+    """Decorator that runs a function (sync or async) inside a span."""
+    def decorate(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def print_summary(file=sys.stderr):
+    get_tracer().print_summary(file=file)
@@ -5,19 +5,18 @@ import sys
 import pandas as pd
 from pathlib import Path
 from playwright.async_api import async_playwright
-from io import StringIO
 
 # ------------------------------------------------------------------
 # CONFIGURATION
 # ------------------------------------------------------------------
 
-try:
-    from convex import ConvexClient
-    CONVEX_AVAILABLE = True
-except ImportError:
-    CONVEX_AVAILABLE = False
+from convex_backend import CONVEX_AVAILABLE, create_client, offline_backend_enabled
+from table_parsing import html_table_to_records
+
+if not CONVEX_AVAILABLE and not offline_backend_enabled():
     print("Error: convex package not installed.")
     print("Install with: pip install convex python-dotenv")
+    print("Or set CONVEX_BACKEND=sqlite to run against the offline stand-in (see convex_backend.py).")
     sys.exit(1)
 
 try:
@@ -80,7 +79,7 @@ def init_convex_client():
         return client
 
     convex_url = load_convex_url()
-    if not convex_url:
+    if not convex_url and not offline_backend_enabled():
         print("❌ Error: CONVEX_URL not found.", file=sys.stderr)
         print("\n📁 Checked for environment files:", file=sys.stderr)
         print(
@@ -104,8 +103,9 @@ def init_convex_client():
         )
         raise ValueError("CONVEX_URL not configured")
 
-    print(f"🔗 Connecting to Convex at: {convex_url}", file=sys.stderr)
-    client = ConvexClient(convex_url)
+    if convex_url:
+        print(f"🔗 Connecting to Convex at: {convex_url}", file=sys.stderr)
+    client = create_client(convex_url)
     return client
 
 
@@ -470,40 +470,7 @@ def manual_html_fallback(source_url=None, max_retries=3):
         
         try:
             # Try parsing with pandas first
-            dfs = pd.read_html(StringIO(html_content))
-            
-            if not dfs:
-                error_msg = "No HTML tables found in pasted content"
-                errors.append(f"Attempt {attempt}: {error_msg}")
-                print(f"⚠️  {error_msg}")
-                
-                if attempt < max_retries:
-                    retry = input("\n   Try again? [y/n]: ").strip().lower()
-                    if retry != "y":
-                        break
-                continue
-            
-            print(f"✅ Found {len(dfs)} table(s) in pasted HTML")
-            
-            main_df = dfs[0]
-            main_df = main_df.dropna(how="all").dropna(axis=1, how="all")
-            
-            if main_df.empty:
-                error_msg = "Table is empty after cleaning"
-                errors.append(f"Attempt {attempt}: {error_msg}")
-                print(f"⚠️  {error_msg}")
-                
-                if attempt < max_retries:
-                    retry = input("\n   Try again? [y/n]: ").strip().lower()
-                    if retry != "y":
-                        break
-                continue
-            
-            main_df = main_df.fillna("")
-            for col in main_df.columns:
-                main_df[col] = main_df[col].astype(str)
-            
-            records = main_df.to_dict(orient="records")
+            records = html_table_to_records(html_content)
             print(f"✅ Successfully parsed {len(records)} rows from manual input")
             
             # Show preview
@@ -789,28 +756,7 @@ def parse_html_to_records(html_content, source_url=None):
     print(f"DEBUG: Parsing HTML ({len(html_content)} chars)")
 
     try:
-        dfs = pd.read_html(StringIO(html_content))
-
-        if not dfs:
-            print("⚠️  No HTML tables found with pandas.")
-            save_debug_html(html_content, source_url)
-            return parse_with_ai_agent(html_content, source_url)
-
-        print(f"DEBUG: Found {len(dfs)} table(s)")
-
-        main_df = dfs[0]
-        main_df = main_df.dropna(how="all").dropna(axis=1, how="all")
-
-        if main_df.empty:
-            print("⚠️  Table is empty after cleaning.")
-            save_debug_html(html_content, source_url)
-            return parse_with_ai_agent(html_content, source_url)
-
-        main_df = main_df.fillna("")
-        for col in main_df.columns:
-            main_df[col] = main_df[col].astype(str)
-
-        records = main_df.to_dict(orient="records")
+        records = html_table_to_records(html_content)
         print(f"✅ Successfully parsed {len(records)} rows using pandas")
         return records
 
@@ -1,23 +1,26 @@
 import asyncio
+import contextvars
 import json
 import os
 import sys
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from playwright.async_api import async_playwright
-from io import StringIO
 
 # ------------------------------------------------------------------
 # CONFIGURATION
 # ------------------------------------------------------------------
 
-try:
-    from convex import ConvexClient
-    CONVEX_AVAILABLE = True
-except ImportError:
-    CONVEX_AVAILABLE = False
+import scrape_metrics
+from convex_backend import CONVEX_AVAILABLE, create_client, offline_backend_enabled
+from scrape_tracing import domain_of, print_summary as print_trace_summary, span, traced
+from table_parsing import html_table_to_records
+
+if not CONVEX_AVAILABLE and not offline_backend_enabled():
     print("Error: convex package not installed.")
     print("Install with: pip install convex python-dotenv")
+    print("Or set CONVEX_BACKEND=sqlite to run against the offline stand-in (see convex_backend.py).")
     sys.exit(1)
 
 try:
@@ -38,6 +41,11 @@ except ImportError:
 # Global Convex client
 client = None
 
+# Uploads run on one background thread with its own client, so the browser and
+# the operator never wait on Convex; scrape_uploads_in_flight is the backlog
+upload_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="convex-upload")
+upload_client = None
+
 # User data directory for persistent sessions
 USER_DATA_DIR = Path("./chromium_user_data")
 
@@ -78,7 +86,7 @@ def init_convex_client():
         return client
 
     convex_url = load_convex_url()
-    if not convex_url:
+    if not convex_url and not offline_backend_enabled():
         print("❌ Error: CONVEX_URL not found.", file=sys.stderr)
         print("\n📁 Checked for environment files:", file=sys.stderr)
         print(
@@ -102,11 +110,13 @@ def init_convex_client():
         )
         raise ValueError("CONVEX_URL not configured")
 
-    print(f"🔗 Connecting to Convex at: {convex_url}", file=sys.stderr)
-    client = ConvexClient(convex_url)
+    if convex_url:
+        print(f"🔗 Connecting to Convex at: {convex_url}", file=sys.stderr)
+    client = create_client(convex_url)
     return client
 
 
+@traced("fetch_links")
 def get_links_from_convex():
     """Fetches approved procurement links from Convex database."""
     init_convex_client()
@@ -118,11 +128,15 @@ def get_links_from_convex():
     return links
 
 
+@traced("upload")
 def save_procurement_data_to_convex(link_obj, parsed_data):
-    """Save parsed procurement data to Convex."""
-    init_convex_client()
+    """Save parsed procurement data to Convex (runs on the upload thread)."""
+    global upload_client
 
     try:
+        if upload_client is None:
+            upload_client = create_client(load_convex_url())
+
         payload = {
             "procurementUrlId": link_obj.get("_id"),
             "state": link_obj.get("state", "Unknown"),
@@ -131,14 +145,35 @@ def save_procurement_data_to_convex(link_obj, parsed_data):
             "rowCount": len(parsed_data),
         }
 
-        print("📤 Uploading parsed data to Convex...", file=sys.stderr)
-        result = client.mutation("procurementData:create", payload)
+        print(f"📤 Uploading {len(parsed_data)} row(s) from {payload['sourceUrl']} to Convex...", file=sys.stderr)
+        result = upload_client.mutation("procurementData:create", payload)
+        scrape_metrics.UPLOADS.inc(result="ok")
         print(f"✅ Data saved (ID: {result})", file=sys.stderr)
         return result
 
     except Exception as e:
+        scrape_metrics.UPLOADS.inc(result="failed")
         print(f"❌ Error saving to Convex: {e}", file=sys.stderr)
         return None
+    finally:
+        scrape_metrics.UPLOADS_IN_FLIGHT.dec()
+
+
+def queue_upload(link_obj, parsed_data):
+    """Hand parsed data to the upload thread and return at once."""
+    scrape_metrics.record_rows(len(parsed_data))
+    scrape_metrics.UPLOADS_IN_FLIGHT.inc()
+    # Run in a copy of this context so the upload span nests under the link span
+    context = contextvars.copy_context()
+    return upload_executor.submit(context.run, save_procurement_data_to_convex, link_obj, parsed_data)
+
+
+def wait_for_uploads():
+    """Block until every queued upload has finished."""
+    pending = int(scrape_metrics.UPLOADS_IN_FLIGHT.total())
+    if pending:
+        print(f"⏳ Waiting for {pending} upload(s) to finish...", file=sys.stderr)
+    upload_executor.shutdown(wait=True)
 
 
 def display_link_menu(links, current_index=None):
@@ -489,6 +524,7 @@ def get_manual_html_input():
     return html_content
 
 
+@traced("manual_fallback")
 def manual_html_fallback(source_url=None, max_retries=3):
     """Fallback for manual HTML pasting when parsing fails."""
     errors = []
@@ -505,40 +541,7 @@ def manual_html_fallback(source_url=None, max_retries=3):
             return None
 
         try:
-            dfs = pd.read_html(StringIO(html_content))
-
-            if not dfs:
-                error_msg = "No HTML tables found in pasted content"
-                errors.append(f"Attempt {attempt}: {error_msg}")
-                print(f"⚠️  {error_msg}")
-
-                if attempt < max_retries:
-                    retry = input("\n   Try again? [y/n]: ").strip().lower()
-                    if retry != "y":
-                        break
-                continue
-
-            print(f"✅ Found {len(dfs)} table(s) in pasted HTML")
-
-            main_df = dfs[0]
-            main_df = main_df.dropna(how="all").dropna(axis=1, how="all")
-
-            if main_df.empty:
-                error_msg = "Table is empty after cleaning"
-                errors.append(f"Attempt {attempt}: {error_msg}")
-                print(f"⚠️  {error_msg}")
-
-                if attempt < max_retries:
-                    retry = input("\n   Try again? [y/n]: ").strip().lower()
-                    if retry != "y":
-                        break
-                continue
-
-            main_df = main_df.fillna("")
-            for col in main_df.columns:
-                main_df[col] = main_df[col].astype(str)
-
-            records = main_df.to_dict(orient="records")
+            records = html_table_to_records(html_content)
             print(f"✅ Parsed {len(records)} rows from manual input")
 
             # Show preview
@@ -597,6 +600,16 @@ def manual_html_fallback(source_url=None, max_retries=3):
 
 
 async def process_link(browser, link_obj, index, total):
+    """Process a single procurement link, traced as one "link" span."""
+    url = link_obj.get("procurementLink") or ""
+    with span("link", url=url, state=link_obj.get("state", "Unknown"), domain=domain_of(url),
+              index=index) as link_span:
+        saved = await _process_link(browser, link_obj, index, total)
+        link_span.set("outcome", "saved" if saved else "skipped")
+        return saved
+
+
+async def _process_link(browser, link_obj, index, total):
     """Process a single procurement link with FRESH page."""
     url = link_obj.get("procurementLink")
     state = link_obj.get("state", "Unknown")
@@ -616,24 +629,28 @@ async def process_link(browser, link_obj, index, total):
         print(f"   ⏳ Using wait strategy: {wait_strategy}")
 
     # CREATE FRESH PAGE for each link
-    page = await browser.new_page()
-    await apply_stealth(page)
+    with span("new_page"):
+        page = await browser.new_page()
+        await apply_stealth(page)
 
     try:
         # Navigate with proper wait strategy
         print(f"   🌐 Navigating to {url}...")
-        if wait_strategy:
-            await page.goto(url, wait_until=wait_strategy, timeout=60000)
-        else:
-            await page.goto(url, wait_until="domcontentloaded", timeout=60000)
+        with span("navigate", wait_until=wait_strategy or "domcontentloaded"):
+            if wait_strategy:
+                await page.goto(url, wait_until=wait_strategy, timeout=60000)
+            else:
+                await page.goto(url, wait_until="domcontentloaded", timeout=60000)
 
         # Wait for network idle
-        try:
-            await page.wait_for_load_state("networkidle", timeout=30000)
-        except Exception:
-            pass  # Continue even if networkidle times out
+        with span("network_idle") as idle_span:
+            try:
+                await page.wait_for_load_state("networkidle", timeout=30000)
+            except Exception:
+                idle_span.set("timedOut", True)  # Continue even if networkidle times out
 
-        await page.wait_for_timeout(3000)
+        with span("settle", ms=3000):
+            await page.wait_for_timeout(3000)
 
     except Exception as e:
         print(f"⚠️  Could not load {url}: {e}")
@@ -652,7 +669,9 @@ async def process_link(browser, link_obj, index, total):
         print(f"   Diagnostic error: {e}")
 
     # Check for verification
-    verification_type = await check_for_verification(page)
+    with span("verification_check") as verification_span:
+        verification_type = await check_for_verification(page)
+        verification_span.set("verification", verification_type or "none")
     if verification_type:
         print(f"\n{'━' * 60}")
         print(f"👉 {verification_type} VERIFICATION REQUIRED")
@@ -660,7 +679,8 @@ async def process_link(browser, link_obj, index, total):
         print("   Complete verification in the browser...")
 
     # Run detection diagnostics
-    await diagnose_detection(page)
+    with span("diagnose_detection"):
+        await diagnose_detection(page)
 
     print("\n" + "━" * 60)
     print("👉 STEP 1: Complete any CAPTCHAs or verification")
@@ -668,9 +688,10 @@ async def process_link(browser, link_obj, index, total):
     print("   [Enter] - Continue after verification")
     print("   [s]     - Skip this link")
 
-    skip_choice = (
-        input("\n   Press [Enter] to continue or [s] to skip: ").strip().lower()
-    )
+    with span("operator_verification"):
+        skip_choice = (
+            input("\n   Press [Enter] to continue or [s] to skip: ").strip().lower()
+        )
     if skip_choice == "s":
         print("⏭️  Skipping this link...")
         await page.close()
@@ -704,7 +725,8 @@ async def process_link(browser, link_obj, index, total):
 
     # Inject selector
     try:
-        await page.evaluate(SELECTOR_JS)
+        with span("inject_selector"):
+            await page.evaluate(SELECTOR_JS)
     except Exception as e:
         print(f"❌ Failed to inject selector: {e}")
         await page.close()
@@ -717,7 +739,9 @@ async def process_link(browser, link_obj, index, total):
     print("━" * 60)
 
     try:
-        html_data = await future
+        with span("capture") as capture_span:
+            html_data = await future
+            capture_span.set("htmlChars", len(html_data or ""))
         print("✅ Element captured!")
 
         parsed_data = parse_html_to_records(html_data, source_url=url)
@@ -728,7 +752,7 @@ async def process_link(browser, link_obj, index, total):
             print("\n--- DATA SAMPLE (First 5 Rows) ---")
             print(df.head().to_markdown(index=False))
 
-            save_procurement_data_to_convex(link_obj, parsed_data)
+            queue_upload(link_obj, parsed_data)
             await page.close()
             return True
         else:
@@ -741,7 +765,7 @@ async def process_link(browser, link_obj, index, total):
                 parsed_data = manual_html_fallback(source_url=url, max_retries=3)
                 if parsed_data:
                     print(f"\n📊 Parsed {len(parsed_data)} rows from manual input")
-                    save_procurement_data_to_convex(link_obj, parsed_data)
+                    queue_upload(link_obj, parsed_data)
                     await page.close()
                     return True
 
@@ -761,7 +785,7 @@ async def process_link(browser, link_obj, index, total):
             parsed_data = manual_html_fallback(source_url=url, max_retries=3)
             if parsed_data:
                 print(f"\n📊 Parsed {len(parsed_data)} rows from manual input")
-                save_procurement_data_to_convex(link_obj, parsed_data)
+                queue_upload(link_obj, parsed_data)
                 await page.close()
                 return True
 
@@ -796,6 +820,7 @@ def save_debug_html(html_content, source_url=None):
         return None
 
 
+@traced("ai_fallback")
 def parse_with_ai_agent(html_content, source_url=None):
     """Fallback: Use Convex AI agent to parse HTML."""
     init_convex_client()
@@ -832,33 +857,13 @@ def parse_with_ai_agent(html_content, source_url=None):
         return None
 
 
+@traced("parse")
 def parse_html_to_records(html_content, source_url=None):
     """Parse HTML into list of dicts. Attempts AI fallback if needed."""
     print(f"DEBUG: Parsing HTML ({len(html_content)} chars)")
 
     try:
-        dfs = pd.read_html(StringIO(html_content))
-
-        if not dfs:
-            print("⚠️  No HTML tables found with pandas.")
-            save_debug_html(html_content, source_url)
-            return parse_with_ai_agent(html_content, source_url)
-
-        print(f"DEBUG: Found {len(dfs)} table(s)")
-
-        main_df = dfs[0]
-        main_df = main_df.dropna(how="all").dropna(axis=1, how="all")
-
-        if main_df.empty:
-            print("⚠️  Table is empty after cleaning.")
-            save_debug_html(html_content, source_url)
-            return parse_with_ai_agent(html_content, source_url)
-
-        main_df = main_df.fillna("")
-        for col in main_df.columns:
-            main_df[col] = main_df[col].astype(str)
-
-        records = main_df.to_dict(orient="records")
+        records = html_table_to_records(html_content)
         print(f"✅ Parsed {len(records)} rows using pandas")
         return records
 
@@ -875,6 +880,7 @@ def parse_html_to_records(html_content, source_url=None):
 async def main():
     print("🌐 Chromium Stealth Scraper")
     print("=" * 50)
+    scrape_metrics.start_from_env()
 
     try:
         links = get_links_from_convex()
@@ -891,6 +897,7 @@ async def main():
         traceback.print_exc()
         return 1
 
+    scrape_metrics.set_sweep_size(len(links))
     USER_DATA_DIR.mkdir(exist_ok=True)
     display_link_menu(links)
 
@@ -937,6 +944,7 @@ async def main():
         while True:
             link = links[current_index]
             await process_link(browser, link, current_index, len(links))
+            scrape_metrics.print_progress()
 
             action, new_index = get_post_scrape_action(links, current_index)
 
@@ -958,5 +966,9 @@ if __name__ == "__main__":
     )
     print("   playwright install chromium\n")
 
-    exit_code = asyncio.run(main())
+    try:
+        exit_code = asyncio.run(main())
+    finally:
+        wait_for_uploads()
+        print_trace_summary()
     sys.exit(exit_code if exit_code else 0)
\ No newline at end of file
@@ -11,13 +11,12 @@ from io import StringIO
 # CONFIGURATION
 # ------------------------------------------------------------------
 
-try:
-    from convex import ConvexClient
-    CONVEX_AVAILABLE = True
-except ImportError:
-    CONVEX_AVAILABLE = False
+from convex_backend import CONVEX_AVAILABLE, create_client, offline_backend_enabled
+
+if not CONVEX_AVAILABLE and not offline_backend_enabled():
     print("Error: convex package not installed.")
     print("Install with: pip install convex python-dotenv")
+    print("Or set CONVEX_BACKEND=sqlite to run against the offline stand-in (see convex_backend.py).")
     sys.exit(1)
 
 try:
@@ -57,7 +56,7 @@ def get_links_from_convex():
     
     if not client:
         convex_url = load_convex_url()
-        if not convex_url:
+        if not convex_url and not offline_backend_enabled():
             print("❌ Error: CONVEX_URL not found.", file=sys.stderr)
             print("\n📁 Checked for environment files:", file=sys.stderr)
             print(f"   {'✓' if Path('.env.local').exists() else '✗'} .env.local", file=sys.stderr)
@@ -69,8 +68,9 @@ def get_links_from_convex():
             print("      export VITE_CONVEX_URL='https://your-deployment.convex.cloud'", file=sys.stderr)
             raise ValueError("CONVEX_URL not configured")
         
-        print(f"🔗 Connecting to Convex at: {convex_url}", file=sys.stderr)
-        client = ConvexClient(convex_url)
+        if convex_url:
+            print(f"🔗 Connecting to Convex at: {convex_url}", file=sys.stderr)
+        client = create_client(convex_url)
     
     # Query the getApproved function from procurementUrls module
     print("📥 Fetching approved procurement links from Convex...", file=sys.stderr)
@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+Skill Matcher
+
+Dictionary-based skill extraction over full resume text. The skills taxonomy
+(data/skills_taxonomy.json) is compiled once into an Aho-Corasick automaton, so
+every resume is scanned in a single pass regardless of how many skills and
+aliases the taxonomy holds. Matches are case-insensitive, whitespace-tolerant
+and respect word boundaries ("java" does not match inside "javascript").
+Skills whose names are also everyday words opt out per skill: caseSensitive
+terms must match exactly as written ("SAP", not "sap"), and aliasOnly skills
+never match on their bare name ("Spring cleaning" is not Spring).
+
+Each resume yields normalized skill IDs with counts and character positions,
+plus a sparse L2-normalized vector (sublinear term frequency) over the
+taxonomy. A batch of vectors forms a CSR matrix that can be scored against a
+job posting with one sparse dot product per resume; no embedding call needed.
+
+Usage:
+    python skill_matcher.py match <batch.ndjson|-> [--taxonomy FILE] [--no-positions]
+                                  [--csr FILE]
+    python skill_matcher.py rank <batch.ndjson|-> (--query TEXT | --query-file FILE)
+                                 [--top N] [--taxonomy FILE]
+
+Input is the NDJSON produced by `parseResumeFile.py --batch` (records with
+result.originalText); plain parsed-resume objects with originalText also work.
+`match` writes one NDJSON record per resume; `--csr` additionally writes the
+batch matrix as JSON {vocabulary, rows, indptr, indices, data}. `rank` prints
+resumes ordered by cosine similarity to the query text.
+
+Taxonomy format:
+    {"version": 1, "skills": [{"id": "kubernetes", "name": "Kubernetes",
+                                "category": "devops", "aliases": ["k8s"]},
+                               {"id": "sap", "name": "SAP", "caseSensitive": true},
+                               {"id": "spring", "name": "Spring", "aliasOnly": true,
+                                "aliases": ["spring boot"]}]}
+"""
+
+import argparse
+import bisect
+import json
+import math
+import re
+import sys
+from collections import deque
+from pathlib import Path
+
+# Optional: SciPy turns batch scoring into a single sparse mat-vec product
+# pip install numpy scipy
+try:
+    import numpy as np
+    from scipy.sparse import csr_matrix
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+DEFAULT_TAXONOMY = Path(__file__).resolve().parent / "data" / "skills_taxonomy.json"
+
+_WHITESPACE_RUN = re.compile(r"\s+")
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+def collapse_whitespace(term: str) -> str:
+    return _WHITESPACE_RUN.sub(" ", term.strip())
+
+
+def normalize_term(term: str) -> str:
+    """Lower-case a term and collapse internal whitespace to single spaces."""
+    return collapse_whitespace(term.lower())
+
+
+class NormalizedText:
+    """Lower-cased, whitespace-collapsed text that maps offsets back to the original.
+
+    `cased` is the same collapse without lower-casing, for case-sensitive terms.
+    """
+
+    def __init__(self, text: str):
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # A few characters expand when lower-cased (e.g. "İ"); keep offsets aligned
+            lowered = "".join(ch.lower() if len(ch.lower()) == 1 else ch for ch in text)
+
+        parts = []
+        cased_parts = []
+        self._keys = []  # normalized offsets at which the cumulative shift changes
+        self._shifts = []
+        shift = 0
+        last = 0
+        for run in _WHITESPACE_RUN.finditer(lowered):
+            parts.append(lowered[last:run.start()])
+            parts.append(" ")
+            cased_parts.append(text[last:run.start()])
+            cased_parts.append(" ")
+            last = run.end()
+            collapsed = run.end() - run.start() - 1
+            if collapsed:
+                # Everything after this run's single space sits `shift` chars further right
+                self._keys.append(run.start() - shift + 1)
+                shift += collapsed
+                self._shifts.append(shift)
+        parts.append(lowered[last:])
+        cased_parts.append(text[last:])
+        self.text = "".join(parts)
+        self.cased = "".join(cased_parts)
+
+    def original_offset(self, offset: int) -> int:
+        i = bisect.bisect_right(self._keys, offset)
+        return offset + (self._shifts[i - 1] if i else 0)
+
+
+class SkillMatcher:
+    """Aho-Corasick automaton over every skill name and alias in a taxonomy."""
+
+    def __init__(self, skills: list[dict]):
+        self.skill_ids = [skill["id"] for skill in skills]
+        self.skill_names = [skill.get("name", skill["id"]) for skill in skills]
+        self.skill_categories = [skill.get("category", "") for skill in skills]
+        self.index_of = {skill_id: i for i, skill_id in enumerate(self.skill_ids)}
+
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        seen = {}
+        for i, skill in enumerate(skills):
+            terms = list(skill.get("aliases", []))
+            if not skill.get("aliasOnly"):
+                terms.insert(0, skill.get("name", skill["id"]))
+            for term in terms:
+                pattern = normalize_term(term)
+                if not pattern:
+                    continue
+                if pattern in seen and not (seen[pattern] == i and skill.get("caseSensitive")):
+                    # Case-sensitive skills may list several spellings of one term
+                    if seen[pattern] != i:
+                        print(
+                            f"WARNING: '{term}' is listed under both {self.skill_ids[seen[pattern]]} "
+                            f"and {skill['id']}; keeping the first",
+                            file=sys.stderr,
+                        )
+                    continue
+                seen[pattern] = i
+                self._add_pattern(pattern, i, collapse_whitespace(term) if skill.get("caseSensitive") else None)
+        self._build_failure_links()
+
+    @classmethod
+    def from_file(cls, path: str | Path = DEFAULT_TAXONOMY) -> "SkillMatcher":
+        with open(path, "r", encoding="utf-8") as f:
+            taxonomy = json.load(f)
+        return cls(taxonomy["skills"])
+
+    def _add_pattern(self, pattern: str, skill_index: int, cased: str | None = None):
+        """Add a lower-cased pattern; `cased` is the exact spelling required, if any."""
+        node = 0
+        for ch in pattern:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        # Word boundaries only apply where the pattern itself starts/ends on a word
+        # character, so "c++" and ".net" still match next to punctuation
+        self._out[node].append(
+            (len(pattern), skill_index, _is_word_char(pattern[0]), _is_word_char(pattern[-1]), cased)
+        )
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(ch, 0)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def find(self, text: str) -> list[tuple[int, int, int]]:
+        """Return (start, end, skill_index) matches, leftmost-longest and non-overlapping."""
+        normalized = NormalizedText(text)
+        haystack = normalized.text
+        cased_haystack = normalized.cased
+        size = len(haystack)
+        goto, fail, out = self._goto, self._fail, self._out
+
+        candidates = []
+        state = 0
+        for i, ch in enumerate(haystack):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for length, skill_index, bound_start, bound_end, cased in out[state]:
+                start = i - length + 1
+                if bound_start and start > 0 and _is_word_char(haystack[start - 1]):
+                    continue
+                if bound_end and i + 1 < size and _is_word_char(haystack[i + 1]):
+                    continue
+                if cased is not None and cased_haystack[start:i + 1] != cased:
+                    continue
+                candidates.append((start, -length, skill_index))
+
+        candidates.sort()
+        matches = []
+        last_end = 0
+        for start, neg_length, skill_index in candidates:
+            if start < last_end:
+                continue
+            end = start - neg_length
+            matches.append((normalized.original_offset(start), normalized.original_offset(end - 1) + 1, skill_index))
+            last_end = end
+        return matches
+
+    def match(self, text: str, positions: bool = True) -> dict:
+        """Skills found in text with counts (and positions), plus the sparse vector."""
+        found: dict[int, list[list[int]]] = {}
+        for start, end, skill_index in self.find(text):
+            found.setdefault(skill_index, []).append([start, end])
+
+        skills = []
+        for skill_index in sorted(found, key=lambda i: (-len(found[i]), self.skill_ids[i])):
+            entry = {
+                "id": self.skill_ids[skill_index],
+                "name": self.skill_names[skill_index],
+                "category": self.skill_categories[skill_index],
+                "count": len(found[skill_index]),
+            }
+            if positions:
+                entry["positions"] = found[skill_index]
+            skills.append(entry)
+
+        indices, values = self.vectorize({i: len(spans) for i, spans in found.items()})
+        return {"skills": skills, "vector": {"indices": indices, "values": values}}
+
+    def vectorize(self, counts: dict[int, int]) -> tuple[list[int], list[float]]:
+        """Sublinear-tf, L2-normalized sparse vector with indices sorted ascending."""
+        indices = sorted(counts)
+        values = [1.0 + math.log(counts[i]) for i in indices]
+        norm = math.sqrt(sum(v * v for v in values)) or 1.0
+        return indices, [round(v / norm, 6) for v in values]
+
+
+def build_csr(vectors: list[dict]) -> tuple[list[int], list[int], list[float]]:
+    """Stack per-resume sparse vectors into CSR (indptr, indices, data) arrays."""
+    indptr = [0]
+    indices = []
+    data = []
+    for vector in vectors:
+        indices.extend(vector["indices"])
+        data.extend(vector["values"])
+        indptr.append(len(indices))
+    return indptr, indices, data
+
+
+def cosine_scores(query: dict, indptr: list[int], indices: list[int], data: list[float], width: int) -> list[float]:
+    """Cosine similarity of every CSR row against a query vector (rows are unit length)."""
+    if SCIPY_AVAILABLE:
+        matrix = csr_matrix((data, indices, indptr), shape=(len(indptr) - 1, width))
+        dense_query = np.zeros(width)
+        dense_query[query["indices"]] = query["values"]
+        return (matrix @ dense_query).tolist()
+
+    weights = dict(zip(query["indices"], query["values"]))
+    scores = []
+    for row in range(len(indptr) - 1):
+        score = 0.0
+        for k in range(indptr[row], indptr[row + 1]):
+            weight = weights.get(indices[k])
+            if weight is not None:
+                score += weight * data[k]
+        scores.append(score)
+    return scores
+
+
+def iter_batch_records(source: str):
+    """Yield (label, text) for every usable record in a parseResumeFile batch NDJSON."""
+    stream = sys.stdin if source == "-" else open(source, "r", encoding="utf-8")
+    try:
+        for line_number, line in enumerate(stream, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                print(f"WARNING: Skipping line {line_number}: {e}", file=sys.stderr)
+                continue
+            if record.get("ok") is False:
+                continue
+            resume = record.get("result", record)
+            text = resume.get("originalText")
+            if not text:
+                print(f"WARNING: Skipping line {line_number}: no originalText", file=sys.stderr)
+                continue
+            label = record.get("path") or resume.get("filename") or f"line {line_number}"
+            yield label, text
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def run_match(matcher: SkillMatcher, args) -> int:
+    vectors = []
+    labels = []
+    for label, text in iter_batch_records(args.input):
+        result = matcher.match(text, positions=not args.no_positions)
+        print(json.dumps({"path": label, **result}, ensure_ascii=False))
+        if args.csr:
+            labels.append(label)
+            vectors.append(result["vector"])
+
+    if args.csr:
+        indptr, indices, data = build_csr(vectors)
+        with open(args.csr, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "vocabulary": matcher.skill_ids,
+                    "rows": labels,
+                    "indptr": indptr,
+                    "indices": indices,
+                    "data": data,
+                },
+                f,
+            )
+        print(f"Wrote {len(labels)}x{len(matcher.skill_ids)} CSR matrix to {args.csr}", file=sys.stderr)
+    return 0
+
+
+def run_rank(matcher: SkillMatcher, args) -> int:
+    if args.query_file:
+        with open(args.query_file, "r", encoding="utf-8") as f:
+            query_text = f.read()
+    else:
+        query_text = args.query
+    query = matcher.match(query_text, positions=False)
+    if not query["skills"]:
+        print("ERROR: The query does not mention any known skills", file=sys.stderr)
+        return 1
+
+    labels = []
+    skill_lists = []
+    vectors = []
+    for label, text in iter_batch_records(args.input):
+        result = matcher.match(text, positions=False)
+        labels.append(label)
+        skill_lists.append(result["skills"])
+        vectors.append(result["vector"])
+
+    indptr, indices, data = build_csr(vectors)
+    scores = cosine_scores(query["vector"], indptr, indices, data, len(matcher.skill_ids))
+    query_ids = {skill["id"] for skill in query["skills"]}
+    ranked = sorted(range(len(labels)), key=lambda row: -scores[row])
+    for row in ranked[: args.top]:
+        shared = [skill["id"] for skill in skill_lists[row] if skill["id"] in query_ids]
+        print(json.dumps({"path": labels[row], "score": round(scores[row], 4), "matchedSkills": shared}))
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Match taxonomy skills in parsed resumes")
+    commands = parser.add_subparsers(dest="command", required=True)
+    # Shared by every subcommand so --taxonomy goes after the command name
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--taxonomy", default=str(DEFAULT_TAXONOMY), help="Skills taxonomy JSON file")
+
+    match_parser = commands.add_parser("match", parents=[common],
+                                       help="Extract skills and sparse vectors per resume")
+    match_parser.add_argument("input", help="Batch NDJSON from parseResumeFile.py --batch, or - for stdin")
+    match_parser.add_argument("--no-positions", action="store_true", help="Omit match offsets")
+    match_parser.add_argument("--csr", help="Also write the batch CSR matrix to this JSON file")
+
+    rank_parser = commands.add_parser("rank", parents=[common],
+                                      help="Rank resumes by skill similarity to a query")
+    rank_parser.add_argument("input", help="Batch NDJSON from parseResumeFile.py --batch, or - for stdin")
+    query_group = rank_parser.add_mutually_exclusive_group(required=True)
+    query_group.add_argument("--query", help="Query text (e.g. a job description)")
+    query_group.add_argument("--query-file", help="File containing the query text")
+    rank_parser.add_argument("--top", type=int, default=20, help="Number of results (default: 20)")
+
+    args = parser.parse_args()
+    matcher = SkillMatcher.from_file(args.taxonomy)
+    if args.command == "match":
+        return run_match(matcher, args)
+    return run_rank(matcher, args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,213 @@
+"""
+table_parsing.py
+HTML table -> list-of-records conversion shared by the scrapers, the offline
+Convex stand-in and the parsing benchmarks.
+
+Backends:
+    pandas  pandas.read_html on the first table, then the scrapers' cleanup
+            (drop empty rows/columns, blanks for missing cells, every value
+            as str). This is the reference behaviour.
+    stdlib  html.parser only. Expands rowspan/colspan like read_html, but
+            keeps cell text verbatim (no numeric inference, so "007" stays
+            "007" instead of becoming "7").
+"""
+
+from html.parser import HTMLParser
+from io import StringIO
+
+TABLE_BACKENDS = ("pandas", "stdlib")
+
+
+class TableExtractor(HTMLParser):
+    """Collect every top-level <table> as rows of (text, is_header) cells.
+
+    Spans are expanded so every row has its cells at their grid positions.
+    Nested tables contribute their text to the enclosing cell, as
+    lxml's text_content() does for read_html.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.tables = []
+        self.depth = 0
+        self.in_thead = False
+        self.row = None
+        self.cell = None
+        self.cell_span = (1, 1)
+        self.cell_is_header = False
+        self.pending = {}
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "table":
+            self.depth += 1
+            if self.depth == 1:
+                self.tables.append({"rows": [], "header_rows": 0})
+                self.pending = {}
+            return
+        if self.depth != 1:
+            return
+        if tag == "thead":
+            self.in_thead = True
+        elif tag == "tr":
+            self.close_row()
+            self.row = []
+        elif tag in ("td", "th"):
+            if self.row is None:
+                self.row = []
+            self.close_cell()
+            attrs = dict(attrs)
+            self.cell = []
+            self.cell_is_header = tag == "th"
+            self.cell_span = (span_value(attrs.get("rowspan")), span_value(attrs.get("colspan")))
+
+    def handle_endtag(self, tag):
+        if tag == "table":
+            if self.depth == 1:
+                self.close_row()
+                self.in_thead = False
+            self.depth = max(0, self.depth - 1)
+        elif self.depth == 1:
+            if tag in ("td", "th"):
+                self.close_cell()
+            elif tag == "tr":
+                self.close_row()
+            elif tag == "thead":
+                self.close_row()
+                self.in_thead = False
+
+    def handle_data(self, data):
+        if self.cell is not None:
+            self.cell.append(data)
+
+    def fill_pending(self):
+        # Cells carried down from a rowspan above occupy the next free columns
+        while len(self.row) in self.pending:
+            col = len(self.row)
+            remaining, cell = self.pending[col]
+            self.row.append(cell)
+            if remaining > 1:
+                self.pending[col] = (remaining - 1, cell)
+            else:
+                del self.pending[col]
+
+    def close_cell(self):
+        if self.cell is None:
+            return
+        text = " ".join("".join(self.cell).split())
+        rowspan, colspan = self.cell_span
+        for _ in range(colspan):
+            self.fill_pending()
+            col = len(self.row)
+            cell = (text, self.cell_is_header)
+            self.row.append(cell)
+            if rowspan > 1:
+                self.pending[col] = (rowspan - 1, cell)
+        self.cell = None
+
+    def close_row(self):
+        if self.row is None:
+            return
+        self.close_cell()
+        self.fill_pending()
+        table = self.tables[-1]
+        if self.row:
+            if self.in_thead and table["header_rows"] == len(table["rows"]):
+                table["header_rows"] += 1
+            table["rows"].append(self.row)
+        self.row = None
+
+
+def span_value(raw):
+    try:
+        return max(1, min(int(raw), 1000))
+    except (TypeError, ValueError):
+        return 1
+
+
+def extract_tables(html_content):
+    """Top-level tables in html_content as {"rows": [[(text, is_header)]], "header_rows": n}."""
+    extractor = TableExtractor()
+    extractor.feed(html_content)
+    extractor.close()
+    return [t for t in extractor.tables if t["rows"]]
+
+
+def dedupe_names(names):
+    """Suffix repeated column names as read_html does: "Title", "Title.1", "Title.2".
+
+    Suffixes that collide with a name already in the header are skipped.
+    """
+    original = set(names)
+    counts = {}
+    unique = []
+    for name in names:
+        base, count = name, counts.get(name, 0)
+        while count:
+            counts[base] = count + 1
+            name = f"{base}.{count}"
+            count = count + 1 if name in original else counts.get(name, 0)
+        counts[name] = count + 1
+        unique.append(name)
+    return unique
+
+
+def table_records(table):
+    """Records for one extracted table, cleaned the same way as the pandas backend."""
+    rows = table["rows"]
+    header_count = table["header_rows"]
+    if not header_count:
+        # Like read_html: leading rows made only of <th> cells are the header
+        while header_count < len(rows) and all(is_header for _, is_header in rows[header_count]):
+            header_count += 1
+    header_rows, body = rows[:header_count], rows[header_count:]
+    width = max(len(row) for row in rows)
+    if header_rows:
+        header = []
+        for col in range(width):
+            parts = [row[col][0] for row in header_rows if col < len(row) and row[col][0]]
+            header.append(" ".join(dict.fromkeys(parts)) or f"Unnamed: {col}")
+        # A colspan header or repeated <th> would otherwise collapse columns into one key
+        header = dedupe_names(header)
+    else:
+        header = list(range(width))
+
+    grid = [[row[col][0] if col < len(row) else "" for col in range(width)] for row in body]
+    grid = [row for row in grid if any(row)]
+    keep = [col for col in range(width) if any(row[col] for row in grid)]
+    return [{header[col]: row[col] for col in keep} for row in grid]
+
+
+def stdlib_table_to_records(html_content):
+    tables = extract_tables(html_content)
+    if not tables:
+        raise ValueError("No tables found")
+    return table_records(tables[0])
+
+
+def pandas_table_to_records(html_content):
+    import pandas as pd
+
+    dfs = pd.read_html(StringIO(html_content))
+    if not dfs:
+        raise ValueError("No tables found")
+    main_df = dfs[0].dropna(how="all").dropna(axis=1, how="all")
+    if main_df.empty:
+        return []
+    return main_df.fillna("").astype(str).to_dict(orient="records")
+
+
+def html_table_to_records(html_content, backend="pandas"):
+    """Parse the first table in html_content into a list of {column: str} records.
+
+    Raises ValueError when there is no table or the table is empty after
+    dropping blank rows and columns.
+    """
+    if backend == "pandas":
+        records = pandas_table_to_records(html_content)
+    elif backend == "stdlib":
+        records = stdlib_table_to_records(html_content)
+    else:
+        raise ValueError(f"Unknown table backend {backend!r} (expected one of {', '.join(TABLE_BACKENDS)})")
+    if not records:
+        raise ValueError("Table is empty after cleaning")
+    return records
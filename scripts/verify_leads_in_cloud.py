@@ -1,13 +1,36 @@
 """
 Helper script to verify leads data exists in Convex Cloud before migration.
 This helps diagnose why leads data might not be included in exports.
+
+All checks run in-process through the Python ConvexClient (the same client the
+scrapers use) instead of starting `bun x convex run` per function, and the
+queries are issued concurrently from a small thread pool, so a full health
+report for leads, procurementUrls and procurementData takes one round of
+network latency rather than one CLI startup per query. procurementData stats
+are summed page by page so the check stays within Convex's per-query read
+limits however many captures exist.
+
+Usage:
+    python scripts/verify_leads_in_cloud.py [--url URL] [--workers N] [--timeout S]
+                                            [--query fn[=json_args] ...] [--json]
 """
-import os
-import subprocess
+import argparse
 import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from datetime import datetime, timezone
 from pathlib import Path
 from dotenv import load_dotenv
 
+try:
+    from convex import ConvexClient
+except ImportError:
+    print("ERROR: convex package not installed. Run: pip install convex")
+    sys.exit(1)
+
 SCRIPT_DIR = Path(__file__).parent.absolute()
 PROJECT_ROOT = SCRIPT_DIR.parent
 ENV_PATH = PROJECT_ROOT / '.env.local'
@@ -16,69 +39,259 @@ load_dotenv(dotenv_path=ENV_PATH)
 
 CLOUD_URL = os.getenv("VITE_CONVEX_URL")
 
-def run_convex_function(function_name, args=None):
-    """Run a Convex function and return the result."""
-    cmd_parts = ['bun', 'x', 'convex', 'run', function_name]
-    if args:
-        cmd_parts.append(json.dumps(args))
-    cmd = ' '.join(cmd_parts)
-    
-    env = os.environ.copy()
-    env['CONVEX_URL'] = CLOUD_URL
-    
-    process = subprocess.Popen(
-        cmd,
-        shell=True,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        env=env,
-        cwd=PROJECT_ROOT
-    )
-    
-    stdout, stderr = process.communicate()
-    
-    if process.returncode != 0:
-        print(f"Error running {function_name}: {stderr}")
-        return None
-    
+DEFAULT_WORKERS = 8
+DEFAULT_TIMEOUT = 30.0
+
+# (label, function, args) - every check is an independent read-only query
+CHECKS = [
+    ("leads.stats", "leads:getLeadsStats", {}),
+    ("leads.count", "leads:getLeadsCount", {}),
+    ("procurementUrls.stats", "procurementUrls:getStats", {}),
+    ("procurementUrls.approvedCount", "procurementUrls:getTotalApprovedProcurementLinkCount", {}),
+    ("procurementData.stats", "procurementData:getStatsPage", {}),
+]
+
+# Per-page caps for paged aggregates; each capture carries its whole scraped table
+STATS_PAGE_SIZE = 200
+STATS_PAGE_BYTES = 4 * 1024 * 1024
+
+
+def merge_procurement_data_pages(pages):
+    """Sum procurementData:getStatsPage results into one getStats-style summary."""
+    by_status = {}
+    states = set()
+    latest = None
+    for page in pages:
+        for status, count in page['byStatus'].items():
+            by_status[status] = by_status.get(status, 0) + count
+        states.update(page['states'])
+        if page['latestCreatedAt'] is not None and (latest is None or page['latestCreatedAt'] > latest):
+            latest = page['latestCreatedAt']
+    return {
+        'total': sum(page['total'] for page in pages),
+        'totalRows': sum(page['totalRows'] for page in pages),
+        'byStatus': by_status,
+        'statesCovered': len(states),
+        'latestCreatedAt': latest,
+        'pages': len(pages),
+    }
+
+
+# Queries that aggregate one page per call: the runner follows the cursor and merges
+PAGED_AGGREGATES = {
+    "procurementData:getStatsPage": merge_procurement_data_pages,
+}
+
+
+class ConvexBatchRunner:
+    """Run Convex queries concurrently, one ConvexClient per worker thread."""
+
+    def __init__(self, url, workers=DEFAULT_WORKERS):
+        self.url = url
+        self.workers = workers
+        self._local = threading.local()
+
+    def _client(self):
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = ConvexClient(self.url)
+        return client
+
+    def _query_pages(self, function_name, args, deadline):
+        pages = []
+        cursor = None
+        while True:
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"deadline passed after {len(pages)} page(s)")
+            page = self._client().query(function_name, {
+                **args,
+                'paginationOpts': {'numItems': STATS_PAGE_SIZE, 'cursor': cursor,
+                                   'maximumBytesRead': STATS_PAGE_BYTES},
+            })
+            pages.append(page)
+            if page['isDone']:
+                return PAGED_AGGREGATES[function_name](pages)
+            cursor = page['continueCursor']
+
+    def _run_one(self, function_name, args, deadline):
+        start = time.perf_counter()
+        try:
+            if function_name in PAGED_AGGREGATES:
+                value = self._query_pages(function_name, args, deadline)
+            else:
+                value = self._client().query(function_name, args)
+            return {'ok': True, 'value': value, 'seconds': time.perf_counter() - start}
+        except Exception as e:
+            return {'ok': False, 'error': str(e), 'seconds': time.perf_counter() - start}
+
+    def run(self, checks, timeout=DEFAULT_TIMEOUT):
+        """Run (label, function, args) checks; returns {label: result} in check order."""
+        results = {}
+        pool = ThreadPoolExecutor(max_workers=max(1, min(self.workers, len(checks))))
+        try:
+            deadline = time.monotonic() + timeout
+            futures = [(label, function_name, pool.submit(self._run_one, function_name, args, deadline))
+                       for label, function_name, args in checks]
+            for label, function_name, future in futures:
+                try:
+                    result = future.result(timeout=max(0.0, deadline - time.monotonic()))
+                except FutureTimeoutError:
+                    result = {'ok': False, 'error': f"timed out after {timeout:g}s", 'seconds': timeout}
+                results[label] = {'function': function_name, **result}
+        finally:
+            # Don't block on queries that are still hanging past the deadline
+            pool.shutdown(wait=False, cancel_futures=True)
+        return results
+
+
+def parse_extra_query(spec):
+    """Parse a --query value of the form module:function[=json_args]."""
+    function_name, _, raw_args = spec.partition('=')
+    if ':' not in function_name:
+        raise argparse.ArgumentTypeError(f"expected module:function, got {function_name!r}")
     try:
-        return json.loads(stdout.strip())
-    except:
-        return stdout.strip()
+        args = json.loads(raw_args) if raw_args else {}
+    except json.JSONDecodeError as e:
+        raise argparse.ArgumentTypeError(f"invalid JSON args for {function_name}: {e}")
+    if not isinstance(args, dict):
+        raise argparse.ArgumentTypeError(f"args for {function_name} must be a JSON object")
+    return (function_name, function_name, args)
 
-def main():
-    if not CLOUD_URL:
-        print("❌ Error: VITE_CONVEX_URL not set in .env.local")
-        return
-    
-    print(f"🔍 Verifying leads data in Cloud: {CLOUD_URL}\n")
-    
-    # Try to get leads stats
-    print("Attempting to query leads stats...")
-    stats = run_convex_function('leads:getLeadsStats', {})
-    
-    if stats:
-        print(f"\n✅ Leads data found in cloud:")
-        print(f"   Total leads: {stats.get('total', 'unknown')}")
-        print(f"   Active leads: {stats.get('active', 'unknown')}")
-        print(f"   Inactive leads: {stats.get('inactive', 'unknown')}")
+
+def value_of(results, label):
+    result = results.get(label)
+    return result['value'] if result and result['ok'] else None
+
+
+def consistency_problems(results):
+    """Cross-check the counts returned by independent queries."""
+    problems = []
+    leads_stats = value_of(results, 'leads.stats')
+    leads_count = value_of(results, 'leads.count')
+    if isinstance(leads_stats, dict):
+        total = leads_stats.get('total')
+        if leads_count is not None and total != leads_count:
+            problems.append(f"leads: getLeadsStats total {total} != getLeadsCount {leads_count}")
+        if total is not None and leads_stats.get('active', 0) + leads_stats.get('inactive', 0) != total:
+            problems.append("leads: active + inactive does not add up to total")
+        if total == 0:
+            problems.append("leads: table is empty")
+
+    url_stats = value_of(results, 'procurementUrls.stats')
+    approved_count = value_of(results, 'procurementUrls.approvedCount')
+    if isinstance(url_stats, dict):
+        by_status = sum(url_stats.get(s, 0) for s in ('pending', 'approved', 'denied', 'invalid'))
+        if by_status != url_stats.get('total'):
+            problems.append(f"procurementUrls: status counts sum to {by_status}, total is {url_stats.get('total')}")
+        if approved_count is not None and url_stats.get('approved') != approved_count:
+            problems.append(f"procurementUrls: getStats approved {url_stats.get('approved')} "
+                            f"!= getTotalApprovedProcurementLinkCount {approved_count}")
+
+    data_stats = value_of(results, 'procurementData.stats')
+    if isinstance(data_stats, dict):
+        if sum(data_stats.get('byStatus', {}).values()) != data_stats.get('total'):
+            problems.append("procurementData: status counts do not add up to total")
+        if isinstance(url_stats, dict) and url_stats.get('approved') and not data_stats.get('total'):
+            problems.append("procurementData: no scraped data although approved procurement URLs exist")
+    return problems
+
+
+def format_timestamp(ms):
+    if not ms:
+        return 'never'
+    return datetime.fromtimestamp(ms / 1000, tz=timezone.utc).strftime('%Y-%m-%d %H:%M UTC')
+
+
+def print_report(results, problems, elapsed):
+    leads_stats = value_of(results, 'leads.stats')
+    if isinstance(leads_stats, dict):
+        print(f"✅ Leads:")
+        print(f"   Total leads: {leads_stats.get('total', 'unknown')}")
+        print(f"   Active leads: {leads_stats.get('active', 'unknown')}")
+        print(f"   Inactive leads: {leads_stats.get('inactive', 'unknown')}")
+        by_status = leads_stats.get('byStatus') or {}
+        if by_status:
+            print(f"   By status: " + ", ".join(f"{k}={v}" for k, v in sorted(by_status.items())))
     else:
-        print("\n⚠ Could not retrieve leads stats.")
+        print("⚠ Could not retrieve leads stats.")
         print("   This might mean:")
         print("   1. The function doesn't exist or isn't deployed")
         print("   2. There's an authentication issue")
         print("   3. The leads table is empty")
-    
-    # Try a simple query to count leads
-    print("\nAttempting direct query to count leads...")
-    # Note: This would require a query function, but we can't easily call queries from CLI
-    # The export should include all data regardless
-    
-    print("\n💡 Next steps:")
-    print("   1. Check the Convex dashboard to verify leads data exists")
-    print("   2. Run the migration script - it will now inspect the export")
-    print("   3. If leads are missing from export, check component configuration")
+
+    url_stats = value_of(results, 'procurementUrls.stats')
+    if isinstance(url_stats, dict):
+        print(f"\n✅ Procurement URLs: {url_stats.get('total')} total "
+              f"({url_stats.get('approved')} approved, {url_stats.get('pending')} pending, "
+              f"{url_stats.get('denied')} denied, {url_stats.get('invalid')} invalid)")
+    else:
+        print("\n⚠ Could not retrieve procurement URL stats.")
+
+    data_stats = value_of(results, 'procurementData.stats')
+    if isinstance(data_stats, dict):
+        print(f"\n✅ Procurement data: {data_stats.get('total')} scrape(s), {data_stats.get('totalRows')} row(s) "
+              f"across {data_stats.get('statesCovered')} state(s), latest {format_timestamp(data_stats.get('latestCreatedAt'))}")
+        by_status = data_stats.get('byStatus') or {}
+        if by_status:
+            print(f"   By status: " + ", ".join(f"{k}={v}" for k, v in sorted(by_status.items())))
+    else:
+        print("\n⚠ Could not retrieve procurement data stats.")
+
+    extra = [label for label in results if label not in {label for label, _, _ in CHECKS}]
+    for label in extra:
+        result = results[label]
+        if result['ok']:
+            print(f"\n✅ {label}: {json.dumps(result['value'], default=str)[:500]}")
+
+    print(f"\n{'Query':<55} {'ms':>8}  Status")
+    for label, result in results.items():
+        status = 'ok' if result['ok'] else f"error: {result['error'].splitlines()[0][:80]}"
+        print(f"{result['function']:<55} {result['seconds'] * 1000:>8.1f}  {status}")
+    print(f"\n{len(results)} queries in {elapsed:.2f}s")
+
+    if problems:
+        print("\n⚠ Consistency problems:")
+        for problem in problems:
+            print(f"   - {problem}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify leads and procurement data in Convex Cloud")
+    parser.add_argument('--url', default=CLOUD_URL, help="Convex deployment URL (default: VITE_CONVEX_URL)")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f"Concurrent queries (default: {DEFAULT_WORKERS})")
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT,
+                        help=f"Overall deadline in seconds (default: {DEFAULT_TIMEOUT:g})")
+    parser.add_argument('--query', action='append', type=parse_extra_query, default=[],
+                        metavar='FN[=ARGS]', help="Extra query to run, e.g. 'procurementUrls:getApprovedByState={\"state\": \"Texas\"}'")
+    parser.add_argument('--json', action='store_true', help="Print raw results as JSON")
+    args = parser.parse_args()
+
+    if not args.url:
+        print("❌ Error: VITE_CONVEX_URL not set in .env.local")
+        return 1
+
+    if not args.json:
+        print(f"🔍 Verifying leads data in Cloud: {args.url}\n")
+
+    runner = ConvexBatchRunner(args.url, workers=args.workers)
+    start = time.perf_counter()
+    results = runner.run(CHECKS + args.query, timeout=args.timeout)
+    elapsed = time.perf_counter() - start
+    problems = consistency_problems(results)
+
+    if args.json:
+        print(json.dumps({'url': args.url, 'seconds': elapsed, 'results': results, 'problems': problems},
+                         indent=2, default=str))
+    else:
+        print_report(results, problems, elapsed)
+        print("\n💡 Next steps:")
+        print("   1. Check the Convex dashboard if any query failed or a table is unexpectedly empty")
+        print("   2. Run the migration script - it will now inspect the export")
+        print("   3. If leads are missing from export, check component configuration")
+
+    return 1 if any(not r['ok'] for r in results.values()) else 0
+
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())